@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import os
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +11,10 @@ from flask_cors import CORS
 
 from backends.base import StoreBackend
 from backends.factory import create_backend
+from backends.shift_templates import parse_clock, parse_weekday
+from backends.statuses import RECORD_STATUSES, SIGNUP_STATUSES
+from expiry_scheduler import ReservationExpiryScheduler
+from lead_cache import LeadPantryCache
 
 BASE_DIR = Path(__file__).resolve().parent
 ROOT_DIR = BASE_DIR.parent
@@ -23,6 +28,31 @@ app = Flask(
 CORS(app, resources={r"/*": {"origins": "*"}})
 
 backend: StoreBackend = create_backend()
+lead_pantry_cache = LeadPantryCache(
+    max_entries=int(os.getenv("LEAD_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(os.getenv("LEAD_CACHE_TTL_SECONDS", "60")),
+)
+# The backend reports every lead change (also from scripts or other routes) and, for
+# MySQL, again once the change is committed and visible to other requests.
+backend.add_lead_change_listener(lead_pantry_cache.invalidate)
+expiry_scheduler = ReservationExpiryScheduler(
+    backend,
+    rescan_seconds=float(os.getenv("EXPIRY_RESCAN_SECONDS", "60")),
+)
+
+
+def start_expiry_worker() -> None:
+    """Run the reservation-expiry worker in this process when EXPIRY_WORKER=thread.
+
+    Only the ``__main__`` entry point calls this, so importing ``app`` (tests, scripts,
+    ``flask run``, WSGI servers) never starts a sweeper. A single-process deployment
+    calls this from its WSGI entry module; a multi-process MySQL deployment runs
+    ``python expiry_scheduler.py`` once instead. Without either, overdue reservations
+    are only expired lazily when a request touches their shift.
+    """
+    if os.getenv("EXPIRY_WORKER", "thread").strip().lower() == "thread":
+        expiry_scheduler.start()
+
 
 # Mock current user (no auth yet): default to user id=4 (admin)
 DEFAULT_USER_ID = 4
@@ -37,11 +67,71 @@ LEAD_VISIBLE_SIGNUP_STATUSES = ACTIVE_SIGNUP_STATUSES
 RESERVATION_WINDOW_HOURS = 48
 
 
+READ_ONLY_METHODS = {"GET", "HEAD", "OPTIONS"}
+MAX_TEMPLATE_WEEKS = 26
+
+
+@app.before_request
+def begin_backend_request() -> None:
+    backend.begin_request(read_only=request.method in READ_ONLY_METHODS)
+
+
+@app.after_request
+def commit_backend_request(response: Any) -> Any:
+    # Commit before the response is sent, so a failed COMMIT surfaces as a 500.
+    # Error responses (e.g. a caught ValueError turned into a 400) roll back, unless
+    # the handler set g.commit_response because the error reports a write it made.
+    backend.end_request(commit=200 <= response.status_code < 300 or g.get("commit_response", False))
+    return response
+
+
+@app.teardown_request
+def end_backend_request(exc: BaseException | None) -> None:
+    # Only still open when the request failed before after_request ran.
+    backend.end_request(commit=False)
+
+
 @app.before_request
 def set_current_user() -> None:
     """Allow switching user via ?user_id=X query parameter for testing."""
     user_id = request.args.get("user_id", type=int) or DEFAULT_USER_ID
     g.current_user_id = user_id
+    g.identity = None
+    g.identity_load_count = 0
+
+
+def load_identity() -> dict[str, Any]:
+    """Load the current user, roles and lead pantries once per request."""
+    identity = getattr(g, "identity", None)
+    if identity is not None:
+        return identity
+
+    user_id = getattr(g, "current_user_id", DEFAULT_USER_ID)
+    user = backend.get_user_by_id(user_id)
+    identity = {
+        "user_id": user_id,
+        "user": user,
+        "roles": backend.get_user_roles(user_id) if user else [],
+        "lead_pantry_ids": lead_pantry_cache.get(user_id, backend.list_lead_pantry_ids) if user else frozenset(),
+    }
+    g.identity = identity
+    g.identity_load_count = getattr(g, "identity_load_count", 0) + 1
+    return identity
+
+
+def current_identity_for(user_id: int) -> dict[str, Any] | None:
+    identity = load_identity()
+    if identity["user"] is None or int(identity["user_id"]) != int(user_id):
+        return None
+    return identity
+
+
+def invalidate_identity() -> None:
+    """Drop this request's cached identity after a write that changes roles or leads.
+
+    The shared lead pantry cache is invalidated by the backend itself.
+    """
+    g.identity = None
 
 
 def find_user_by_id(user_id: int) -> dict[str, Any] | None:
@@ -49,6 +139,9 @@ def find_user_by_id(user_id: int) -> dict[str, Any] | None:
 
 
 def get_user_roles(user_id: int) -> list[str]:
+    identity = current_identity_for(user_id)
+    if identity:
+        return list(identity["roles"])
     return backend.get_user_roles(user_id)
 
 
@@ -56,9 +149,16 @@ def user_has_role(user_id: int, role_name: str) -> bool:
     return role_name in get_user_roles(user_id)
 
 
+def user_is_pantry_lead(pantry_id: int, user_id: int) -> bool:
+    identity = current_identity_for(user_id)
+    if identity:
+        return int(pantry_id) in identity["lead_pantry_ids"]
+    return int(pantry_id) in lead_pantry_cache.get(int(user_id), backend.list_lead_pantry_ids)
+
+
 def current_user() -> dict[str, Any] | None:
-    user_id = getattr(g, "current_user_id", DEFAULT_USER_ID)
-    return find_user_by_id(user_id)
+    user = load_identity()["user"]
+    return dict(user) if user else None
 
 
 def find_pantry_by_id(pantry_id: int) -> dict[str, Any] | None:
@@ -78,7 +178,7 @@ def pantries_for_current_user() -> list[dict[str, Any]]:
         return all_pantries
 
     if user_has_role(user_id, "PANTRY_LEAD"):
-        return [p for p in all_pantries if backend.is_pantry_lead(int(p.get("pantry_id")), user_id)]
+        return [p for p in all_pantries if user_is_pantry_lead(int(p.get("pantry_id")), user_id)]
 
     return []
 
@@ -91,7 +191,19 @@ def get_shift_roles(shift_id: int, include_cancelled: bool = True) -> list[dict[
     roles = backend.list_shift_roles(shift_id)
     if include_cancelled:
         return roles
-    return [role for role in roles if str(role.get("status", "")).upper() != "CANCELLED"]
+    return [role for role in roles if role.get("status") != "CANCELLED"]
+
+
+def get_pantry_shift_tree(
+    pantry_id: int,
+    include_cancelled: bool = True,
+    non_expired_only: bool = False,
+) -> list[dict[str, Any]]:
+    return backend.list_shift_tree_by_pantry(
+        pantry_id,
+        include_cancelled=include_cancelled,
+        non_expired_only=non_expired_only,
+    )
 
 
 def get_shift_signups(shift_role_id: int) -> list[dict[str, Any]]:
@@ -110,6 +222,13 @@ def serialize_signup_user(user: dict[str, Any] | None) -> dict[str, Any] | None:
     }
 
 
+def attach_signup_users(signups: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    users_by_id = backend.get_users_by_ids([int(signup.get("user_id")) for signup in signups])
+    for signup in signups:
+        signup["user"] = serialize_signup_user(users_by_id.get(int(signup.get("user_id"))))
+    return signups
+
+
 def parse_iso_datetime_to_utc(value: Any) -> datetime | None:
     if not value:
         return None
@@ -158,11 +277,14 @@ def past_shift_locked_response() -> tuple[Any, int]:
     return jsonify({"error": "Past shifts are locked", "code": PAST_SHIFT_LOCK_CODE}), 409
 
 
-def ensure_shift_manager_permission(user_id: int, shift: dict[str, Any]) -> bool:
+def ensure_pantry_manager_permission(user_id: int, pantry_id: int) -> bool:
     if user_has_role(user_id, "ADMIN"):
         return True
-    pantry_id = int(shift.get("pantry_id"))
-    return backend.is_pantry_lead(pantry_id, user_id)
+    return user_is_pantry_lead(pantry_id, user_id)
+
+
+def ensure_shift_manager_permission(user_id: int, shift: dict[str, Any]) -> bool:
+    return ensure_pantry_manager_permission(user_id, int(shift.get("pantry_id")))
 
 
 def should_include_cancelled_shift_data(user: dict[str, Any] | None, pantry_id: int) -> bool:
@@ -171,57 +293,21 @@ def should_include_cancelled_shift_data(user: dict[str, Any] | None, pantry_id:
     user_id = int(user.get("user_id"))
     if user_has_role(user_id, "ADMIN"):
         return True
-    return backend.is_pantry_lead(pantry_id, user_id)
+    return user_is_pantry_lead(pantry_id, user_id)
 
 
 def collect_shift_signups(shift_id: int) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+    roles = get_shift_roles(shift_id, include_cancelled=True)
+    signups_by_role = backend.list_signups_for_roles([int(role.get("shift_role_id")) for role in roles])
     rows: list[tuple[dict[str, Any], dict[str, Any]]] = []
-    for role in get_shift_roles(shift_id, include_cancelled=True):
-        role_id = int(role.get("shift_role_id"))
-        for signup in get_shift_signups(role_id):
+    for role in roles:
+        for signup in signups_by_role.get(int(role.get("shift_role_id")), []):
             rows.append((signup, role))
     return rows
 
 
-def recalculate_shift_role_capacity(shift_role_id: int) -> dict[str, Any] | None:
-    role = backend.get_shift_role_by_id(shift_role_id)
-    if not role:
-        return None
-
-    signups = backend.list_shift_signups(shift_role_id)
-    occupied_count = 0
-    now_utc = datetime.now(timezone.utc)
-    for signup in signups:
-        signup_status = str(signup.get("signup_status", "")).upper()
-        reservation_expires_at = parse_iso_datetime_to_utc(signup.get("reservation_expires_at"))
-        is_reserved_pending = (
-            signup_status == SIGNUP_STATUS_PENDING_CONFIRMATION
-            and reservation_expires_at is not None
-            and reservation_expires_at > now_utc
-        )
-        if signup_status in ACTIVE_SIGNUP_STATUSES or is_reserved_pending:
-            occupied_count += 1
-
-    role_status = str(role.get("status", "OPEN")).upper()
-    required_count = int(role.get("required_count", 0))
-    if role_status == "CANCELLED":
-        next_status = "CANCELLED"
-    else:
-        next_status = "FULL" if occupied_count >= required_count else "OPEN"
-
-    updated = backend.update_shift_role(
-        shift_role_id,
-        {"filled_count": occupied_count, "status": next_status},
-    )
-    return updated
-
-
-def recalculate_shift_capacities(shift_id: int) -> None:
-    for role in get_shift_roles(shift_id, include_cancelled=True):
-        recalculate_shift_role_capacity(int(role.get("shift_role_id")))
-
-
 def affected_contacts_from_signups(signups: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    users_by_id = backend.get_users_by_ids([int(signup.get("user_id")) for signup in signups])
     seen_user_ids: set[int] = set()
     contacts: list[dict[str, Any]] = []
     for signup in signups:
@@ -229,7 +315,7 @@ def affected_contacts_from_signups(signups: list[dict[str, Any]]) -> list[dict[s
         if user_id in seen_user_ids:
             continue
         seen_user_ids.add(user_id)
-        user = find_user_by_id(user_id)
+        user = users_by_id.get(user_id)
         if not user:
             continue
         contacts.append(
@@ -247,10 +333,12 @@ def mark_shift_signups_pending(shift_id: int) -> dict[str, Any]:
     if not shift or not is_upcoming_shift(shift):
         return {"affected_signup_count": 0, "affected_volunteer_contacts": []}
 
-    reservation_expires_at = (datetime.now(timezone.utc) + timedelta(hours=RESERVATION_WINDOW_HOURS)).isoformat().replace("+00:00", "Z")
+    reservation_deadline = datetime.now(timezone.utc) + timedelta(hours=RESERVATION_WINDOW_HOURS)
+    reservation_expires_at = reservation_deadline.isoformat().replace("+00:00", "Z")
     changed_signups = backend.bulk_mark_shift_signups_pending(shift_id, reservation_expires_at)
-
-    recalculate_shift_capacities(shift_id)
+    if changed_signups:
+        shift_start = parse_iso_datetime_to_utc(shift.get("start_time"))
+        expiry_scheduler.schedule(shift_id, min(reservation_deadline, shift_start or reservation_deadline))
     contacts = affected_contacts_from_signups(changed_signups)
     return {
         "affected_signup_count": len(changed_signups),
@@ -259,22 +347,46 @@ def mark_shift_signups_pending(shift_id: int) -> dict[str, Any]:
 
 
 def expire_pending_signups_if_started(shift_id: int) -> int:
-    expired = backend.expire_pending_signups(shift_id, utc_now_iso())
-    if expired > 0:
-        recalculate_shift_capacities(shift_id)
-    return expired
+    return backend.expire_pending_signups(shift_id, utc_now_iso())
+
+
+def pending_reservation_lapsed(signup: dict[str, Any], shift_start: datetime | None, now: datetime) -> bool:
+    if signup.get("signup_status") != SIGNUP_STATUS_PENDING_CONFIRMATION:
+        return False
+    reservation_expires_at = parse_iso_datetime_to_utc(signup.get("reservation_expires_at"))
+    return (shift_start is not None and shift_start <= now) or (
+        reservation_expires_at is not None and reservation_expires_at <= now
+    )
+
+
+def present_lapsed_reservations(
+    signups: list[dict[str, Any]],
+    shift_start: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """Show lapsed pending reservations as cancelled on read paths, without writing.
+
+    The expiry worker stores the same change shortly after the deadline. Rows that
+    carry their own ``start_time`` (user signup listings) use it instead of ``shift_start``.
+    """
+    now = datetime.now(timezone.utc)
+    for signup in signups:
+        start = parse_iso_datetime_to_utc(signup["start_time"]) if "start_time" in signup else shift_start
+        if pending_reservation_lapsed(signup, start, now):
+            signup["signup_status"] = SIGNUP_STATUS_CANCELLED
+            signup["reservation_expires_at"] = None
+    return signups
 
 
 def signup_reconfirm_availability(signup_row: dict[str, Any]) -> tuple[bool, str | None]:
-    signup_status = str(signup_row.get("signup_status", "")).upper()
+    signup_status = signup_row.get("signup_status")
     if signup_status != SIGNUP_STATUS_PENDING_CONFIRMATION:
         return False, "SIGNUP_NOT_PENDING"
 
-    shift_status = str(signup_row.get("shift_status", "")).upper()
+    shift_status = signup_row.get("shift_status")
     if shift_status == "CANCELLED":
         return False, "SHIFT_CANCELLED"
 
-    role_status = str(signup_row.get("role_status", "")).upper()
+    role_status = signup_row.get("role_status")
     if role_status == "CANCELLED":
         return False, "ROLE_FULL_OR_UNAVAILABLE"
 
@@ -315,10 +427,135 @@ def get_signup_shift_context(signup_id: int) -> tuple[dict[str, Any] | None, dic
     return signup, shift_role, shift
 
 
+def parse_new_shift_roles(
+    raw_roles: Any,
+    existing_role_ids: set[int] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """Validate a ``roles`` array of a shift payload.
+
+    With ``existing_role_ids``, entries may keep a ``shift_role_id`` from that set.
+    """
+    if raw_roles is None:
+        return [], None
+    if not isinstance(raw_roles, list):
+        return [], "roles must be a list"
+
+    roles: list[dict[str, Any]] = []
+    seen_role_ids: set[int] = set()
+    for index, raw_role in enumerate(raw_roles):
+        if not isinstance(raw_role, dict):
+            return [], f"roles[{index}] must be an object"
+        missing = [k for k in ["role_title", "required_count"] if k not in raw_role]
+        if missing:
+            return [], f"roles[{index}] missing: {', '.join(missing)}"
+        try:
+            required_count = int(raw_role["required_count"])
+            if required_count < 1:
+                raise ValueError
+        except (TypeError, ValueError):
+            return [], f"roles[{index}].required_count must be >= 1"
+        role = {"role_title": raw_role["role_title"], "required_count": required_count}
+
+        if existing_role_ids is not None and raw_role.get("shift_role_id") is not None:
+            try:
+                shift_role_id = int(raw_role["shift_role_id"])
+            except (TypeError, ValueError):
+                shift_role_id = None
+            if shift_role_id not in existing_role_ids or shift_role_id in seen_role_ids:
+                return [], f"roles[{index}].shift_role_id is not a role of this shift"
+            seen_role_ids.add(shift_role_id)
+            role["shift_role_id"] = shift_role_id
+        roles.append(role)
+    return roles, None
+
+
+def parse_shift_template_payload(payload: dict[str, Any]) -> tuple[dict[str, Any] | None, str | None]:
+    """Validate a shift template payload; times are "HH:MM" in UTC."""
+    required = ["template_name", "weekday", "start_time", "end_time"]
+    missing = [k for k in required if payload.get(k) in (None, "")]
+    if missing:
+        return None, f"Missing: {', '.join(missing)}"
+    try:
+        weekday = parse_weekday(payload["weekday"])
+        start_time = parse_clock(payload["start_time"]).strftime("%H:%M")
+        end_time = parse_clock(payload["end_time"]).strftime("%H:%M")
+    except ValueError as exc:
+        return None, str(exc)
+    if start_time == end_time:
+        return None, "start_time and end_time must differ"
+
+    roles, error = parse_new_shift_roles(payload.get("roles"))
+    if error:
+        return None, error
+    return {
+        "template_name": payload["template_name"],
+        "weekday": weekday,
+        "start_time": start_time,
+        "end_time": end_time,
+        "roles": roles,
+    }, None
+
+
+def parse_template_generation_payload(payload: dict[str, Any]) -> tuple[dict[str, Any] | None, str | None]:
+    """Validate ``start_date`` (YYYY-MM-DD, default today in UTC) and ``weeks``."""
+    today = datetime.now(timezone.utc).date()
+    raw_start = payload.get("start_date")
+    try:
+        start_date = date.fromisoformat(str(raw_start)) if raw_start else today
+    except ValueError:
+        return None, "Invalid start_date"
+    if start_date < today:
+        return None, "start_date cannot be in the past"
+    try:
+        weeks = int(payload.get("weeks", 1))
+        if not 1 <= weeks <= MAX_TEMPLATE_WEEKS:
+            raise ValueError
+    except (TypeError, ValueError):
+        return None, f"weeks must be between 1 and {MAX_TEMPLATE_WEEKS}"
+    return {"start_date": start_date.isoformat(), "weeks": weeks}, None
+
+
+def diff_shift_fields(shift: dict[str, Any], payload: dict[str, Any]) -> dict[str, Any]:
+    """Fields of a shift payload that differ from the stored shift."""
+    changes: dict[str, Any] = {}
+    if "shift_name" in payload and payload["shift_name"] != shift.get("shift_name"):
+        changes["shift_name"] = payload["shift_name"]
+    for key in ["start_time", "end_time"]:
+        if key in payload and parse_iso_datetime_to_utc(payload[key]) != parse_iso_datetime_to_utc(shift.get(key)):
+            changes[key] = payload[key]
+    if "status" in payload and str(payload["status"]).upper() != shift.get("status"):
+        changes["status"] = str(payload["status"]).upper()
+    return changes
+
+
+def diff_role_fields(role: dict[str, Any], payload: dict[str, Any]) -> dict[str, Any]:
+    """Fields of a shift role payload that differ from the stored role."""
+    changes = {
+        key: payload[key]
+        for key in ["role_title", "required_count"]
+        if key in payload and payload[key] != role.get(key)
+    }
+    if "status" in payload and str(payload["status"]).upper() != role.get("status"):
+        changes["status"] = str(payload["status"]).upper()
+    return changes
+
+
+def shift_changes_affect_signups(changes: dict[str, Any]) -> bool:
+    """A new time window or a cancellation needs volunteers to reconfirm; a rename does not."""
+    return "start_time" in changes or "end_time" in changes or changes.get("status") == "CANCELLED"
+
+
+def role_changes_affect_signups(role: dict[str, Any], changes: dict[str, Any]) -> bool:
+    """Cancelling a role, or cutting its capacity below the filled slots, needs reconfirmation."""
+    if changes.get("status") == "CANCELLED":
+        return True
+    return "required_count" in changes and int(changes["required_count"]) < int(role.get("filled_count") or 0)
+
+
 def check_attendance_marking_allowed(actor_user_id: int, shift: dict[str, Any]) -> tuple[bool, str | None]:
     is_admin = user_has_role(actor_user_id, "ADMIN")
     pantry_id = int(shift.get("pantry_id"))
-    is_lead_for_pantry = backend.is_pantry_lead(pantry_id, actor_user_id)
+    is_lead_for_pantry = user_is_pantry_lead(pantry_id, actor_user_id)
     if not is_admin and not is_lead_for_pantry:
         return False, "Forbidden"
 
@@ -386,8 +623,9 @@ def list_users() -> Any:
     role_filter = request.args.get("role")
     users = backend.list_users(role_filter)
 
+    roles_by_user = backend.get_user_roles_bulk([int(u.get("user_id")) for u in users])
     for u in users:
-        u["roles"] = get_user_roles(int(u.get("user_id")))
+        u["roles"] = roles_by_user.get(int(u.get("user_id")), [])
 
     return jsonify(users)
 
@@ -408,18 +646,7 @@ def list_user_signups(user_id: int) -> Any:
     if not target_user:
         return jsonify({"error": "User not found"}), 404
 
-    signups = backend.list_signups_by_user(user_id)
-    unique_shift_ids = {int(row.get("shift_id")) for row in signups}
-
-    expired_any = False
-    for shift_id in unique_shift_ids:
-        expired_count = expire_pending_signups_if_started(shift_id)
-        if expired_count > 0:
-            expired_any = True
-
-    if expired_any:
-        signups = backend.list_signups_by_user(user_id)
-
+    signups = present_lapsed_reservations(backend.list_signups_by_user(user_id))
     return jsonify(enrich_signup_rows_for_reconfirm(signups))
 
 
@@ -505,6 +732,7 @@ def create_pantry() -> Any:
         location_address=payload["location_address"],
         lead_ids=[int(v) for v in payload.get("lead_ids", [])],
     )
+    invalidate_identity()
     return jsonify(pantry), 201
 
 
@@ -528,13 +756,14 @@ def add_pantry_lead(pantry_id: int) -> Any:
     if not lead or not user_has_role(int(lead_id), "PANTRY_LEAD"):
         return jsonify({"error": "User must have PANTRY_LEAD role"}), 400
 
-    if backend.is_pantry_lead(pantry_id, int(lead_id)):
+    if user_is_pantry_lead(pantry_id, int(lead_id)):
         return jsonify({"error": "User already a lead for this pantry"}), 400
 
     try:
         backend.add_pantry_lead(pantry_id, int(lead_id))
     except ValueError as exc:
         return jsonify({"error": str(exc)}), 400
+    invalidate_identity()
 
     return jsonify({
         "pantry_id": pantry_id,
@@ -559,6 +788,7 @@ def remove_pantry_lead(pantry_id: int, lead_id: int) -> Any:
         return jsonify({"error": "User not found"}), 404
 
     backend.remove_pantry_lead(pantry_id, lead_id)
+    invalidate_identity()
     return jsonify({"success": True}), 200
 
 
@@ -569,24 +799,52 @@ def get_shifts(pantry_id: int) -> Any:
     """Get all shifts for a pantry."""
     user = current_user()
     include_cancelled = should_include_cancelled_shift_data(user, pantry_id)
-    shifts = backend.list_shifts_by_pantry(pantry_id, include_cancelled=include_cancelled)
-
-    for shift in shifts:
-        shift_id = int(shift.get("shift_id"))
-        expire_pending_signups_if_started(shift_id)
-        shift["roles"] = get_shift_roles(shift_id, include_cancelled=include_cancelled)
+    shifts = get_pantry_shift_tree(pantry_id, include_cancelled=include_cancelled)
     return jsonify(shifts)
 
 @app.get("/api/pantries/<int:pantry_id>/active-shifts")
 def get_active_shifts(pantry_id: int) -> Any:
     """Get non-expired shifts for volunteer/public views."""
-    shifts = backend.list_non_expired_shifts_by_pantry(pantry_id, include_cancelled=False)
-    for shift in shifts:
-        shift["roles"] = get_shift_roles(int(shift.get("shift_id")), include_cancelled=False)
-
+    shifts = get_pantry_shift_tree(pantry_id, include_cancelled=False, non_expired_only=True)
     return jsonify(shifts)
 
 
+@app.get("/api/calendar")
+def get_calendar() -> Any:
+    """Non-expired shifts with roles across pantries, grouped by pantry.
+
+    Optional filters: ?pantry_id=1&pantry_id=2, ?from=<ISO>&to=<ISO> (shifts overlapping the window).
+    """
+    window: dict[str, str | None] = {"from": None, "to": None}
+    for param in window:
+        raw = request.args.get(param)
+        if raw is None:
+            continue
+        parsed = parse_iso_datetime_to_utc(raw)
+        if parsed is None:
+            return jsonify({"error": f"Invalid {param}"}), 400
+        window[param] = parsed.isoformat().replace("+00:00", "Z")
+
+    pantry_ids = request.args.getlist("pantry_id", type=int) or None
+    shifts = backend.list_calendar_shifts(pantry_ids, window_start=window["from"], window_end=window["to"])
+
+    pantries_by_id = {int(p.get("pantry_id")): p for p in backend.list_pantries()}
+    groups: dict[int, dict[str, Any]] = {}
+    for shift in shifts:
+        pantry_id = int(shift.get("pantry_id"))
+        group = groups.get(pantry_id)
+        if group is None:
+            pantry = pantries_by_id.get(pantry_id) or {}
+            group = groups[pantry_id] = {
+                "pantry_id": pantry_id,
+                "name": pantry.get("name"),
+                "location_address": pantry.get("location_address"),
+                "shifts": [],
+            }
+        group["shifts"].append(shift)
+    return jsonify(list(groups.values()))
+
+
 @app.post("/api/pantries/<int:pantry_id>/shifts")
 def create_shift(pantry_id: int) -> Any:
     """Create a new shift (PANTRY_LEAD or ADMIN)."""
@@ -601,7 +859,7 @@ def create_shift(pantry_id: int) -> Any:
     if not (is_admin or is_lead):
         return jsonify({"error": "Forbidden"}), 403
 
-    if not is_admin and not backend.is_pantry_lead(pantry_id, user_id):
+    if not is_admin and not user_is_pantry_lead(pantry_id, user_id):
         return jsonify({"error": "Not a lead for this pantry"}), 403
 
     pantry = find_pantry_by_id(pantry_id)
@@ -613,7 +871,16 @@ def create_shift(pantry_id: int) -> Any:
     missing = [k for k in required if not payload.get(k)]
     if missing:
         return jsonify({"error": f"Missing: {', '.join(missing)}"}), 400
+    if not RECORD_STATUSES.is_valid(payload.get("status", "OPEN")):
+        return jsonify({"error": "Invalid status"}), 400
+
+    roles, error = parse_new_shift_roles(payload.get("roles"))
+    if error:
+        return jsonify({"error": error}), 400
+    if roles and str(payload.get("status", "OPEN")).upper() == "CANCELLED":
+        return jsonify({"error": "Cannot add roles to a cancelled shift"}), 400
 
+    # The shift and its roles are written together, in one transaction.
     shift = backend.create_shift(
         pantry_id=pantry_id,
         shift_name=payload["shift_name"],
@@ -621,8 +888,8 @@ def create_shift(pantry_id: int) -> Any:
         end_time=payload["end_time"],
         status=payload.get("status", "OPEN"),
         created_by=user_id,
+        roles=roles,
     )
-    shift["roles"] = []
     return jsonify(shift), 201
 
 
@@ -633,8 +900,6 @@ def get_shift(shift_id: int) -> Any:
     if not shift:
         return jsonify({"error": "Not found"}), 404
 
-    expire_pending_signups_if_started(shift_id)
-
     user = current_user()
     pantry_id = int(shift.get("pantry_id"))
     include_cancelled = should_include_cancelled_shift_data(user, pantry_id)
@@ -657,27 +922,33 @@ def get_shift_registrations(shift_id: int) -> Any:
     is_admin = user_has_role(user_id, "ADMIN")
     pantry_id = int(shift.get("pantry_id"))
 
-    if not is_admin and not backend.is_pantry_lead(pantry_id, user_id):
+    if not is_admin and not user_is_pantry_lead(pantry_id, user_id):
         return jsonify({"error": "Forbidden"}), 403
 
-    expire_pending_signups_if_started(shift_id)
+    roles = get_shift_roles(shift_id, include_cancelled=True)
+    signups_by_role = backend.list_signups_for_roles([int(role.get("shift_role_id")) for role in roles])
+    shift_start = parse_iso_datetime_to_utc(shift.get("start_time"))
+    for signups in signups_by_role.values():
+        present_lapsed_reservations(signups, shift_start)
+    users_by_id = backend.get_users_by_ids(
+        [int(signup.get("user_id")) for signups in signups_by_role.values() for signup in signups]
+    )
 
     roles_with_signups: list[dict[str, Any]] = []
-    for role in get_shift_roles(shift_id, include_cancelled=True):
-        role_id = int(role.get("shift_role_id"))
-        signups = get_shift_signups(role_id)
+    for role in roles:
+        signups = signups_by_role.get(int(role.get("shift_role_id")), [])
         pending_reconfirm_count = 0
 
         enriched_signups: list[dict[str, Any]] = []
         for signup in signups:
-            signup_status = str(signup.get("signup_status", "")).upper()
+            signup_status = signup.get("signup_status")
             if signup_status == SIGNUP_STATUS_PENDING_CONFIRMATION:
                 pending_reconfirm_count += 1
                 continue
             if signup_status not in LEAD_VISIBLE_SIGNUP_STATUSES:
                 continue
             signup_with_user = dict(signup)
-            signup_user = find_user_by_id(int(signup.get("user_id")))
+            signup_user = users_by_id.get(int(signup.get("user_id")))
             signup_with_user["user"] = serialize_signup_user(signup_user)
             enriched_signups.append(signup_with_user)
 
@@ -719,18 +990,107 @@ def update_shift(shift_id: int) -> Any:
     payload = {key: value for key, value in payload.items() if key in allowed_keys}
     if not payload:
         return jsonify({"error": "No valid fields to update"}), 400
+    if "status" in payload and not RECORD_STATUSES.is_valid(payload["status"]):
+        return jsonify({"error": "Invalid status"}), 400
 
-    updated = backend.update_shift(shift_id, payload)
+    changes = diff_shift_fields(shift, payload)
+    updated = backend.update_shift(shift_id, changes) if changes else shift
     if not updated:
         return jsonify({"error": "Not found"}), 404
 
-    affected = mark_shift_signups_pending(shift_id)
-    recalculate_shift_capacities(shift_id)
+    if shift_changes_affect_signups(changes):
+        affected = mark_shift_signups_pending(shift_id)
+    else:
+        affected = {"affected_signup_count": 0, "affected_volunteer_contacts": []}
     updated["roles"] = get_shift_roles(shift_id, include_cancelled=True)
     updated.update(affected)
     return jsonify(updated)
 
 
+@app.put("/api/shifts/<int:shift_id>/full")
+def replace_shift(shift_id: int) -> Any:
+    """Apply a complete shift and role set in one request (PANTRY_LEAD or ADMIN).
+
+    Only the differences from the stored shift are written: changed fields and
+    roles are updated, roles without ``shift_role_id`` are created, and missing
+    roles are deleted (or cancelled when they have signups). Affected signups are
+    marked for reconfirmation once, and only if the edit affects them.
+    """
+    user = current_user()
+    if not user:
+        return jsonify({"error": "Forbidden"}), 403
+
+    shift = backend.get_shift_by_id(shift_id)
+    if not shift:
+        return jsonify({"error": "Not found"}), 404
+
+    user_id = int(user.get("user_id"))
+    if not ensure_shift_manager_permission(user_id, shift):
+        return jsonify({"error": "Forbidden"}), 403
+    if shift_has_ended(shift):
+        return past_shift_locked_response()
+
+    payload = request.get_json(silent=True) or {}
+    required = ["shift_name", "start_time", "end_time", "roles"]
+    missing = [k for k in required if payload.get(k) in (None, "")]
+    if missing:
+        return jsonify({"error": f"Missing: {', '.join(missing)}"}), 400
+    if "status" in payload and not RECORD_STATUSES.is_valid(payload["status"]):
+        return jsonify({"error": "Invalid status"}), 400
+    if any(parse_iso_datetime_to_utc(payload[key]) is None for key in ["start_time", "end_time"]):
+        return jsonify({"error": "Invalid start_time or end_time"}), 400
+
+    current_roles = {int(role["shift_role_id"]): role for role in get_shift_roles(shift_id, include_cancelled=True)}
+    roles, error = parse_new_shift_roles(payload["roles"], existing_role_ids=set(current_roles))
+    if error:
+        return jsonify({"error": error}), 400
+
+    shift_changes = diff_shift_fields(shift, payload)
+    affects_signups = shift_changes_affect_signups(shift_changes)
+    role_changes: dict[int, dict[str, Any]] = {}
+    new_roles: list[dict[str, Any]] = []
+    for role in roles:
+        if "shift_role_id" not in role:
+            new_roles.append(role)
+            continue
+        current = current_roles[role["shift_role_id"]]
+        changes = diff_role_fields(current, role)
+        if changes:
+            role_changes[role["shift_role_id"]] = changes
+            affects_signups = affects_signups or role_changes_affect_signups(current, changes)
+    kept_role_ids = {role["shift_role_id"] for role in roles if "shift_role_id" in role}
+    removed_role_ids = [
+        shift_role_id
+        for shift_role_id, role in current_roles.items()
+        if shift_role_id not in kept_role_ids and role.get("status") != "CANCELLED"
+    ]
+    if new_roles and (shift_changes.get("status") or shift.get("status")) == "CANCELLED":
+        return jsonify({"error": "Cannot add roles to a cancelled shift"}), 400
+
+    # With per-request transactions (MySQL default) everything below commits together.
+    if shift_changes:
+        shift = backend.update_shift(shift_id, shift_changes) or shift
+    for shift_role_id, changes in role_changes.items():
+        backend.update_shift_role(shift_role_id, changes)
+    for role in new_roles:
+        backend.create_shift_role(shift_id=shift_id, role_title=role["role_title"], required_count=role["required_count"])
+    signups_by_role = backend.list_signups_for_roles(removed_role_ids)
+    for shift_role_id in removed_role_ids:
+        if signups_by_role.get(shift_role_id):
+            backend.update_shift_role(shift_role_id, {"status": "CANCELLED"})
+            affects_signups = True
+        else:
+            backend.delete_shift_role(shift_role_id)
+
+    if affects_signups:
+        affected = mark_shift_signups_pending(shift_id)
+    else:
+        affected = {"affected_signup_count": 0, "affected_volunteer_contacts": []}
+    shift["roles"] = get_shift_roles(shift_id, include_cancelled=True)
+    shift.update(affected)
+    return jsonify(shift)
+
+
 @app.delete("/api/shifts/<int:shift_id>")
 def delete_shift(shift_id: int) -> Any:
     """Cancel a shift (PANTRY_LEAD or ADMIN)."""
@@ -753,7 +1113,6 @@ def delete_shift(shift_id: int) -> Any:
         return jsonify({"error": "Not found"}), 404
 
     affected = mark_shift_signups_pending(shift_id)
-    recalculate_shift_capacities(shift_id)
     updated_shift["roles"] = get_shift_roles(shift_id, include_cancelled=True)
     updated_shift.update(affected)
     return jsonify(updated_shift), 200
@@ -776,11 +1135,11 @@ def create_shift_role(shift_id: int) -> Any:
     is_admin = user_has_role(user_id, "ADMIN")
     pantry_id = int(shift.get("pantry_id"))
 
-    if not is_admin and not backend.is_pantry_lead(pantry_id, user_id):
+    if not is_admin and not user_is_pantry_lead(pantry_id, user_id):
         return jsonify({"error": "Forbidden"}), 403
     if shift_has_ended(shift):
         return past_shift_locked_response()
-    if str(shift.get("status", "OPEN")).upper() == "CANCELLED":
+    if shift.get("status", "OPEN") == "CANCELLED":
         return jsonify({"error": "Cannot add roles to a cancelled shift"}), 400
 
     payload = request.get_json(silent=True) or {}
@@ -830,6 +1189,8 @@ def update_shift_role(shift_role_id: int) -> Any:
     payload = {key: value for key, value in payload.items() if key in allowed_keys}
     if not payload:
         return jsonify({"error": "No valid fields to update"}), 400
+    if "status" in payload and not RECORD_STATUSES.is_valid(payload["status"]):
+        return jsonify({"error": "Invalid status"}), 400
 
     if "required_count" in payload:
         try:
@@ -840,14 +1201,16 @@ def update_shift_role(shift_role_id: int) -> Any:
         except (TypeError, ValueError):
             return jsonify({"error": "required_count must be >= 1"}), 400
 
-    updated = backend.update_shift_role(shift_role_id, payload)
+    changes = diff_role_fields(shift_role, payload)
+    updated = backend.update_shift_role(shift_role_id, changes) if changes else shift_role
     if not updated:
         return jsonify({"error": "Not found"}), 404
 
-    shift_id = int(shift.get("shift_id"))
-    affected = mark_shift_signups_pending(shift_id)
-    recalculate_shift_role_capacity(shift_role_id)
-    updated = backend.get_shift_role_by_id(shift_role_id) or updated
+    if role_changes_affect_signups(shift_role, changes):
+        affected = mark_shift_signups_pending(int(shift.get("shift_id")))
+        updated = backend.get_shift_role_by_id(shift_role_id) or updated
+    else:
+        affected = {"affected_signup_count": 0, "affected_volunteer_contacts": []}
     updated.update(affected)
     return jsonify(updated)
 
@@ -878,9 +1241,8 @@ def delete_shift_role(shift_role_id: int) -> Any:
         backend.delete_shift_role(shift_role_id)
         return jsonify({"success": True, "affected_signup_count": 0, "affected_volunteer_contacts": []}), 200
 
-    updated_role = backend.update_shift_role(shift_role_id, {"status": "CANCELLED", "filled_count": 0})
+    updated_role = backend.update_shift_role(shift_role_id, {"status": "CANCELLED"})
     affected = mark_shift_signups_pending(int(shift.get("shift_id")))
-    recalculate_shift_role_capacity(shift_role_id)
     updated_role = backend.get_shift_role_by_id(shift_role_id) or updated_role
 
     response = {
@@ -910,11 +1272,11 @@ def create_signup(shift_role_id: int) -> Any:
 
     expire_pending_signups_if_started(int(shift.get("shift_id")))
 
-    if str(shift.get("status", "OPEN")).upper() == "CANCELLED":
+    if shift.get("status", "OPEN") == "CANCELLED":
         return jsonify({"error": "Shift is cancelled"}), 400
     if shift_has_ended(shift):
         return jsonify({"error": "Shift has ended"}), 400
-    if str(shift_role.get("status", "OPEN")).upper() == "CANCELLED":
+    if shift_role.get("status", "OPEN") == "CANCELLED":
         return jsonify({"error": "Shift role is cancelled"}), 400
 
     payload = request.get_json(silent=True) or {}
@@ -939,7 +1301,6 @@ def create_signup(shift_role_id: int) -> Any:
     except RuntimeError as exc:
         return jsonify({"error": str(exc)}), 400
 
-    recalculate_shift_role_capacity(shift_role_id)
     signup["user"] = serialize_signup_user(find_user_by_id(user_id))
     return jsonify(signup), 201
 
@@ -951,12 +1312,10 @@ def get_signups_for_role(shift_role_id: int) -> Any:
     if not shift_role:
         return jsonify({"error": "Not found"}), 404
 
-    expire_pending_signups_if_started(int(shift_role.get("shift_id")))
-    signups = get_shift_signups(shift_role_id)
-    for signup in signups:
-        signup["user"] = serialize_signup_user(find_user_by_id(int(signup.get("user_id"))))
-
-    return jsonify(signups)
+    shift = backend.get_shift_by_id(int(shift_role.get("shift_id")))
+    shift_start = parse_iso_datetime_to_utc(shift.get("start_time")) if shift else None
+    signups = present_lapsed_reservations(get_shift_signups(shift_role_id), shift_start)
+    return jsonify(attach_signup_users(signups))
 
 
 @app.delete("/api/signups/<int:signup_id>")
@@ -1015,7 +1374,7 @@ def reconfirm_signup(signup_id: int) -> Any:
     if not signup:
         return jsonify({"error": "Not found"}), 404
 
-    current_status = str(signup.get("signup_status", "")).upper()
+    current_status = signup.get("signup_status")
     if action == "CANCEL":
         backend.delete_signup(signup_id)
         return jsonify({"success": True, "removed_signup_id": signup_id}), 200
@@ -1024,14 +1383,16 @@ def reconfirm_signup(signup_id: int) -> Any:
         return jsonify({"error": "Signup is not pending confirmation"}), 400
 
     reconfirm_result = backend.reconfirm_pending_signup(signup_id, utc_now_iso())
-    result_code = str(reconfirm_result.get("result", "")).upper()
+    result_code = reconfirm_result.get("result")
     updated_signup = reconfirm_result.get("signup")
-    recalculate_shift_role_capacity(int(shift_role.get("shift_role_id")))
 
     if result_code == "NOT_FOUND" or not updated_signup:
         return jsonify({"error": "Not found"}), 404
     if result_code == "CONFIRMED":
         return jsonify(updated_signup), 200
+    if result_code in {"WAITLISTED", "EXPIRED"}:
+        # The 409 reports a status change that must be kept.
+        g.commit_response = True
     if result_code == "WAITLISTED":
         return (
             jsonify({"error": "ROLE_FULL_OR_UNAVAILABLE", "code": "ROLE_FULL_OR_UNAVAILABLE", "signup": updated_signup}),
@@ -1085,6 +1446,8 @@ def update_signup(signup_id: int) -> Any:
     payload = request.get_json(silent=True) or {}
     if "signup_status" in payload:
         requested_status = str(payload["signup_status"]).strip().upper()
+        if not SIGNUP_STATUSES.is_valid(requested_status):
+            return jsonify({"error": "Invalid signup_status"}), 400
         if requested_status in ATTENDANCE_STATUSES:
             updated, error = set_attendance_status(
                 signup_id=signup_id,
@@ -1103,6 +1466,107 @@ def update_signup(signup_id: int) -> Any:
     return jsonify(signup)
 
 
+# ========== SHIFT TEMPLATES ==========
+
+@app.get("/api/pantries/<int:pantry_id>/shift-templates")
+def list_shift_templates(pantry_id: int) -> Any:
+    """List weekly shift templates for a pantry (PANTRY_LEAD or ADMIN)."""
+    user = current_user()
+    if not user or not ensure_pantry_manager_permission(int(user.get("user_id")), pantry_id):
+        return jsonify({"error": "Forbidden"}), 403
+    if not find_pantry_by_id(pantry_id):
+        return jsonify({"error": "Pantry not found"}), 404
+
+    return jsonify(backend.list_shift_templates(pantry_id))
+
+
+@app.post("/api/pantries/<int:pantry_id>/shift-templates")
+def create_shift_template(pantry_id: int) -> Any:
+    """Create a weekly shift template with its roles (PANTRY_LEAD or ADMIN)."""
+    user = current_user()
+    if not user:
+        return jsonify({"error": "Forbidden"}), 403
+    user_id = int(user.get("user_id"))
+    if not ensure_pantry_manager_permission(user_id, pantry_id):
+        return jsonify({"error": "Forbidden"}), 403
+    if not find_pantry_by_id(pantry_id):
+        return jsonify({"error": "Pantry not found"}), 404
+
+    template, error = parse_shift_template_payload(request.get_json(silent=True) or {})
+    if error:
+        return jsonify({"error": error}), 400
+
+    created = backend.create_shift_template(pantry_id=pantry_id, created_by=user_id, **template)
+    return jsonify(created), 201
+
+
+@app.delete("/api/shift-templates/<int:template_id>")
+def delete_shift_template(template_id: int) -> Any:
+    """Delete a shift template; shifts already generated from it are kept."""
+    user = current_user()
+    if not user:
+        return jsonify({"error": "Forbidden"}), 403
+
+    template = backend.get_shift_template_by_id(template_id)
+    if not template:
+        return jsonify({"error": "Not found"}), 404
+    if not ensure_pantry_manager_permission(int(user.get("user_id")), int(template.get("pantry_id"))):
+        return jsonify({"error": "Forbidden"}), 403
+
+    backend.delete_shift_template(template_id)
+    return jsonify({"success": True}), 200
+
+
+@app.post("/api/pantries/<int:pantry_id>/shift-templates/generate")
+def generate_pantry_template_shifts(pantry_id: int) -> Any:
+    """Create shifts from a pantry's templates for the given weeks (PANTRY_LEAD or ADMIN).
+
+    Occurrences that were already generated are skipped, so re-running is safe.
+    """
+    user = current_user()
+    if not user:
+        return jsonify({"error": "Forbidden"}), 403
+    user_id = int(user.get("user_id"))
+    if not ensure_pantry_manager_permission(user_id, pantry_id):
+        return jsonify({"error": "Forbidden"}), 403
+    if not find_pantry_by_id(pantry_id):
+        return jsonify({"error": "Pantry not found"}), 404
+
+    window, error = parse_template_generation_payload(request.get_json(silent=True) or {})
+    if error:
+        return jsonify({"error": error}), 400
+
+    result = backend.generate_template_shifts(created_by=user_id, pantry_id=pantry_id, **window)
+    return jsonify({**window, **result}), 201
+
+
+@app.post("/api/shift-templates/generate")
+def generate_all_template_shifts() -> Any:
+    """Create shifts from every pantry's templates for the given weeks (ADMIN only)."""
+    user = current_user()
+    if not user or not user_has_role(int(user.get("user_id")), "ADMIN"):
+        return jsonify({"error": "Forbidden"}), 403
+
+    window, error = parse_template_generation_payload(request.get_json(silent=True) or {})
+    if error:
+        return jsonify({"error": error}), 400
+
+    result = backend.generate_template_shifts(created_by=int(user.get("user_id")), **window)
+    return jsonify({**window, **result}), 201
+
+
+# ========== ADMIN ==========
+
+@app.get("/api/admin/pool-stats")
+def get_pool_stats() -> Any:
+    """Database connection pool metrics (ADMIN only)."""
+    user = current_user()
+    if not user or not user_has_role(int(user.get("user_id")), "ADMIN"):
+        return jsonify({"error": "Forbidden"}), 403
+
+    return jsonify({"pool": backend.pool_stats()})
+
+
 # ========== PUBLIC ==========
 
 @app.get("/api/public/pantries")
@@ -1119,13 +1583,7 @@ def get_public_shifts(slug: str) -> Any:
         return jsonify([])
 
     pantry_id = int(pantry.get("pantry_id"))
-    shifts = backend.list_shifts_by_pantry(pantry_id, include_cancelled=False)
-
-    for shift in shifts:
-        shift_id = int(shift.get("shift_id"))
-        expire_pending_signups_if_started(shift_id)
-        shift["roles"] = get_shift_roles(shift_id, include_cancelled=False)
-
+    shifts = get_pantry_shift_tree(pantry_id, include_cancelled=False)
     return jsonify(shifts)
 
 
@@ -1144,4 +1602,8 @@ def dashboard() -> Any:
 
 
 if __name__ == "__main__":
+    # The debug reloader re-runs this module in a child process that does the serving;
+    # start the worker there only, not in the watching parent.
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_expiry_worker()
     app.run(debug=True, port=5000)
@@ -1,10 +1,29 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable
 
 
 class StoreBackend(ABC):
+    def begin_request(self, read_only: bool = False) -> None:
+        """Called before each HTTP request; ``read_only`` is set for requests that must not write."""
+
+    def end_request(self, commit: bool = True) -> None:
+        """Called after each HTTP request; ``commit`` is False when the request raised or
+        returned an error response whose writes should not be kept."""
+
+    def pool_stats(self) -> dict[str, Any] | None:
+        """Connection pool metrics, or None for backends without a pool."""
+        return None
+
+    def add_lead_change_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` after any pantry lead assignment changes, whoever made it."""
+        self._lead_change_listeners = [*getattr(self, "_lead_change_listeners", ()), callback]
+
+    def _notify_lead_change(self) -> None:
+        for callback in getattr(self, "_lead_change_listeners", ()):
+            callback()
+
     @abstractmethod
     def get_user_by_id(self, user_id: int) -> dict[str, Any] | None:
         raise NotImplementedError
@@ -13,6 +32,14 @@ class StoreBackend(ABC):
     def get_user_roles(self, user_id: int) -> list[str]:
         raise NotImplementedError
 
+    @abstractmethod
+    def get_users_by_ids(self, user_ids: list[int]) -> dict[int, dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_user_roles_bulk(self, user_ids: list[int]) -> dict[int, list[str]]:
+        raise NotImplementedError
+
     @abstractmethod
     def list_users(self, role_filter: str | None = None) -> list[dict[str, Any]]:
         raise NotImplementedError
@@ -52,6 +79,10 @@ class StoreBackend(ABC):
     def is_pantry_lead(self, pantry_id: int, user_id: int) -> bool:
         raise NotImplementedError
 
+    @abstractmethod
+    def list_lead_pantry_ids(self, user_id: int) -> list[int]:
+        raise NotImplementedError
+
     @abstractmethod
     def create_pantry(self, name: str, location_address: str, lead_ids: list[int]) -> dict[str, Any]:
         raise NotImplementedError
@@ -76,6 +107,24 @@ class StoreBackend(ABC):
     ) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def list_shift_tree_by_pantry(
+        self,
+        pantry_id: int,
+        include_cancelled: bool = True,
+        non_expired_only: bool = False,
+    ) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_calendar_shifts(
+        self,
+        pantry_ids: list[int] | None = None,
+        window_start: str | None = None,
+        window_end: str | None = None,
+    ) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
     @abstractmethod
     def get_shift_by_id(self, shift_id: int) -> dict[str, Any] | None:
         raise NotImplementedError
@@ -89,6 +138,7 @@ class StoreBackend(ABC):
         end_time: str,
         status: str,
         created_by: int,
+        roles: list[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         raise NotImplementedError
 
@@ -100,6 +150,41 @@ class StoreBackend(ABC):
     def delete_shift(self, shift_id: int) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    def list_shift_templates(self, pantry_id: int) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_shift_template_by_id(self, template_id: int) -> dict[str, Any] | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def create_shift_template(
+        self,
+        pantry_id: int,
+        template_name: str,
+        weekday: int,
+        start_time: str,
+        end_time: str,
+        created_by: int,
+        roles: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_shift_template(self, template_id: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def generate_template_shifts(
+        self,
+        start_date: str,
+        weeks: int,
+        created_by: int,
+        pantry_id: int | None = None,
+    ) -> dict[str, Any]:
+        raise NotImplementedError
+
     @abstractmethod
     def list_shift_roles(self, shift_id: int) -> list[dict[str, Any]]:
         raise NotImplementedError
@@ -124,6 +209,10 @@ class StoreBackend(ABC):
     def list_shift_signups(self, shift_role_id: int) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def list_signups_for_roles(self, shift_role_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        raise NotImplementedError
+
     @abstractmethod
     def list_signups_by_user(self, user_id: int) -> list[dict[str, Any]]:
         raise NotImplementedError
@@ -148,6 +237,14 @@ class StoreBackend(ABC):
     def bulk_mark_shift_signups_pending(self, shift_id: int, reservation_expires_at: str) -> list[dict[str, Any]]:
         raise NotImplementedError
 
+    @abstractmethod
+    def list_pending_expiry_deadlines(self) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def expire_overdue_pending_signups(self, now_utc: str, batch_size: int = 500) -> dict[str, Any]:
+        raise NotImplementedError
+
     @abstractmethod
     def expire_pending_signups(self, shift_id: int, now_utc: str) -> int:
         raise NotImplementedError
@@ -156,6 +253,14 @@ class StoreBackend(ABC):
     def reconfirm_pending_signup(self, signup_id: int, now_utc: str) -> dict[str, Any]:
         raise NotImplementedError
 
+    @abstractmethod
+    def rebuild_attendance_counters(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def verify_role_capacities(self, repair: bool = False) -> list[dict[str, Any]]:
+        raise NotImplementedError
+
     @abstractmethod
     def is_empty(self) -> bool:
         raise NotImplementedError
@@ -1,10 +1,27 @@
 from __future__ import annotations
 
+import atexit
 import os
 from pathlib import Path
 
 from backends.base import StoreBackend
 from backends.memory_backend import MemoryBackend
+from backends.memory_journal import MemoryJournal
+
+
+def create_memory_journal(data_dir: Path) -> MemoryJournal | None:
+    if os.getenv("MEMORY_JOURNAL", "false").strip().lower() != "true":
+        return None
+    journal = MemoryJournal(
+        journal_path=data_dir / "db.journal.jsonl",
+        snapshot_path=data_dir / "db.snapshot.json",
+        fsync_mode=os.getenv("MEMORY_JOURNAL_FSYNC", "batch"),
+        batch_size=int(os.getenv("MEMORY_JOURNAL_BATCH_SIZE", "32")),
+        interval_seconds=float(os.getenv("MEMORY_JOURNAL_FSYNC_INTERVAL_SECONDS", "1.0")),
+        compact_every=int(os.getenv("MEMORY_JOURNAL_COMPACT_EVERY", "1000")),
+    )
+    atexit.register(journal.close)
+    return journal
 
 
 def create_backend() -> StoreBackend:
@@ -15,7 +32,9 @@ def create_backend() -> StoreBackend:
         from db.seed import seed_mysql_from_json
 
         init_schema()
-        backend = MySQLBackend()
+        backend = MySQLBackend(
+            request_transactions=os.getenv("MYSQL_REQUEST_TRANSACTION", "true").strip().lower() == "true",
+        )
         should_seed = os.getenv("SEED_MYSQL_FROM_JSON_ON_EMPTY", "true").strip().lower() == "true"
         if should_seed and backend.is_empty():
             data_path = Path(__file__).resolve().parents[1] / "data" / "db.json"
@@ -23,4 +42,5 @@ def create_backend() -> StoreBackend:
                 seed_mysql_from_json(data_path=data_path, truncate=False)
         return backend
 
-    return MemoryBackend()
+    data_dir = Path(__file__).resolve().parents[1] / "data"
+    return MemoryBackend(journal=create_memory_journal(data_dir))
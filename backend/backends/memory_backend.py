@@ -1,21 +1,150 @@
 from __future__ import annotations
 
+import functools
+import heapq
 import json
-from datetime import datetime, timedelta, timezone
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator, TypeVar
 
 from backends.base import StoreBackend
+from backends.memory_journal import MemoryJournal
+from backends.memory_locks import LockStripes, ReadWriteLock
+from backends.memory_records import MemoryRecord, ShiftRecord, ShiftRoleRecord, SignupRecord, UserRecord
+from backends.shift_templates import format_clock, template_occurrences
+from backends.statuses import (
+    ACTIVE_SIGNUP_CODES,
+    MARKED_ATTENDANCE_CODES,
+    RECORD_STATUSES,
+    RELEASED_SIGNUP_CODES,
+    SIGNUP_CANCELLED,
+    SIGNUP_CONFIRMED,
+    SIGNUP_PENDING_CONFIRMATION,
+    SIGNUP_SHOW_UP,
+    SIGNUP_STATUSES,
+    SIGNUP_WAITLISTED,
+    STATUS_CANCELLED,
+    STATUS_FULL,
+    STATUS_OPEN,
+)
 
-ACTIVE_SIGNUP_STATUSES = {"CONFIRMED", "SHOW_UP", "NO_SHOW"}
-PENDING_SIGNUP_STATUS = "PENDING_CONFIRMATION"
 RESERVATION_WINDOW_HOURS = 48
 
+TABLE_KEYS: dict[str, tuple[str, ...]] = {
+    "users": ("user_id",),
+    "roles": ("role_id",),
+    "user_roles": ("user_id", "role_id"),
+    "pantries": ("pantry_id",),
+    "pantry_leads": ("pantry_id", "user_id"),
+    "shifts": ("shift_id",),
+    "shift_roles": ("shift_role_id",),
+    "shift_signups": ("signup_id",),
+    "shift_templates": ("template_id",),
+    "shift_template_roles": ("template_role_id",),
+}
+RECORD_TYPES: dict[str, type[MemoryRecord]] = {
+    "users": UserRecord,
+    "shifts": ShiftRecord,
+    "shift_roles": ShiftRoleRecord,
+    "shift_signups": SignupRecord,
+}
+
+F = TypeVar("F", bound=Callable[..., Any])
+
 
 def _utc_now_iso() -> str:
     return datetime.utcnow().isoformat() + "Z"
 
 
+def _attendance_counts(status_code: int | None) -> tuple[int, int]:
+    return (1 if status_code == SIGNUP_SHOW_UP else 0, 1 if status_code in MARKED_ATTENDANCE_CODES else 0)
+
+
+def _occupies_slot(status_code: int | None, reservation_expires_at: Any) -> bool:
+    return status_code in ACTIVE_SIGNUP_CODES or (
+        status_code == SIGNUP_PENDING_CONFIRMATION and reservation_expires_at is not None
+    )
+
+
+def _pending_reservation_value() -> str:
+    return (datetime.now(timezone.utc) + timedelta(hours=RESERVATION_WINDOW_HOURS)).isoformat().replace("+00:00", "Z")
+
+
+def _attendance_score(attended_count: int, marked_count: int) -> int:
+    if marked_count <= 0:
+        return 100
+    return round((attended_count * 100) / marked_count)
+
+
+def _index_add(index: dict[int, dict[int, Any]], parent_id: int, child_id: int, row: Any) -> None:
+    index.setdefault(parent_id, {})[child_id] = row
+
+
+def _index_discard(index: dict[int, dict[int, Any]], parent_id: int, child_id: int) -> None:
+    children = index.get(parent_id)
+    if children is None:
+        return
+    children.pop(child_id, None)
+    if not children:
+        del index[parent_id]
+
+
+def _row_key(table: str, row: Any) -> tuple[Any, ...]:
+    return tuple(row.get(field) for field in TABLE_KEYS[table])
+
+
+def _make_row(table: str, row: dict[str, Any]) -> Any:
+    record_type = RECORD_TYPES.get(table)
+    return record_type.from_row(row) if record_type else dict(row)
+
+
+def _tables_from_data(data: dict[str, Any]) -> dict[str, list[Any]]:
+    return {table: [_make_row(table, row) for row in data.get(table, [])] for table in TABLE_KEYS}
+
+
+def _reader(method: F) -> F:
+    @functools.wraps(method)
+    def wrapper(self: MemoryBackend, *args: Any, **kwargs: Any) -> Any:
+        with self._rw_lock.read():
+            return method(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _writer(method: F) -> F:
+    """Run a structural change exclusively and journal it before releasing the lock."""
+
+    @functools.wraps(method)
+    def wrapper(self: MemoryBackend, *args: Any, **kwargs: Any) -> Any:
+        with self._rw_lock.write():
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._flush_journal()
+                self._compact_journal_if_due()
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _signup_writer(method: F) -> F:
+    """Run a signup change alongside other readers/signup changes.
+
+    The method serializes per shift role itself through ``_role_guard``.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: MemoryBackend, *args: Any, **kwargs: Any) -> Any:
+        try:
+            with self._rw_lock.read():
+                return method(self, *args, **kwargs)
+        finally:
+            self._compact_journal_if_due()
+
+    return wrapper  # type: ignore[return-value]
+
+
 def _parse_iso_to_utc(value: Any) -> datetime | None:
     if not value:
         return None
@@ -36,9 +165,14 @@ def _parse_iso_to_utc(value: Any) -> datetime | None:
 
 
 class MemoryBackend(StoreBackend):
-    def __init__(self, data_path: Path | None = None) -> None:
+    def __init__(self, data_path: Path | None = None, journal: MemoryJournal | None = None) -> None:
         self._data_path = data_path or (Path(__file__).resolve().parents[1] / "data" / "db.json")
-        self.store: dict[str, list[dict[str, Any]]] = {
+        self._journal = journal
+        self._journal_local = threading.local()
+        self._rw_lock = ReadWriteLock()
+        self._role_locks = LockStripes()
+        self._shared_lock = threading.RLock()
+        self.store: dict[str, list[Any]] = {
             "users": [],
             "roles": [],
             "user_roles": [],
@@ -47,112 +181,389 @@ class MemoryBackend(StoreBackend):
             "shifts": [],
             "shift_roles": [],
             "shift_signups": [],
+            "shift_templates": [],
+            "shift_template_roles": [],
         }
+        self.next_user_id = 1
+        self.next_pantry_id = 1
         self.next_shift_id = 1
         self.next_shift_role_id = 1
         self.next_signup_id = 1
+        self.next_template_id = 1
+        self.next_template_role_id = 1
+        self._users_by_id: dict[int, UserRecord] = {}
+        self._user_ids_by_email: dict[str, int] = {}
+        self._roles_by_name: dict[str, dict[str, Any]] = {}
+        self._pantries_by_id: dict[int, dict[str, Any]] = {}
+        self._shifts_by_id: dict[int, ShiftRecord] = {}
+        self._shift_roles_by_id: dict[int, ShiftRoleRecord] = {}
+        self._signups_by_id: dict[int, SignupRecord] = {}
+        self._roles_by_id: dict[int, dict[str, Any]] = {}
+        self._role_ids_by_user: dict[int, dict[int, None]] = {}
+        self._lead_user_ids_by_pantry: dict[int, dict[int, None]] = {}
+        self._lead_pantry_ids_by_user: dict[int, dict[int, None]] = {}
+        self._shifts_by_pantry: dict[int, dict[int, ShiftRecord]] = {}
+        self._roles_by_shift: dict[int, dict[int, ShiftRoleRecord]] = {}
+        self._signups_by_role: dict[int, dict[int, SignupRecord]] = {}
+        self._signups_by_user: dict[int, dict[int, SignupRecord]] = {}
+        # signup_id -> position in store["shift_signups"], so a signup is removed without a scan.
+        self._signup_slots: dict[int, int] = {}
+        self._templates_by_id: dict[int, dict[str, Any]] = {}
+        self._templates_by_pantry: dict[int, dict[int, dict[str, Any]]] = {}
+        self._template_roles_by_template: dict[int, dict[int, dict[str, Any]]] = {}
+        self._attendance_counters: dict[int, list[int]] = {}
+        self._pending_deadlines: list[tuple[datetime, int]] = []
         self._load_seed_data()
 
-    def _copy(self, row: dict[str, Any] | None) -> dict[str, Any] | None:
-        return dict(row) if row else None
+    def _copy(self, row: MemoryRecord | dict[str, Any] | None) -> dict[str, Any] | None:
+        if not row:
+            return None
+        return row.to_dict() if isinstance(row, MemoryRecord) else dict(row)
+
+    def _rebuild_indexes(self) -> None:
+        self._users_by_id = {int(u.get("user_id")): u for u in self.store["users"]}
+        self._user_ids_by_email = {u.get("email"): int(u.get("user_id")) for u in self.store["users"]}
+        self._roles_by_name = {r.get("role_name"): r for r in self.store["roles"]}
+        self._pantries_by_id = {int(p.get("pantry_id")): p for p in self.store["pantries"]}
+        self._shifts_by_id = {int(s.get("shift_id")): s for s in self.store["shifts"]}
+        self._shift_roles_by_id = {int(sr.get("shift_role_id")): sr for sr in self.store["shift_roles"]}
+        self._signups_by_id = {int(ss.get("signup_id")): ss for ss in self.store["shift_signups"]}
+        self._signup_slots = {int(ss.get("signup_id")): slot for slot, ss in enumerate(self.store["shift_signups"])}
+        self._roles_by_id = {int(r.get("role_id")): r for r in self.store["roles"]}
+
+        self._role_ids_by_user = {}
+        for ur in self.store["user_roles"]:
+            _index_add(self._role_ids_by_user, int(ur.get("user_id")), int(ur.get("role_id")), None)
+        self._lead_user_ids_by_pantry = {}
+        self._lead_pantry_ids_by_user = {}
+        for pl in self.store["pantry_leads"]:
+            self._index_pantry_lead(int(pl.get("pantry_id")), int(pl.get("user_id")))
+        self._shifts_by_pantry = {}
+        for shift in self.store["shifts"]:
+            _index_add(self._shifts_by_pantry, int(shift.get("pantry_id")), int(shift.get("shift_id")), shift)
+        self._roles_by_shift = {}
+        for role in self.store["shift_roles"]:
+            _index_add(self._roles_by_shift, int(role.get("shift_id")), int(role.get("shift_role_id")), role)
+        self._signups_by_role = {}
+        self._signups_by_user = {}
+        for signup in self.store["shift_signups"]:
+            self._index_signup(signup)
+        self._templates_by_id = {int(t.get("template_id")): t for t in self.store["shift_templates"]}
+        self._templates_by_pantry = {}
+        for template in self.store["shift_templates"]:
+            _index_add(self._templates_by_pantry, int(template.get("pantry_id")), int(template.get("template_id")), template)
+        self._template_roles_by_template = {}
+        for role in self.store["shift_template_roles"]:
+            _index_add(
+                self._template_roles_by_template,
+                int(role.get("template_id")),
+                int(role.get("template_role_id")),
+                role,
+            )
+        self._pending_deadlines = []
+        for signup in self.store["shift_signups"]:
+            if signup.get("signup_status") == SIGNUP_PENDING_CONFIRMATION:
+                self._track_pending_deadline(signup)
+
+        self.next_user_id = max(self._users_by_id, default=0) + 1
+        self.next_pantry_id = max(self._pantries_by_id, default=0) + 1
+        self.next_shift_id = max(self._shifts_by_id, default=0) + 1
+        self.next_shift_role_id = max(self._shift_roles_by_id, default=0) + 1
+        self.next_signup_id = max(self._signups_by_id, default=0) + 1
+        self.next_template_id = max(self._templates_by_id, default=0) + 1
+        self.next_template_role_id = max(
+            (int(role.get("template_role_id")) for role in self.store["shift_template_roles"]),
+            default=0,
+        ) + 1
+
+    def _index_pantry_lead(self, pantry_id: int, user_id: int) -> None:
+        _index_add(self._lead_user_ids_by_pantry, pantry_id, user_id, None)
+        _index_add(self._lead_pantry_ids_by_user, user_id, pantry_id, None)
+
+    def _index_signup(self, signup: SignupRecord) -> None:
+        signup_id = int(signup.get("signup_id"))
+        with self._shared_lock:
+            _index_add(self._signups_by_role, int(signup.get("shift_role_id")), signup_id, signup)
+            _index_add(self._signups_by_user, int(signup.get("user_id")), signup_id, signup)
+
+    def _unindex_signup(self, signup: SignupRecord) -> None:
+        signup_id = int(signup.get("signup_id"))
+        with self._shared_lock:
+            self._signups_by_id.pop(signup_id, None)
+            _index_discard(self._signups_by_role, int(signup.get("shift_role_id")), signup_id)
+            _index_discard(self._signups_by_user, int(signup.get("user_id")), signup_id)
+
+    def _store_signup(self, signup: SignupRecord) -> None:
+        signups = self.store["shift_signups"]
+        self._signup_slots[int(signup.get("signup_id"))] = len(signups)
+        signups.append(signup)
+
+    def _remove_stored_signup(self, signup: SignupRecord) -> None:
+        """Drop a signup from the table by moving the last row into its slot.
+
+        Callers hold ``_shared_lock`` or the exclusive writer lock.
+        """
+        signups = self.store["shift_signups"]
+        slot = self._signup_slots.pop(int(signup.get("signup_id")), None)
+        if slot is None:
+            return
+        last = signups.pop()
+        if slot < len(signups):
+            signups[slot] = last
+            self._signup_slots[int(last.get("signup_id"))] = slot
+
+    def _role_signups(self, shift_role_id: int) -> list[SignupRecord]:
+        with self._shared_lock:
+            return list(self._signups_by_role.get(shift_role_id, {}).values())
+
+    def _signup_deadline(self, signup: SignupRecord) -> datetime | None:
+        """When a pending signup lapses: the earlier of its shift start and reservation expiry."""
+        role = self._shift_roles_by_id.get(int(signup.get("shift_role_id")))
+        shift = self._shifts_by_id.get(int(role.get("shift_id"))) if role else None
+        if not shift:
+            return None
+        candidates = [
+            value
+            for value in (
+                _parse_iso_to_utc(shift.get("start_time")),
+                _parse_iso_to_utc(signup.get("reservation_expires_at")),
+            )
+            if value is not None
+        ]
+        return min(candidates) if candidates else None
+
+    def _track_pending_deadline(self, signup: SignupRecord) -> None:
+        deadline = self._signup_deadline(signup)
+        if deadline is None:
+            return
+        with self._shared_lock:
+            heapq.heappush(self._pending_deadlines, (deadline, int(signup.get("signup_id"))))
+
+    @contextmanager
+    def _role_guard(self, shift_role_ids: Iterable[int]) -> Iterator[None]:
+        """Serialize signup changes per shift role; journal them before the lock is released."""
+        with self._role_locks.hold(shift_role_ids):
+            try:
+                yield
+            finally:
+                self._flush_journal()
+
+    def _shift_role_ids(self, shift_id: int) -> list[int]:
+        return list(self._roles_by_shift.get(shift_id, {}))
+
+    def _refresh_role_status(self, role: ShiftRoleRecord) -> None:
+        if role.get("status") == STATUS_CANCELLED:
+            return
+        role["status"] = (
+            STATUS_FULL if int(role.get("filled_count", 0)) >= int(role.get("required_count", 0)) else STATUS_OPEN
+        )
 
-    def _recalculate_role_capacity(self, shift_role_id: int) -> None:
-        role = next((sr for sr in self.store["shift_roles"] if sr.get("shift_role_id") == shift_role_id), None)
+    def _apply_capacity_delta(self, shift_role_id: int, delta: int) -> None:
+        if delta == 0:
+            return
+        role = self._shift_roles_by_id.get(shift_role_id)
         if not role:
             return
+        role["filled_count"] = int(role.get("filled_count", 0)) + delta
+        self._refresh_role_status(role)
 
-        now_utc = datetime.now(timezone.utc)
-        active_count = 0
-        for signup in self.store["shift_signups"]:
-            if signup.get("shift_role_id") != shift_role_id:
+    def _transition_signup(
+        self,
+        signup: SignupRecord,
+        signup_status: int | None,
+        reservation_expires_at: str | None,
+    ) -> None:
+        """Move a signup to a new status code, applying capacity and attendance deltas.
+
+        A ``None`` status releases the signup (used right before it is deleted).
+        """
+        previous_status = signup.get("signup_status")
+        was_occupying = _occupies_slot(previous_status, signup.get("reservation_expires_at"))
+        is_occupying = _occupies_slot(signup_status, reservation_expires_at)
+        if signup_status is not None:
+            signup["signup_status"] = signup_status
+            signup["reservation_expires_at"] = reservation_expires_at
+            self._journal_put("shift_signups", signup)
+            if signup_status == SIGNUP_PENDING_CONFIRMATION:
+                self._track_pending_deadline(signup)
+        self._apply_capacity_delta(int(signup.get("shift_role_id")), int(is_occupying) - int(was_occupying))
+        self._apply_attendance_delta(int(signup.get("user_id")), previous_status, signup_status)
+
+    def _expire_role_reservations(self, shift_role_id: int, now_dt: datetime) -> int:
+        expired_count = 0
+        for signup in self._role_signups(shift_role_id):
+            if signup.get("signup_status") != SIGNUP_PENDING_CONFIRMATION:
                 continue
-            status = str(signup.get("signup_status", "")).upper()
             reservation_expires_at = _parse_iso_to_utc(signup.get("reservation_expires_at"))
-            if status in ACTIVE_SIGNUP_STATUSES or (
-                status == PENDING_SIGNUP_STATUS
-                and reservation_expires_at is not None
-                and reservation_expires_at > now_utc
-            ):
-                active_count += 1
+            if reservation_expires_at is None or reservation_expires_at > now_dt:
+                continue
+            self._transition_signup(signup, SIGNUP_CANCELLED, None)
+            expired_count += 1
+        return expired_count
 
-        role["filled_count"] = active_count
-        if str(role.get("status", "OPEN")).upper() == "CANCELLED":
+    def _count_role_occupancy(self) -> dict[int, int]:
+        counts: dict[int, int] = {}
+        for signup in self.store["shift_signups"]:
+            if _occupies_slot(signup.get("signup_status"), signup.get("reservation_expires_at")):
+                shift_role_id = int(signup.get("shift_role_id"))
+                counts[shift_role_id] = counts.get(shift_role_id, 0) + 1
+        return counts
+
+    @_writer
+    def verify_role_capacities(self, repair: bool = False) -> list[dict[str, Any]]:
+        counts = self._count_role_occupancy()
+        drift: list[dict[str, Any]] = []
+        for role in self.store["shift_roles"]:
+            shift_role_id = int(role.get("shift_role_id"))
+            expected_count = counts.get(shift_role_id, 0)
+            if int(role.get("filled_count", 0)) == expected_count:
+                continue
+            drift.append(
+                {
+                    "shift_role_id": shift_role_id,
+                    "filled_count": int(role.get("filled_count", 0)),
+                    "expected_count": expected_count,
+                }
+            )
+            if repair:
+                role["filled_count"] = expected_count
+                self._refresh_role_status(role)
+                self._journal_put("shift_roles", role)
+        return drift
+
+    def _apply_attendance_delta(self, user_id: int, old_status: int | None, new_status: int | None) -> None:
+        old_attended, old_marked = _attendance_counts(old_status)
+        new_attended, new_marked = _attendance_counts(new_status)
+        attended_delta = new_attended - old_attended
+        marked_delta = new_marked - old_marked
+        if attended_delta == 0 and marked_delta == 0:
             return
-        role["status"] = "FULL" if active_count >= int(role.get("required_count", 0)) else "OPEN"
 
-    def _calculate_user_attendance_score(self, user_id: int) -> int:
-        attended_count = 0
-        marked_count = 0
+        with self._shared_lock:
+            counters = self._attendance_counters.setdefault(user_id, [0, 0])
+            counters[0] += attended_delta
+            counters[1] += marked_delta
+            user = self._users_by_id.get(user_id)
+            if user:
+                user["attendance_score"] = _attendance_score(counters[0], counters[1])
+
+    @_writer
+    def rebuild_attendance_counters(self) -> None:
+        counters: dict[int, list[int]] = {}
         for signup in self.store["shift_signups"]:
-            if int(signup.get("user_id", 0)) != user_id:
+            attended, marked = _attendance_counts(signup.get("signup_status"))
+            if not marked:
                 continue
-            status = str(signup.get("signup_status", "")).upper()
-            if status == "SHOW_UP":
-                attended_count += 1
-            if status in {"SHOW_UP", "NO_SHOW"}:
-                marked_count += 1
-
-        if marked_count == 0:
-            return 100
-        return round((attended_count * 100) / marked_count)
-
-    def _recalculate_user_attendance_score(self, user_id: int) -> None:
-        user = next((u for u in self.store["users"] if int(u.get("user_id", 0)) == user_id), None)
-        if not user:
-            return
-        user["attendance_score"] = self._calculate_user_attendance_score(user_id)
+            user_counters = counters.setdefault(int(signup.get("user_id", 0)), [0, 0])
+            user_counters[0] += attended
+            user_counters[1] += marked
 
-    def _recalculate_all_attendance_scores(self) -> None:
+        self._attendance_counters = counters
         for user in self.store["users"]:
-            user["attendance_score"] = self._calculate_user_attendance_score(int(user.get("user_id", 0)))
+            attended_count, marked_count = counters.get(int(user.get("user_id", 0)), (0, 0))
+            user["attendance_score"] = _attendance_score(attended_count, marked_count)
 
     def _load_seed_data(self) -> None:
-        if not self._data_path.exists():
+        data = self._journal.load_snapshot() if self._journal else None
+        if data is None and self._data_path.exists():
+            data = json.loads(self._data_path.read_text(encoding="utf-8"))
+        if data is not None:
+            self.store = _tables_from_data(data)
+        if self._journal:
+            self._replay_journal()
+        elif data is None:
             return
 
-        data = json.loads(self._data_path.read_text(encoding="utf-8"))
-        self.store = {
-            "users": list(data.get("users", [])),
-            "roles": list(data.get("roles", [])),
-            "user_roles": list(data.get("user_roles", [])),
-            "pantries": list(data.get("pantries", [])),
-            "pantry_leads": list(data.get("pantry_leads", [])),
-            "shifts": list(data.get("shifts", [])),
-            "shift_roles": list(data.get("shift_roles", [])),
-            "shift_signups": list(data.get("shift_signups", [])),
-        }
-        if self.store["shifts"]:
-            self.next_shift_id = max(s.get("shift_id", 0) for s in self.store["shifts"]) + 1
-        if self.store["shift_roles"]:
-            self.next_shift_role_id = max(sr.get("shift_role_id", 0) for sr in self.store["shift_roles"]) + 1
-        if self.store["shift_signups"]:
-            self.next_signup_id = max(su.get("signup_id", 0) for su in self.store["shift_signups"]) + 1
-        self._recalculate_all_attendance_scores()
+        self._rebuild_indexes()
+        self.rebuild_attendance_counters()
+        self.verify_role_capacities(repair=True)
+
+    def _replay_journal(self) -> None:
+        tables = {table: {_row_key(table, row): row for row in rows} for table, rows in self.store.items()}
+        for record in self._journal.replay():
+            for op, table, payload in record:
+                if op == "put":
+                    row = _make_row(table, payload)
+                    tables[table][_row_key(table, row)] = row
+                else:
+                    tables[table].pop(tuple(payload), None)
+        # Concurrent writers may journal rows out of id order; keep tables in key order.
+        self.store = {table: [rows[key] for key in sorted(rows)] for table, rows in tables.items()}
+
+    def _pending_journal_ops(self) -> dict[tuple[str, tuple[Any, ...]], Any]:
+        ops = getattr(self._journal_local, "ops", None)
+        if ops is None:
+            ops = self._journal_local.ops = {}
+        return ops
+
+    def _journal_put(self, table: str, row: Any) -> None:
+        if self._journal is not None:
+            self._pending_journal_ops()[(table, _row_key(table, row))] = row
+
+    def _journal_delete(self, table: str, row: Any) -> None:
+        if self._journal is not None:
+            self._pending_journal_ops()[(table, _row_key(table, row))] = None
+
+    def _flush_journal(self) -> None:
+        if self._journal is None:
+            return
+        pending = self._pending_journal_ops()
+        if not pending:
+            return
+        ops = [
+            ["put", table, self._copy(row)] if row is not None else ["del", table, list(key)]
+            for (table, key), row in pending.items()
+        ]
+        pending.clear()
+        self._journal.append(ops)
+
+    def _compact_journal_if_due(self) -> None:
+        if self._journal is not None and self._journal.should_compact():
+            self.compact_journal()
+
+    @_writer
+    def compact_journal(self) -> None:
+        if self._journal is None:
+            return
+        self._journal.compact({table: [self._copy(row) for row in rows] for table, rows in self.store.items()})
 
+    @_reader
     def get_user_by_id(self, user_id: int) -> dict[str, Any] | None:
-        return self._copy(next((u for u in self.store["users"] if u.get("user_id") == user_id), None))
+        return self._copy(self._users_by_id.get(user_id))
 
+    @_reader
     def get_user_roles(self, user_id: int) -> list[str]:
-        role_ids = [
-            ur.get("role_id")
-            for ur in self.store["user_roles"]
-            if ur.get("user_id") == user_id
-        ]
         return [
-            r.get("role_name")
-            for r in self.store["roles"]
-            if r.get("role_id") in role_ids
+            self._roles_by_id[role_id].get("role_name")
+            for role_id in sorted(self._role_ids_by_user.get(user_id, {}))
+            if role_id in self._roles_by_id
         ]
 
+    @_reader
+    def get_users_by_ids(self, user_ids: list[int]) -> dict[int, dict[str, Any]]:
+        return {
+            user_id: self._users_by_id[user_id].to_dict()
+            for user_id in user_ids
+            if user_id in self._users_by_id
+        }
+
+    @_reader
+    def get_user_roles_bulk(self, user_ids: list[int]) -> dict[int, list[str]]:
+        return {user_id: self.get_user_roles(user_id) for user_id in user_ids}
+
+    @_reader
     def list_users(self, role_filter: str | None = None) -> list[dict[str, Any]]:
-        users = [dict(u) for u in self.store["users"]]
+        users = [u.to_dict() for u in self.store["users"]]
         if role_filter:
-            users = [u for u in users if role_filter in self.get_user_roles(u.get("user_id"))]
+            roles_by_user = self.get_user_roles_bulk([u.get("user_id") for u in users])
+            users = [u for u in users if role_filter in roles_by_user.get(u.get("user_id"), [])]
         return users
 
+    @_reader
     def list_roles(self) -> list[dict[str, Any]]:
         return [dict(r) for r in self.store["roles"]]
 
+    @_writer
     def create_user(
         self,
         full_name: str,
@@ -161,45 +572,57 @@ class MemoryBackend(StoreBackend):
         is_active: bool,
         roles: list[str],
     ) -> dict[str, Any]:
-        if any(u.get("email") == email for u in self.store["users"]):
+        if email in self._user_ids_by_email:
             raise ValueError("Email already exists")
 
-        user_id = max((u.get("user_id", 0) for u in self.store["users"]), default=0) + 1
+        user_id = self.next_user_id
+        self.next_user_id += 1
         timestamp = _utc_now_iso()
-        new_user = {
-            "user_id": user_id,
-            "full_name": full_name,
-            "email": email,
-            "password_hash": password_hash,
-            "is_active": is_active,
-            "attendance_score": 100,
-            "created_at": timestamp,
-            "updated_at": timestamp,
-        }
+        new_user = UserRecord(
+            user_id=user_id,
+            full_name=full_name,
+            email=email,
+            password_hash=password_hash,
+            is_active=is_active,
+            attendance_score=100,
+            created_at=timestamp,
+            updated_at=timestamp,
+        )
         self.store["users"].append(new_user)
+        self._users_by_id[user_id] = new_user
+        self._journal_put("users", new_user)
+        self._user_ids_by_email[email] = user_id
 
         assigned_roles: list[str] = []
         for role_name in roles:
-            role = next((r for r in self.store["roles"] if r.get("role_name") == role_name), None)
+            role = self._roles_by_name.get(role_name)
             if not role:
                 continue
-            self.store["user_roles"].append({
+            user_role = {
                 "user_id": user_id,
                 "role_id": role.get("role_id"),
-            })
+            }
+            self.store["user_roles"].append(user_role)
+            self._journal_put("user_roles", user_role)
+            _index_add(self._role_ids_by_user, user_id, int(role.get("role_id")), None)
             assigned_roles.append(role_name)
 
-        response = dict(new_user)
+        response = new_user.to_dict()
         response["roles"] = assigned_roles
         return response
 
+    @_reader
     def list_pantries(self) -> list[dict[str, Any]]:
         return [dict(p) for p in self.store["pantries"]]
 
+    @_reader
     def get_pantry_by_id(self, pantry_id: int) -> dict[str, Any] | None:
-        return self._copy(next((p for p in self.store["pantries"] if p.get("pantry_id") == pantry_id), None))
+        return self._copy(self._pantries_by_id.get(pantry_id))
 
+    @_reader
     def get_pantry_by_slug(self, slug: str) -> dict[str, Any] | None:
+        if slug.isdigit() and int(slug) in self._pantries_by_id:
+            return self._copy(self._pantries_by_id[int(slug)])
         pantry = next(
             (
                 p
@@ -211,18 +634,23 @@ class MemoryBackend(StoreBackend):
         )
         return self._copy(pantry)
 
+    @_reader
     def get_pantry_leads(self, pantry_id: int) -> list[dict[str, Any]]:
-        lead_ids = [pl.get("user_id") for pl in self.store["pantry_leads"] if pl.get("pantry_id") == pantry_id]
-        return [dict(u) for u in self.store["users"] if u.get("user_id") in lead_ids]
+        lead_ids = sorted(self._lead_user_ids_by_pantry.get(pantry_id, {}))
+        return [self._users_by_id[user_id].to_dict() for user_id in lead_ids if user_id in self._users_by_id]
 
+    @_reader
     def is_pantry_lead(self, pantry_id: int, user_id: int) -> bool:
-        return any(
-            pl.get("pantry_id") == pantry_id and pl.get("user_id") == user_id
-            for pl in self.store["pantry_leads"]
-        )
+        return user_id in self._lead_user_ids_by_pantry.get(pantry_id, {})
 
+    @_reader
+    def list_lead_pantry_ids(self, user_id: int) -> list[int]:
+        return sorted(self._lead_pantry_ids_by_user.get(user_id, {}))
+
+    @_writer
     def create_pantry(self, name: str, location_address: str, lead_ids: list[int]) -> dict[str, Any]:
-        pantry_id = max((p.get("pantry_id", 0) for p in self.store["pantries"]), default=0) + 1
+        pantry_id = self.next_pantry_id
+        self.next_pantry_id += 1
         timestamp = _utc_now_iso()
         pantry = {
             "pantry_id": pantry_id,
@@ -232,6 +660,8 @@ class MemoryBackend(StoreBackend):
             "updated_at": timestamp,
         }
         self.store["pantries"].append(pantry)
+        self._pantries_by_id[pantry_id] = pantry
+        self._journal_put("pantries", pantry)
 
         for lead_id in lead_ids:
             if not self.get_user_by_id(lead_id):
@@ -240,45 +670,124 @@ class MemoryBackend(StoreBackend):
                 continue
             if self.is_pantry_lead(pantry_id, lead_id):
                 continue
-            self.store["pantry_leads"].append({"pantry_id": pantry_id, "user_id": lead_id})
+            pantry_lead = {"pantry_id": pantry_id, "user_id": lead_id}
+            self.store["pantry_leads"].append(pantry_lead)
+            self._index_pantry_lead(pantry_id, lead_id)
+            self._journal_put("pantry_leads", pantry_lead)
+        if lead_ids:
+            self._notify_lead_change()
 
         response = dict(pantry)
         response["leads"] = self.get_pantry_leads(pantry_id)
         return response
 
+    @_writer
     def add_pantry_lead(self, pantry_id: int, user_id: int) -> None:
         if self.is_pantry_lead(pantry_id, user_id):
             raise ValueError("User already a lead for this pantry")
-        self.store["pantry_leads"].append({"pantry_id": pantry_id, "user_id": user_id})
+        pantry_lead = {"pantry_id": pantry_id, "user_id": user_id}
+        self.store["pantry_leads"].append(pantry_lead)
+        self._index_pantry_lead(pantry_id, user_id)
+        self._journal_put("pantry_leads", pantry_lead)
+        self._notify_lead_change()
 
+    @_writer
     def remove_pantry_lead(self, pantry_id: int, user_id: int) -> None:
+        if not self.is_pantry_lead(pantry_id, user_id):
+            return
+        _index_discard(self._lead_user_ids_by_pantry, pantry_id, user_id)
+        _index_discard(self._lead_pantry_ids_by_user, user_id, pantry_id)
+        self._journal_delete("pantry_leads", {"pantry_id": pantry_id, "user_id": user_id})
         self.store["pantry_leads"] = [
             pl
             for pl in self.store["pantry_leads"]
             if not (pl.get("pantry_id") == pantry_id and pl.get("user_id") == user_id)
         ]
+        self._notify_lead_change()
 
+    @_reader
     def list_shifts_by_pantry(self, pantry_id: int, include_cancelled: bool = True) -> list[dict[str, Any]]:
-        shifts = [dict(s) for s in self.store["shifts"] if s.get("pantry_id") == pantry_id]
-        if not include_cancelled:
-            shifts = [s for s in shifts if str(s.get("status", "")).upper() != "CANCELLED"]
-        return shifts
+        return [
+            s.to_dict()
+            for s in self._shifts_by_pantry.get(pantry_id, {}).values()
+            if include_cancelled or s.get("status") != STATUS_CANCELLED
+        ]
 
+    @_reader
     def list_non_expired_shifts_by_pantry(
         self,
         pantry_id: int,
         include_cancelled: bool = True,
     ) -> list[dict[str, Any]]:
-        shifts = [dict(s) for s in self.store["shifts"] if s.get("pantry_id") == pantry_id]
         now_utc = datetime.now(timezone.utc)
-        shifts = [s for s in shifts if (end_time := _parse_iso_to_utc(s.get("end_time"))) and end_time >= now_utc]
-        if not include_cancelled:
-            shifts = [s for s in shifts if str(s.get("status", "")).upper() != "CANCELLED"]
+        return [
+            s.to_dict()
+            for s in self._shifts_by_pantry.get(pantry_id, {}).values()
+            if (include_cancelled or s.get("status") != STATUS_CANCELLED)
+            and (end_time := _parse_iso_to_utc(s.get("end_time")))
+            and end_time >= now_utc
+        ]
+
+    @_reader
+    def list_shift_tree_by_pantry(
+        self,
+        pantry_id: int,
+        include_cancelled: bool = True,
+        non_expired_only: bool = False,
+    ) -> list[dict[str, Any]]:
+        if non_expired_only:
+            shifts = self.list_non_expired_shifts_by_pantry(pantry_id, include_cancelled=include_cancelled)
+        else:
+            shifts = self.list_shifts_by_pantry(pantry_id, include_cancelled=include_cancelled)
+        for shift in shifts:
+            shift["roles"] = [
+                role.to_dict()
+                for role in self._roles_by_shift.get(int(shift.get("shift_id")), {}).values()
+                if include_cancelled or role.get("status") != STATUS_CANCELLED
+            ]
+        return shifts
+
+    @_reader
+    def list_calendar_shifts(
+        self,
+        pantry_ids: list[int] | None = None,
+        window_start: str | None = None,
+        window_end: str | None = None,
+    ) -> list[dict[str, Any]]:
+        earliest_end = datetime.now(timezone.utc)
+        start = _parse_iso_to_utc(window_start) if window_start else None
+        if start is not None and start > earliest_end:
+            earliest_end = start
+        end = _parse_iso_to_utc(window_end) if window_end else None
+        selected = sorted(self._shifts_by_pantry) if pantry_ids is None else sorted(set(map(int, pantry_ids)))
+
+        shifts: list[dict[str, Any]] = []
+        for pantry_id in selected:
+            matching = [
+                (start_time, shift)
+                for shift in self._shifts_by_pantry.get(pantry_id, {}).values()
+                if shift.get("status") != STATUS_CANCELLED
+                and (end_time := _parse_iso_to_utc(shift.get("end_time")))
+                and end_time >= earliest_end
+                and (start_time := _parse_iso_to_utc(shift.get("start_time")))
+                and (end is None or start_time < end)
+            ]
+            matching.sort(key=lambda item: (item[0], int(item[1].get("shift_id"))))
+            for _, shift in matching:
+                row = shift.to_dict()
+                row["roles"] = [
+                    role.to_dict()
+                    for role in self._roles_by_shift.get(int(shift.get("shift_id")), {}).values()
+                    if role.get("status") != STATUS_CANCELLED
+                ]
+                shifts.append(row)
         return shifts
 
+    @_reader
     def get_shift_by_id(self, shift_id: int) -> dict[str, Any] | None:
-        return self._copy(next((s for s in self.store["shifts"] if s.get("shift_id") == shift_id), None))
+        return self._copy(self._shifts_by_id.get(shift_id))
 
+    @_writer
     def create_shift(
         self,
         pantry_id: int,
@@ -287,112 +796,326 @@ class MemoryBackend(StoreBackend):
         end_time: str,
         status: str,
         created_by: int,
+        roles: list[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         timestamp = _utc_now_iso()
-        shift = {
-            "shift_id": self.next_shift_id,
-            "pantry_id": pantry_id,
-            "shift_name": shift_name,
-            "start_time": start_time,
-            "end_time": end_time,
-            "status": status,
-            "created_by": created_by,
-            "created_at": timestamp,
-            "updated_at": timestamp,
-        }
+        shift = ShiftRecord(
+            shift_id=self.next_shift_id,
+            pantry_id=pantry_id,
+            shift_name=shift_name,
+            start_time=start_time,
+            end_time=end_time,
+            status=status,
+            created_by=created_by,
+            created_at=timestamp,
+            updated_at=timestamp,
+            template_id=None,
+        )
         self.next_shift_id += 1
         self.store["shifts"].append(shift)
-        return dict(shift)
+        self._shifts_by_id[shift["shift_id"]] = shift
+        _index_add(self._shifts_by_pantry, int(pantry_id), shift["shift_id"], shift)
+        self._journal_put("shifts", shift)
+        created = shift.to_dict()
+        created["roles"] = [
+            self._add_shift_role(shift["shift_id"], role["role_title"], int(role["required_count"])).to_dict()
+            for role in roles or []
+        ]
+        return created
 
+    @_writer
     def update_shift(self, shift_id: int, payload: dict[str, Any]) -> dict[str, Any] | None:
-        shift = next((s for s in self.store["shifts"] if s.get("shift_id") == shift_id), None)
+        shift = self._shifts_by_id.get(shift_id)
         if not shift:
             return None
         for key in ["shift_name", "start_time", "end_time", "status"]:
             if key in payload:
                 shift[key] = payload[key]
         shift["updated_at"] = _utc_now_iso()
-        return dict(shift)
-
+        if "start_time" in payload:
+            for shift_role_id in self._shift_role_ids(shift_id):
+                for signup in self._role_signups(shift_role_id):
+                    if signup.get("signup_status") == SIGNUP_PENDING_CONFIRMATION:
+                        self._track_pending_deadline(signup)
+        self._journal_put("shifts", shift)
+        return shift.to_dict()
+
+    @_writer
     def delete_shift(self, shift_id: int) -> None:
-        shift_role_ids = [sr.get("shift_role_id") for sr in self.store["shift_roles"] if sr.get("shift_id") == shift_id]
-        self.store["shift_signups"] = [
-            ss for ss in self.store["shift_signups"] if ss.get("shift_role_id") not in shift_role_ids
-        ]
+        shift = self._shifts_by_id.pop(shift_id, None)
+        if not shift:
+            return
+
+        shift_role_ids = set(self._shift_role_ids(shift_id))
+        for shift_role_id in shift_role_ids:
+            for signup in self._role_signups(shift_role_id):
+                self._unindex_signup(signup)
+                self._remove_stored_signup(signup)
+                self._transition_signup(signup, None, None)
+                self._journal_delete("shift_signups", signup)
+            self._journal_delete("shift_roles", self._shift_roles_by_id.pop(shift_role_id))
+        self._roles_by_shift.pop(shift_id, None)
+        self._journal_delete("shifts", shift)
+        _index_discard(self._shifts_by_pantry, int(shift.get("pantry_id")), shift_id)
+
         self.store["shift_roles"] = [sr for sr in self.store["shift_roles"] if sr.get("shift_id") != shift_id]
         self.store["shifts"] = [s for s in self.store["shifts"] if s.get("shift_id") != shift_id]
 
+    def _template_with_roles(self, template: dict[str, Any]) -> dict[str, Any]:
+        row = dict(template)
+        row["roles"] = [
+            dict(role) for role in self._template_roles_by_template.get(int(template.get("template_id")), {}).values()
+        ]
+        return row
+
+    @_reader
+    def list_shift_templates(self, pantry_id: int) -> list[dict[str, Any]]:
+        return [self._template_with_roles(t) for t in self._templates_by_pantry.get(pantry_id, {}).values()]
+
+    @_reader
+    def get_shift_template_by_id(self, template_id: int) -> dict[str, Any] | None:
+        template = self._templates_by_id.get(template_id)
+        return self._template_with_roles(template) if template else None
+
+    @_writer
+    def create_shift_template(
+        self,
+        pantry_id: int,
+        template_name: str,
+        weekday: int,
+        start_time: str,
+        end_time: str,
+        created_by: int,
+        roles: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        timestamp = _utc_now_iso()
+        template_id = self.next_template_id
+        self.next_template_id += 1
+        template = {
+            "template_id": template_id,
+            "pantry_id": pantry_id,
+            "template_name": template_name,
+            "weekday": int(weekday),
+            "start_time": format_clock(start_time),
+            "end_time": format_clock(end_time),
+            "created_by": created_by,
+            "created_at": timestamp,
+            "updated_at": timestamp,
+        }
+        self.store["shift_templates"].append(template)
+        self._templates_by_id[template_id] = template
+        _index_add(self._templates_by_pantry, int(pantry_id), template_id, template)
+        self._journal_put("shift_templates", template)
+        for role in roles:
+            template_role = {
+                "template_role_id": self.next_template_role_id,
+                "template_id": template_id,
+                "role_title": role["role_title"],
+                "required_count": int(role["required_count"]),
+            }
+            self.next_template_role_id += 1
+            self.store["shift_template_roles"].append(template_role)
+            _index_add(self._template_roles_by_template, template_id, template_role["template_role_id"], template_role)
+            self._journal_put("shift_template_roles", template_role)
+        return self._template_with_roles(template)
+
+    @_writer
+    def delete_shift_template(self, template_id: int) -> None:
+        template = self._templates_by_id.pop(template_id, None)
+        if not template:
+            return
+        _index_discard(self._templates_by_pantry, int(template.get("pantry_id")), template_id)
+        for role in self._template_roles_by_template.pop(template_id, {}).values():
+            self._journal_delete("shift_template_roles", role)
+        self._journal_delete("shift_templates", template)
+        # Generated shifts stay; they just stop pointing at the template.
+        for shift in self._shifts_by_pantry.get(int(template.get("pantry_id")), {}).values():
+            if shift.get("template_id") == template_id:
+                shift["template_id"] = None
+                self._journal_put("shifts", shift)
+
+        self.store["shift_template_roles"] = [
+            r for r in self.store["shift_template_roles"] if r.get("template_id") != template_id
+        ]
+        self.store["shift_templates"] = [t for t in self.store["shift_templates"] if t.get("template_id") != template_id]
+
+    @_writer
+    def generate_template_shifts(
+        self,
+        start_date: str,
+        weeks: int,
+        created_by: int,
+        pantry_id: int | None = None,
+    ) -> dict[str, Any]:
+        first_day = date.fromisoformat(start_date)
+        if pantry_id is None:
+            templates = list(self._templates_by_id.values())
+        else:
+            templates = list(self._templates_by_pantry.get(pantry_id, {}).values())
+
+        timestamp = _utc_now_iso()
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        new_shifts: list[ShiftRecord] = []
+        new_roles: list[ShiftRoleRecord] = []
+        skipped = 0
+        for template in templates:
+            template_id = int(template.get("template_id"))
+            existing_starts = {
+                _parse_iso_to_utc(shift.get("start_time"))
+                for shift in self._shifts_by_pantry.get(int(template.get("pantry_id")), {}).values()
+                if shift.get("template_id") == template_id
+            }
+            template_roles = list(self._template_roles_by_template.get(template_id, {}).values())
+            for start, end in template_occurrences(template, first_day, weeks, not_before=now):
+                if start.replace(tzinfo=timezone.utc) in existing_starts:
+                    skipped += 1
+                    continue
+                shift = ShiftRecord(
+                    shift_id=self.next_shift_id,
+                    pantry_id=int(template.get("pantry_id")),
+                    shift_name=template.get("template_name"),
+                    start_time=start.isoformat() + "Z",
+                    end_time=end.isoformat() + "Z",
+                    status=STATUS_OPEN,
+                    created_by=created_by,
+                    created_at=timestamp,
+                    updated_at=timestamp,
+                    template_id=template_id,
+                )
+                self.next_shift_id += 1
+                new_shifts.append(shift)
+                for template_role in template_roles:
+                    new_roles.append(
+                        ShiftRoleRecord(
+                            shift_role_id=self.next_shift_role_id,
+                            shift_id=shift["shift_id"],
+                            role_title=template_role.get("role_title"),
+                            required_count=int(template_role.get("required_count")),
+                            filled_count=0,
+                            status=STATUS_OPEN,
+                        )
+                    )
+                    self.next_shift_role_id += 1
+
+        self.store["shifts"].extend(new_shifts)
+        for shift in new_shifts:
+            self._shifts_by_id[shift["shift_id"]] = shift
+            _index_add(self._shifts_by_pantry, int(shift.get("pantry_id")), shift["shift_id"], shift)
+            self._journal_put("shifts", shift)
+        self.store["shift_roles"].extend(new_roles)
+        for role in new_roles:
+            self._shift_roles_by_id[role["shift_role_id"]] = role
+            _index_add(self._roles_by_shift, int(role.get("shift_id")), role["shift_role_id"], role)
+            self._journal_put("shift_roles", role)
+        return {
+            "template_count": len(templates),
+            "created_shift_count": len(new_shifts),
+            "created_role_count": len(new_roles),
+            "skipped_shift_count": skipped,
+        }
+
+    @_reader
     def list_shift_roles(self, shift_id: int) -> list[dict[str, Any]]:
-        return [dict(sr) for sr in self.store["shift_roles"] if sr.get("shift_id") == shift_id]
+        return [sr.to_dict() for sr in self._roles_by_shift.get(shift_id, {}).values()]
 
+    @_reader
     def get_shift_role_by_id(self, shift_role_id: int) -> dict[str, Any] | None:
-        return self._copy(next((sr for sr in self.store["shift_roles"] if sr.get("shift_role_id") == shift_role_id), None))
+        return self._copy(self._shift_roles_by_id.get(shift_role_id))
 
+    @_writer
     def create_shift_role(self, shift_id: int, role_title: str, required_count: int) -> dict[str, Any]:
-        role = {
-            "shift_role_id": self.next_shift_role_id,
-            "shift_id": shift_id,
-            "role_title": role_title,
-            "required_count": required_count,
-            "filled_count": 0,
-            "status": "OPEN",
-        }
+        return self._add_shift_role(shift_id, role_title, required_count).to_dict()
+
+    def _add_shift_role(self, shift_id: int, role_title: str, required_count: int) -> ShiftRoleRecord:
+        role = ShiftRoleRecord(
+            shift_role_id=self.next_shift_role_id,
+            shift_id=shift_id,
+            role_title=role_title,
+            required_count=required_count,
+            filled_count=0,
+            status=STATUS_OPEN,
+        )
         self.next_shift_role_id += 1
         self.store["shift_roles"].append(role)
-        return dict(role)
+        self._shift_roles_by_id[role["shift_role_id"]] = role
+        _index_add(self._roles_by_shift, int(shift_id), role["shift_role_id"], role)
+        self._journal_put("shift_roles", role)
+        return role
 
+    @_writer
     def update_shift_role(self, shift_role_id: int, payload: dict[str, Any]) -> dict[str, Any] | None:
-        role = next((sr for sr in self.store["shift_roles"] if sr.get("shift_role_id") == shift_role_id), None)
+        role = self._shift_roles_by_id.get(shift_role_id)
         if not role:
             return None
         for key in ["role_title", "required_count", "status", "filled_count"]:
             if key in payload:
                 role[key] = payload[key]
-        if "required_count" in payload or "status" in payload:
-            self._recalculate_role_capacity(shift_role_id)
-        return dict(role)
+        if "required_count" in payload or "status" in payload or "filled_count" in payload:
+            self._refresh_role_status(role)
+        self._journal_put("shift_roles", role)
+        return role.to_dict()
 
+    @_writer
     def delete_shift_role(self, shift_role_id: int) -> None:
-        self.store["shift_signups"] = [ss for ss in self.store["shift_signups"] if ss.get("shift_role_id") != shift_role_id]
+        role = self._shift_roles_by_id.pop(shift_role_id, None)
+        if not role:
+            return
+
+        removed_signups = self._role_signups(shift_role_id)
+        for signup in removed_signups:
+            self._unindex_signup(signup)
+            self._remove_stored_signup(signup)
+            self._transition_signup(signup, None, None)
+            self._journal_delete("shift_signups", signup)
+        _index_discard(self._roles_by_shift, int(role.get("shift_id")), shift_role_id)
+        self._journal_delete("shift_roles", role)
+
         self.store["shift_roles"] = [sr for sr in self.store["shift_roles"] if sr.get("shift_role_id") != shift_role_id]
 
+    @_reader
     def list_shift_signups(self, shift_role_id: int) -> list[dict[str, Any]]:
-        return [dict(ss) for ss in self.store["shift_signups"] if ss.get("shift_role_id") == shift_role_id]
+        return [ss.to_dict() for ss in self._role_signups(shift_role_id)]
 
+    @_reader
+    def list_signups_for_roles(self, shift_role_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        return {shift_role_id: self.list_shift_signups(shift_role_id) for shift_role_id in shift_role_ids}
+
+    @_reader
     def list_signups_by_user(self, user_id: int) -> list[dict[str, Any]]:
-        signups = [dict(ss) for ss in self.store["shift_signups"] if ss.get("user_id") == user_id]
+        with self._shared_lock:
+            signups = list(self._signups_by_user.get(user_id, {}).values())
         rows: list[dict[str, Any]] = []
 
         for signup in signups:
             shift_role_id = int(signup.get("shift_role_id"))
-            role = next((sr for sr in self.store["shift_roles"] if sr.get("shift_role_id") == shift_role_id), None)
+            role = self._shift_roles_by_id.get(shift_role_id)
             if not role:
                 continue
 
             shift_id = int(role.get("shift_id"))
-            shift = next((s for s in self.store["shifts"] if s.get("shift_id") == shift_id), None)
+            shift = self._shifts_by_id.get(shift_id)
             if not shift:
                 continue
 
             pantry_id = int(shift.get("pantry_id"))
-            pantry = next((p for p in self.store["pantries"] if p.get("pantry_id") == pantry_id), None)
+            pantry = self._pantries_by_id.get(pantry_id)
 
             rows.append({
                 "signup_id": int(signup.get("signup_id")),
                 "user_id": int(signup.get("user_id")),
-                "signup_status": signup.get("signup_status"),
+                "signup_status": SIGNUP_STATUSES.name(signup.get("signup_status")),
                 "reservation_expires_at": signup.get("reservation_expires_at"),
                 "created_at": signup.get("created_at"),
                 "shift_role_id": int(role.get("shift_role_id")),
                 "role_title": role.get("role_title"),
                 "required_count": int(role.get("required_count", 0)),
                 "filled_count": int(role.get("filled_count", 0)),
-                "role_status": role.get("status"),
+                "role_status": RECORD_STATUSES.name(role.get("status")),
                 "shift_id": int(shift.get("shift_id")),
                 "shift_name": shift.get("shift_name"),
                 "start_time": shift.get("start_time"),
                 "end_time": shift.get("end_time"),
-                "shift_status": shift.get("status"),
+                "shift_status": RECORD_STATUSES.name(shift.get("status")),
                 "pantry_id": int(shift.get("pantry_id")),
                 "pantry_name": pantry.get("name") if pantry else None,
                 "pantry_location": pantry.get("location_address") if pantry else None,
@@ -401,91 +1124,84 @@ class MemoryBackend(StoreBackend):
         rows.sort(key=lambda row: str(row.get("start_time", "")))
         return rows
 
+    @_reader
     def get_signup_by_id(self, signup_id: int) -> dict[str, Any] | None:
-        return self._copy(next((ss for ss in self.store["shift_signups"] if ss.get("signup_id") == signup_id), None))
+        return self._copy(self._signups_by_id.get(signup_id))
 
+    @_signup_writer
     def create_signup(self, shift_role_id: int, user_id: int, signup_status: str) -> dict[str, Any]:
-        shift_role = next((sr for sr in self.store["shift_roles"] if sr.get("shift_role_id") == shift_role_id), None)
+        status_code = SIGNUP_STATUSES.code(signup_status)
+        shift_role = self._shift_roles_by_id.get(shift_role_id)
         if not shift_role:
             raise LookupError("Shift role not found")
-        if str(shift_role.get("status", "OPEN")).upper() == "CANCELLED":
+        if shift_role.get("status") == STATUS_CANCELLED:
             raise RuntimeError("This role is unavailable")
 
-        shift = next((s for s in self.store["shifts"] if s.get("shift_id") == int(shift_role.get("shift_id"))), None)
+        shift = self._shifts_by_id.get(int(shift_role.get("shift_id")))
         if not shift:
             raise LookupError("Shift not found")
-        if str(shift.get("status", "OPEN")).upper() == "CANCELLED":
+        if shift.get("status") == STATUS_CANCELLED:
             raise RuntimeError("This shift is cancelled")
 
-        if any(
-            ss.get("shift_role_id") == shift_role_id and ss.get("user_id") == user_id
-            for ss in self.store["shift_signups"]
-        ):
-            raise ValueError("Already signed up")
-
-        self._recalculate_role_capacity(shift_role_id)
-        now_utc = datetime.now(timezone.utc)
-        occupied_count = 0
-        for signup in self.store["shift_signups"]:
-            if signup.get("shift_role_id") != shift_role_id:
-                continue
-            status = str(signup.get("signup_status", "")).upper()
-            reservation_expires_at = _parse_iso_to_utc(signup.get("reservation_expires_at"))
-            if status in ACTIVE_SIGNUP_STATUSES or (
-                status == PENDING_SIGNUP_STATUS
-                and reservation_expires_at is not None
-                and reservation_expires_at > now_utc
-            ):
-                occupied_count += 1
-
-        if occupied_count >= int(shift_role.get("required_count", 0)):
-            raise RuntimeError("This role is full")
-
-        signup = {
-            "signup_id": self.next_signup_id,
-            "shift_role_id": shift_role_id,
-            "user_id": user_id,
-            "signup_status": signup_status,
-            "reservation_expires_at": (
-                (datetime.now(timezone.utc) + timedelta(hours=RESERVATION_WINDOW_HOURS)).replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
-                if str(signup_status).upper() == PENDING_SIGNUP_STATUS
-                else None
-            ),
-            "created_at": _utc_now_iso(),
-        }
-        self.next_signup_id += 1
-        self.store["shift_signups"].append(signup)
-        self._recalculate_role_capacity(shift_role_id)
-        self._recalculate_user_attendance_score(user_id)
-
-        return dict(signup)
+        with self._role_guard([shift_role_id]):
+            if any(ss.get("user_id") == user_id for ss in self._role_signups(shift_role_id)):
+                raise ValueError("Already signed up")
+
+            self._expire_role_reservations(shift_role_id, datetime.now(timezone.utc))
+            if int(shift_role.get("filled_count", 0)) >= int(shift_role.get("required_count", 0)):
+                raise RuntimeError("This role is full")
+
+            with self._shared_lock:
+                signup = SignupRecord(
+                    signup_id=self.next_signup_id,
+                    shift_role_id=shift_role_id,
+                    user_id=user_id,
+                    signup_status=None,
+                    reservation_expires_at=None,
+                    created_at=_utc_now_iso(),
+                )
+                self.next_signup_id += 1
+                self._store_signup(signup)
+                self._signups_by_id[signup["signup_id"]] = signup
+                self._index_signup(signup)
+            self._transition_signup(
+                signup,
+                status_code,
+                _pending_reservation_value() if status_code == SIGNUP_PENDING_CONFIRMATION else None,
+            )
+            return signup.to_dict()
 
+    @_signup_writer
     def delete_signup(self, signup_id: int) -> None:
-        signup = next((ss for ss in self.store["shift_signups"] if ss.get("signup_id") == signup_id), None)
+        signup = self._signups_by_id.get(signup_id)
         if not signup:
             return
-
-        shift_role_id = signup.get("shift_role_id")
-        user_id = int(signup.get("user_id"))
-        self.store["shift_signups"] = [ss for ss in self.store["shift_signups"] if ss.get("signup_id") != signup_id]
-        self._recalculate_role_capacity(int(shift_role_id))
-        self._recalculate_user_attendance_score(user_id)
-
+        with self._role_guard([int(signup.get("shift_role_id"))]):
+            if self._signups_by_id.get(signup_id) is not signup:
+                return
+            with self._shared_lock:
+                self._unindex_signup(signup)
+                self._remove_stored_signup(signup)
+            self._transition_signup(signup, None, None)
+            self._journal_delete("shift_signups", signup)
+
+    @_signup_writer
     def update_signup(self, signup_id: int, signup_status: str) -> dict[str, Any] | None:
-        signup = next((ss for ss in self.store["shift_signups"] if ss.get("signup_id") == signup_id), None)
+        status_code = SIGNUP_STATUSES.code(signup_status)
+        signup = self._signups_by_id.get(signup_id)
         if not signup:
             return None
-        user_id = int(signup.get("user_id"))
-        signup["signup_status"] = signup_status
-        signup["reservation_expires_at"] = (
-            (datetime.now(timezone.utc) + timedelta(hours=RESERVATION_WINDOW_HOURS)).replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
-            if str(signup_status).upper() == PENDING_SIGNUP_STATUS
-            else None
-        )
-        self._recalculate_role_capacity(int(signup.get("shift_role_id")))
-        self._recalculate_user_attendance_score(user_id)
-        return dict(signup)
+        with self._role_guard([int(signup.get("shift_role_id"))]):
+            if self._signups_by_id.get(signup_id) is not signup:
+                return None
+            self._transition_signup(
+                signup,
+                status_code,
+                _pending_reservation_value() if status_code == SIGNUP_PENDING_CONFIRMATION else None,
+            )
+            return signup.to_dict()
 
+    @_signup_writer
     def bulk_mark_shift_signups_pending(self, shift_id: int, reservation_expires_at: str) -> list[dict[str, Any]]:
         reservation_iso = _parse_iso_to_utc(reservation_expires_at)
         if not reservation_iso:
@@ -493,114 +1209,149 @@ class MemoryBackend(StoreBackend):
         else:
             reservation_value = reservation_iso.replace(tzinfo=timezone.utc).isoformat().replace("+00:00", "Z")
 
-        shift_role_ids = [int(role.get("shift_role_id")) for role in self.store["shift_roles"] if int(role.get("shift_id")) == shift_id]
+        shift_role_ids = self._shift_role_ids(shift_id)
         affected: list[dict[str, Any]] = []
 
-        for signup in self.store["shift_signups"]:
-            if int(signup.get("shift_role_id")) not in shift_role_ids:
+        with self._role_guard(shift_role_ids):
+            for signup in (ss for role_id in shift_role_ids for ss in self._role_signups(role_id)):
+                if signup.get("signup_status") in RELEASED_SIGNUP_CODES:
+                    continue
+                self._transition_signup(signup, SIGNUP_PENDING_CONFIRMATION, reservation_value)
+                affected.append(
+                    {
+                        "signup_id": int(signup.get("signup_id")),
+                        "user_id": int(signup.get("user_id")),
+                    }
+                )
+        return affected
+
+    @_reader
+    def list_pending_expiry_deadlines(self) -> list[dict[str, Any]]:
+        deadlines: dict[int, datetime] = {}
+        with self._shared_lock:
+            entries = list(self._pending_deadlines)
+            signups = {signup_id: self._signups_by_id.get(signup_id) for _, signup_id in entries}
+        for tracked_deadline, signup_id in entries:
+            signup = signups[signup_id]
+            if signup is None or signup.get("signup_status") != SIGNUP_PENDING_CONFIRMATION:
                 continue
-            current_status = str(signup.get("signup_status", "")).upper()
-            if current_status in {"CANCELLED", "WAITLISTED"}:
+            # Entries are not removed when a signup or its shift changes; a stale one no
+            # longer matches the signup's deadline, which was tracked again when it changed.
+            deadline = self._signup_deadline(signup)
+            if deadline is None or deadline != tracked_deadline:
                 continue
-            signup["signup_status"] = PENDING_SIGNUP_STATUS
-            signup["reservation_expires_at"] = reservation_value
-            affected.append(
-                {
-                    "signup_id": int(signup.get("signup_id")),
-                    "user_id": int(signup.get("user_id")),
-                }
-            )
-
-        for role_id in shift_role_ids:
-            self._recalculate_role_capacity(role_id)
-        return affected
+            shift_id = int(self._shift_roles_by_id[int(signup.get("shift_role_id"))].get("shift_id"))
+            if shift_id not in deadlines or deadline < deadlines[shift_id]:
+                deadlines[shift_id] = deadline
+        return [
+            {"shift_id": shift_id, "deadline": deadline.isoformat().replace("+00:00", "Z")}
+            for shift_id, deadline in sorted(deadlines.items(), key=lambda item: item[1])
+        ]
 
+    @_signup_writer
+    def expire_overdue_pending_signups(self, now_utc: str, batch_size: int = 500) -> dict[str, Any]:
+        now_dt = _parse_iso_to_utc(now_utc) or datetime.now(timezone.utc)
+        expired_count = 0
+        shift_role_ids: set[int] = set()
+        while True:
+            due: dict[int, list[SignupRecord]] = {}
+            due_count = 0
+            with self._shared_lock:
+                while self._pending_deadlines and self._pending_deadlines[0][0] <= now_dt and due_count < batch_size:
+                    _, signup_id = heapq.heappop(self._pending_deadlines)
+                    signup = self._signups_by_id.get(signup_id)
+                    if signup is not None:
+                        due.setdefault(int(signup.get("shift_role_id")), []).append(signup)
+                        due_count += 1
+            if not due:
+                break
+
+            with self._role_guard(due):
+                for shift_role_id, signups in due.items():
+                    for signup in signups:
+                        # Entries are not removed when a signup changes; re-check before expiring.
+                        if self._signups_by_id.get(int(signup.get("signup_id"))) is not signup:
+                            continue
+                        if signup.get("signup_status") != SIGNUP_PENDING_CONFIRMATION:
+                            continue
+                        deadline = self._signup_deadline(signup)
+                        if deadline is None or deadline > now_dt:
+                            continue
+                        self._transition_signup(signup, SIGNUP_CANCELLED, None)
+                        expired_count += 1
+                        shift_role_ids.add(shift_role_id)
+        return {"expired_count": expired_count, "shift_role_ids": sorted(shift_role_ids)}
+
+    @_signup_writer
     def expire_pending_signups(self, shift_id: int, now_utc: str) -> int:
         now_dt = _parse_iso_to_utc(now_utc) or datetime.now(timezone.utc)
-        shift_role_ids = [int(role.get("shift_role_id")) for role in self.store["shift_roles"] if int(role.get("shift_id")) == shift_id]
-        shift = self.get_shift_by_id(shift_id)
+        shift_role_ids = self._shift_role_ids(shift_id)
+        shift = self._shifts_by_id.get(shift_id)
         shift_start = _parse_iso_to_utc(shift.get("start_time")) if shift else None
 
         expired_count = 0
-        for signup in self.store["shift_signups"]:
-            if int(signup.get("shift_role_id")) not in shift_role_ids:
-                continue
-            if str(signup.get("signup_status", "")).upper() != PENDING_SIGNUP_STATUS:
-                continue
-            reservation_expires_at = _parse_iso_to_utc(signup.get("reservation_expires_at"))
-            should_expire = (
-                (shift_start is not None and shift_start <= now_dt)
-                or (reservation_expires_at is not None and reservation_expires_at <= now_dt)
-            )
-            if not should_expire:
-                continue
-            signup["signup_status"] = "CANCELLED"
-            signup["reservation_expires_at"] = None
-            expired_count += 1
-
-        if expired_count:
-            for role_id in shift_role_ids:
-                self._recalculate_role_capacity(role_id)
+        with self._role_guard(shift_role_ids):
+            for signup in (ss for role_id in shift_role_ids for ss in self._role_signups(role_id)):
+                if signup.get("signup_status") != SIGNUP_PENDING_CONFIRMATION:
+                    continue
+                reservation_expires_at = _parse_iso_to_utc(signup.get("reservation_expires_at"))
+                should_expire = (
+                    (shift_start is not None and shift_start <= now_dt)
+                    or (reservation_expires_at is not None and reservation_expires_at <= now_dt)
+                )
+                if not should_expire:
+                    continue
+                self._transition_signup(signup, SIGNUP_CANCELLED, None)
+                expired_count += 1
         return expired_count
 
+    @_signup_writer
     def reconfirm_pending_signup(self, signup_id: int, now_utc: str) -> dict[str, Any]:
         now_dt = _parse_iso_to_utc(now_utc) or datetime.now(timezone.utc)
-        signup = next((ss for ss in self.store["shift_signups"] if ss.get("signup_id") == signup_id), None)
+        signup = self._signups_by_id.get(signup_id)
         if not signup:
             return {"result": "NOT_FOUND", "signup": None}
 
-        if str(signup.get("signup_status", "")).upper() != PENDING_SIGNUP_STATUS:
-            return {"result": "NOT_PENDING", "signup": dict(signup)}
-
         shift_role_id = int(signup.get("shift_role_id"))
-        shift_role = next((sr for sr in self.store["shift_roles"] if int(sr.get("shift_role_id")) == shift_role_id), None)
-        if not shift_role:
-            return {"result": "NOT_FOUND", "signup": None}
+        with self._role_guard([shift_role_id]):
+            if self._signups_by_id.get(signup_id) is not signup:
+                return {"result": "NOT_FOUND", "signup": None}
 
-        shift = next((s for s in self.store["shifts"] if int(s.get("shift_id")) == int(shift_role.get("shift_id"))), None)
-        if not shift:
-            return {"result": "NOT_FOUND", "signup": None}
+            if signup.get("signup_status") != SIGNUP_PENDING_CONFIRMATION:
+                return {"result": "NOT_PENDING", "signup": signup.to_dict()}
 
-        shift_start = _parse_iso_to_utc(shift.get("start_time"))
-        reservation_expires_at = _parse_iso_to_utc(signup.get("reservation_expires_at"))
-        if (shift_start and shift_start <= now_dt) or (
-            reservation_expires_at is not None and reservation_expires_at <= now_dt
-        ):
-            signup["signup_status"] = "CANCELLED"
-            signup["reservation_expires_at"] = None
-            self._recalculate_role_capacity(shift_role_id)
-            self._recalculate_user_attendance_score(int(signup.get("user_id")))
-            return {"result": "EXPIRED", "signup": dict(signup)}
-
-        if (
-            str(shift.get("status", "OPEN")).upper() == "CANCELLED"
-            or str(shift_role.get("status", "OPEN")).upper() == "CANCELLED"
-        ):
-            signup["signup_status"] = "WAITLISTED"
-            signup["reservation_expires_at"] = None
-            self._recalculate_role_capacity(shift_role_id)
-            self._recalculate_user_attendance_score(int(signup.get("user_id")))
-            return {"result": "WAITLISTED", "signup": dict(signup)}
-
-        confirmed_count = 0
-        for other in self.store["shift_signups"]:
-            if int(other.get("shift_role_id")) != shift_role_id:
-                continue
-            if str(other.get("signup_status", "")).upper() in ACTIVE_SIGNUP_STATUSES:
-                confirmed_count += 1
-
-        if confirmed_count >= int(shift_role.get("required_count", 0)):
-            signup["signup_status"] = "WAITLISTED"
-            signup["reservation_expires_at"] = None
-            self._recalculate_role_capacity(shift_role_id)
-            self._recalculate_user_attendance_score(int(signup.get("user_id")))
-            return {"result": "WAITLISTED", "signup": dict(signup)}
-
-        signup["signup_status"] = "CONFIRMED"
-        signup["reservation_expires_at"] = None
-        self._recalculate_role_capacity(shift_role_id)
-        self._recalculate_user_attendance_score(int(signup.get("user_id")))
-        return {"result": "CONFIRMED", "signup": dict(signup)}
+            shift_role = self._shift_roles_by_id.get(shift_role_id)
+            if not shift_role:
+                return {"result": "NOT_FOUND", "signup": None}
+
+            shift = self._shifts_by_id.get(int(shift_role.get("shift_id")))
+            if not shift:
+                return {"result": "NOT_FOUND", "signup": None}
+
+            shift_start = _parse_iso_to_utc(shift.get("start_time"))
+            reservation_expires_at = _parse_iso_to_utc(signup.get("reservation_expires_at"))
+            if (shift_start and shift_start <= now_dt) or (
+                reservation_expires_at is not None and reservation_expires_at <= now_dt
+            ):
+                self._transition_signup(signup, SIGNUP_CANCELLED, None)
+                return {"result": "EXPIRED", "signup": signup.to_dict()}
+
+            if shift.get("status") == STATUS_CANCELLED or shift_role.get("status") == STATUS_CANCELLED:
+                self._transition_signup(signup, SIGNUP_WAITLISTED, None)
+                return {"result": "WAITLISTED", "signup": signup.to_dict()}
+
+            confirmed_count = 0
+            for other in self._role_signups(shift_role_id):
+                if other.get("signup_status") in ACTIVE_SIGNUP_CODES:
+                    confirmed_count += 1
+
+            if confirmed_count >= int(shift_role.get("required_count", 0)):
+                self._transition_signup(signup, SIGNUP_WAITLISTED, None)
+                return {"result": "WAITLISTED", "signup": signup.to_dict()}
+
+            self._transition_signup(signup, SIGNUP_CONFIRMED, None)
+            return {"result": "CONFIRMED", "signup": signup.to_dict()}
 
+    @_reader
     def is_empty(self) -> bool:
         return not self.store["users"] and not self.store["roles"]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+FSYNC_MODES = {"always", "batch", "interval"}
+
+
+def _fsync_file(handle: Any) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+class MemoryJournal:
+    """Append-only write-ahead journal and snapshot files for MemoryBackend.
+
+    Each line of the journal is one JSON array of ``[op, table, payload]`` entries
+    written by a single mutating backend call. ``fsync_mode`` controls durability:
+    ``always`` syncs every record, ``batch`` syncs once per ``batch_size`` records
+    (group commit) and ``interval`` syncs when ``interval_seconds`` have passed since
+    the last sync. In ``batch`` and ``interval`` mode a timer also syncs records still
+    pending ``interval_seconds`` after the last sync, so the last writes before an
+    idle period are not left unsynced. ``compact()`` folds everything into a fresh
+    snapshot and empties the journal.
+    """
+
+    def __init__(
+        self,
+        journal_path: Path,
+        snapshot_path: Path,
+        fsync_mode: str = "batch",
+        batch_size: int = 32,
+        interval_seconds: float = 1.0,
+        compact_every: int = 1000,
+    ) -> None:
+        fsync_mode = fsync_mode.strip().lower()
+        if fsync_mode not in FSYNC_MODES:
+            raise ValueError(f"Unknown journal fsync mode: {fsync_mode}")
+        self.journal_path = journal_path
+        self.snapshot_path = snapshot_path
+        self.fsync_mode = fsync_mode
+        self.batch_size = max(1, batch_size)
+        self.interval_seconds = max(0.0, interval_seconds)
+        self.compact_every = max(1, compact_every)
+        self._lock = threading.Lock()
+        self._handle: Any = None
+        self._records_since_compaction = 0
+        self._unsynced_records = 0
+        self._last_sync = time.monotonic()
+        self._flush_timer: threading.Timer | None = None
+
+    def load_snapshot(self) -> dict[str, Any] | None:
+        if not self.snapshot_path.exists():
+            return None
+        return json.loads(self.snapshot_path.read_text(encoding="utf-8"))
+
+    def replay(self) -> Iterator[list[list[Any]]]:
+        """Yield journal records in order, dropping a torn record left by a crash."""
+        if not self.journal_path.exists():
+            return
+        valid_offset = 0
+        with self.journal_path.open("rb") as handle:
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_offset += len(line)
+                self._records_since_compaction += 1
+                yield record
+        if valid_offset < self.journal_path.stat().st_size:
+            with self.journal_path.open("r+b") as handle:
+                handle.truncate(valid_offset)
+
+    def append(self, ops: list[list[Any]]) -> None:
+        line = json.dumps(ops, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._handle is None:
+                self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+                self._handle = self.journal_path.open("a", encoding="utf-8")
+            self._handle.write(line)
+            self._records_since_compaction += 1
+            self._unsynced_records += 1
+            if self._sync_due():
+                self._sync()
+            else:
+                self._handle.flush()
+                self._schedule_flush()
+
+    def should_compact(self) -> bool:
+        return self._records_since_compaction >= self.compact_every
+
+    def compact(self, tables: dict[str, list[dict[str, Any]]]) -> None:
+        with self._lock:
+            tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                json.dump(tables, handle, separators=(",", ":"), default=str)
+                _fsync_file(handle)
+            os.replace(tmp_path, self.snapshot_path)
+
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            with self.journal_path.open("w", encoding="utf-8") as handle:
+                _fsync_file(handle)
+            self._records_since_compaction = 0
+            self._unsynced_records = 0
+            self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._handle is None:
+                return
+            self._sync()
+            self._handle.close()
+            self._handle = None
+
+    def _sync_due(self) -> bool:
+        if self.fsync_mode == "always":
+            return True
+        if self.fsync_mode == "batch":
+            return self._unsynced_records >= self.batch_size
+        return time.monotonic() - self._last_sync >= self.interval_seconds
+
+    def _schedule_flush(self) -> None:
+        if self._flush_timer is not None:
+            return
+        delay = max(0.0, self.interval_seconds - (time.monotonic() - self._last_sync))
+        self._flush_timer = threading.Timer(delay, self._flush_pending)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_pending(self) -> None:
+        with self._lock:
+            self._flush_timer = None
+            if self._handle is not None and self._unsynced_records:
+                self._sync()
+
+    def _sync(self) -> None:
+        _fsync_file(self._handle)
+        self._unsynced_records = 0
+        self._last_sync = time.monotonic()
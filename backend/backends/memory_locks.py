@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+
+class ReadWriteLock:
+    """Writer-preferring reader/writer lock, reentrant within a thread.
+
+    A thread holding the write lock may also take the read lock; upgrading from
+    read to write is not supported.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: int | None = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def _read_depth(self) -> int:
+        return getattr(self._local, "read_depth", 0)
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        me = threading.get_ident()
+        if self._writer == me or self._read_depth():
+            self._local.read_depth = self._read_depth() + 1
+            try:
+                yield
+            finally:
+                self._local.read_depth -= 1
+            return
+
+        with self._cond:
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        self._local.read_depth = 1
+        try:
+            yield
+        finally:
+            self._local.read_depth = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        me = threading.get_ident()
+        if self._writer == me:
+            self._writer_depth += 1
+            try:
+                yield
+            finally:
+                self._writer_depth -= 1
+            return
+        if self._read_depth():
+            raise RuntimeError("Cannot upgrade a read lock to a write lock")
+
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = None
+                self._writer_depth = 0
+                self._cond.notify_all()
+
+
+class LockStripes:
+    """Fixed pool of locks; a key always maps to the same stripe."""
+
+    def __init__(self, count: int = 64) -> None:
+        self._locks = [threading.RLock() for _ in range(count)]
+
+    @contextmanager
+    def hold(self, keys: Iterable[int]) -> Iterator[None]:
+        # Acquire in stripe order so multi-key holders cannot deadlock each other.
+        stripes = sorted({hash(key) % len(self._locks) for key in keys})
+        for index in stripes:
+            self._locks[index].acquire()
+        try:
+            yield
+        finally:
+            for index in reversed(stripes):
+                self._locks[index].release()
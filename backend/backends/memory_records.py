@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any
+
+from backends.statuses import RECORD_STATUSES, SIGNUP_STATUSES, StatusCodes
+
+
+class MemoryRecord:
+    """Fixed-field row kept by MemoryBackend.
+
+    Rows are read and written with the same ``row.get(key)`` / ``row[key] = value``
+    calls as the plain dicts they replace, and are turned back into dicts with
+    ``to_dict()`` when they leave the backend. Fields never set (e.g. missing from
+    the seed file) are left out of ``to_dict()``.
+
+    Status fields hold integer codes; names assigned to them are converted on
+    write and ``to_dict()`` turns the codes back into names.
+    """
+
+    __slots__ = ()
+    _status_fields: dict[str, StatusCodes] = {}
+
+    def __init__(self, **fields: Any) -> None:
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> MemoryRecord:
+        return cls(**row)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        statuses = self._status_fields.get(key)
+        if statuses is not None:
+            value = statuses.code(value)
+        setattr(self, key, value)
+
+    def to_dict(self) -> dict[str, Any]:
+        row = {name: getattr(self, name) for name in self.__slots__ if hasattr(self, name)}
+        for key, statuses in self._status_fields.items():
+            if key in row:
+                row[key] = statuses.name(row[key])
+        return row
+
+
+class UserRecord(MemoryRecord):
+    __slots__ = (
+        "user_id",
+        "full_name",
+        "email",
+        "password_hash",
+        "is_active",
+        "attendance_score",
+        "created_at",
+        "updated_at",
+    )
+
+
+class ShiftRecord(MemoryRecord):
+    __slots__ = (
+        "shift_id",
+        "pantry_id",
+        "shift_name",
+        "start_time",
+        "end_time",
+        "status",
+        "created_by",
+        "created_at",
+        "updated_at",
+        "template_id",
+    )
+    _status_fields = {"status": RECORD_STATUSES}
+
+
+class ShiftRoleRecord(MemoryRecord):
+    __slots__ = (
+        "shift_role_id",
+        "shift_id",
+        "role_title",
+        "required_count",
+        "filled_count",
+        "status",
+    )
+    _status_fields = {"status": RECORD_STATUSES}
+
+
+class SignupRecord(MemoryRecord):
+    __slots__ = (
+        "signup_id",
+        "shift_role_id",
+        "user_id",
+        "signup_status",
+        "reservation_expires_at",
+        "created_at",
+    )
+    _status_fields = {"signup_status": SIGNUP_STATUSES}
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+import threading
+from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
 from mysql.connector import IntegrityError
 
 from backends.base import StoreBackend
-from db.mysql import get_connection
+from backends.shift_templates import GENERATE_BATCH_SIZE, format_clock, template_occurrences
+from backends.statuses import (
+    ACTIVE_SIGNUP_CODES,
+    MARKED_ATTENDANCE_CODES,
+    RECORD_STATUSES,
+    SIGNUP_CANCELLED,
+    SIGNUP_CONFIRMED,
+    SIGNUP_NO_SHOW,
+    SIGNUP_PENDING_CONFIRMATION,
+    SIGNUP_SHOW_UP,
+    SIGNUP_STATUSES,
+    SIGNUP_WAITLISTED,
+    STATUS_CANCELLED,
+    STATUS_FULL,
+    STATUS_OPEN,
+)
+from db.mysql import begin_unit_of_work, end_unit_of_work, get_connection, in_unit_of_work, pool_stats
+from db.seed import recalculate_all_attendance_scores, recalculate_role_capacities
 
-ACTIVE_SIGNUP_STATUSES = ("CONFIRMED", "SHOW_UP", "NO_SHOW")
-PENDING_SIGNUP_STATUS = "PENDING_CONFIRMATION"
 RESERVATION_WINDOW_HOURS = 48
 
 
@@ -34,6 +50,26 @@ def _to_iso_z(value: Any) -> str:
     return ""
 
 
+def _attendance_counts(status_code: int | None) -> tuple[int, int]:
+    return (1 if status_code == SIGNUP_SHOW_UP else 0, 1 if status_code in MARKED_ATTENDANCE_CODES else 0)
+
+
+def _attendance_delta(old_status: int | None, new_status: int | None) -> tuple[int, int]:
+    old_attended, old_marked = _attendance_counts(old_status)
+    new_attended, new_marked = _attendance_counts(new_status)
+    return new_attended - old_attended, new_marked - old_marked
+
+
+def _occupies_slot(status_code: int | None, reservation_expires_at: Any) -> int:
+    if status_code in ACTIVE_SIGNUP_CODES:
+        return 1
+    return 1 if status_code == SIGNUP_PENDING_CONFIRMATION and reservation_expires_at is not None else 0
+
+
+def _in_placeholders(values: list[Any]) -> str:
+    return ", ".join(["%s"] * len(values))
+
+
 def _serialize_user(row: dict[str, Any]) -> dict[str, Any]:
     return {
         "user_id": row["user_id"],
@@ -64,13 +100,37 @@ def _serialize_shift(row: dict[str, Any]) -> dict[str, Any]:
         "shift_name": row["shift_name"],
         "start_time": _to_iso_z(row["start_time"]),
         "end_time": _to_iso_z(row["end_time"]),
-        "status": row["status"],
+        "status": RECORD_STATUSES.name(row["status"]),
+        "created_by": row["created_by"],
+        "created_at": _to_iso_z(row["created_at"]),
+        "updated_at": _to_iso_z(row["updated_at"]),
+        "template_id": row.get("template_id"),
+    }
+
+
+def _serialize_shift_template(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "template_id": row["template_id"],
+        "pantry_id": row["pantry_id"],
+        "template_name": row["template_name"],
+        "weekday": int(row["weekday"]),
+        "start_time": format_clock(row["start_time"]),
+        "end_time": format_clock(row["end_time"]),
         "created_by": row["created_by"],
         "created_at": _to_iso_z(row["created_at"]),
         "updated_at": _to_iso_z(row["updated_at"]),
     }
 
 
+def _serialize_template_role(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "template_role_id": row["template_role_id"],
+        "template_id": row["template_id"],
+        "role_title": row["role_title"],
+        "required_count": int(row["required_count"]),
+    }
+
+
 def _serialize_shift_role(row: dict[str, Any]) -> dict[str, Any]:
     return {
         "shift_role_id": row["shift_role_id"],
@@ -78,7 +138,7 @@ def _serialize_shift_role(row: dict[str, Any]) -> dict[str, Any]:
         "role_title": row["role_title"],
         "required_count": int(row["required_count"]),
         "filled_count": int(row["filled_count"]),
-        "status": row["status"],
+        "status": RECORD_STATUSES.name(row["status"]),
     }
 
 
@@ -88,84 +148,132 @@ def _serialize_signup(row: dict[str, Any]) -> dict[str, Any]:
         "signup_id": row["signup_id"],
         "shift_role_id": row["shift_role_id"],
         "user_id": row["user_id"],
-        "signup_status": row["signup_status"],
+        "signup_status": SIGNUP_STATUSES.name(row["signup_status"]),
         "reservation_expires_at": _to_iso_z(reservation_expires_at) if reservation_expires_at else None,
         "created_at": _to_iso_z(row["created_at"]),
     }
 
 
 class MySQLBackend(StoreBackend):
-    def _recalculate_role_capacity(self, cursor: Any, shift_role_id: int) -> None:
-        cursor.execute(
-            "SELECT required_count, status FROM shift_roles WHERE shift_role_id = %s FOR UPDATE",
-            (shift_role_id,),
-        )
-        role_row = cursor.fetchone()
-        if not role_row:
+    def __init__(self, request_transactions: bool = True) -> None:
+        self.request_transactions = request_transactions
+        self._request_state = threading.local()
+
+    def begin_request(self, read_only: bool = False) -> None:
+        # One connection and one transaction per request; see db.mysql.begin_unit_of_work.
+        if self.request_transactions:
+            begin_unit_of_work(read_only)
+
+    def end_request(self, commit: bool = True) -> None:
+        try:
+            end_unit_of_work(commit=commit)
+        finally:
+            if getattr(self._request_state, "lead_changed", False):
+                self._request_state.lead_changed = False
+                self._notify_lead_change()
+
+    def _lead_pantries_changed(self) -> None:
+        self._notify_lead_change()
+        if in_unit_of_work():
+            # Other connections only see the change once the unit commits; notify again then.
+            self._request_state.lead_changed = True
+
+    def pool_stats(self) -> dict[str, Any] | None:
+        return pool_stats()
+
+    def _apply_capacity_delta(self, cursor: Any, shift_role_id: int, delta: int) -> None:
+        if delta == 0:
             return
-
         cursor.execute(
-            """
-            SELECT COUNT(*) AS active_count
-            FROM shift_signups
+            f"""
+            UPDATE shift_roles
+            SET filled_count = filled_count + %s,
+                status = CASE
+                    WHEN status = {STATUS_CANCELLED} THEN status
+                    WHEN filled_count >= required_count THEN {STATUS_FULL}
+                    ELSE {STATUS_OPEN}
+                END
             WHERE shift_role_id = %s
-              AND (
-                    UPPER(signup_status) IN ('CONFIRMED', 'SHOW_UP', 'NO_SHOW')
-                    OR (
-                        UPPER(signup_status) = 'PENDING_CONFIRMATION'
-                        AND reservation_expires_at IS NOT NULL
-                        AND reservation_expires_at > UTC_TIMESTAMP(6)
-                    )
-              )
             """,
-            (shift_role_id,),
+            (delta, shift_role_id),
         )
-        active_count = int(cursor.fetchone()["active_count"])
-        required_count = int(role_row["required_count"])
-        role_status = str(role_row["status"]).upper()
-        if role_status == "CANCELLED":
-            next_status = "CANCELLED"
-        else:
-            next_status = "FULL" if active_count >= required_count else "OPEN"
 
+    def _expire_role_reservations(self, cursor: Any, shift_role_id: int, now_dt: datetime) -> int:
+        """Cancel the role's lapsed reservations; the caller applies ``-expired`` to its capacity."""
         cursor.execute(
-            "UPDATE shift_roles SET filled_count = %s, status = %s WHERE shift_role_id = %s",
-            (active_count, next_status, shift_role_id),
+            f"""
+            UPDATE shift_signups
+            SET signup_status = {SIGNUP_CANCELLED},
+                reservation_expires_at = NULL
+            WHERE shift_role_id = %s
+              AND signup_status = {SIGNUP_PENDING_CONFIRMATION}
+              AND reservation_expires_at IS NOT NULL
+              AND reservation_expires_at <= %s
+            """,
+            (shift_role_id, now_dt),
         )
+        return int(cursor.rowcount or 0)
 
-    def _recalculate_user_attendance_score(self, cursor: Any, user_id: int) -> None:
+    def _apply_attendance_delta(self, cursor: Any, user_id: int, old_status: int | None, new_status: int | None) -> None:
+        attended_delta, marked_delta = _attendance_delta(old_status, new_status)
+        self._apply_attendance_counts(cursor, user_id, attended_delta, marked_delta)
+
+    def _apply_attendance_counts(self, cursor: Any, user_id: int, attended_delta: int, marked_delta: int) -> None:
+        if attended_delta == 0 and marked_delta == 0:
+            return
+        # Single-table UPDATE assigns left to right, so attendance_score sees the new counters.
         cursor.execute(
             """
-            SELECT
-                SUM(CASE WHEN UPPER(signup_status) = 'SHOW_UP' THEN 1 ELSE 0 END) AS attended_count,
-                SUM(CASE WHEN UPPER(signup_status) IN ('SHOW_UP', 'NO_SHOW') THEN 1 ELSE 0 END) AS marked_count
-            FROM shift_signups
+            UPDATE users
+            SET attended_count = attended_count + %s,
+                marked_count = marked_count + %s,
+                attendance_score = CASE
+                    WHEN marked_count <= 0 THEN 100
+                    ELSE ROUND((attended_count * 100.0) / marked_count)
+                END
             WHERE user_id = %s
             """,
-            (user_id,),
+            (attended_delta, marked_delta, user_id),
         )
-        score_row = cursor.fetchone() or {}
-        attended_count = int(score_row.get("attended_count") or 0)
-        marked_count = int(score_row.get("marked_count") or 0)
-        if marked_count == 0:
-            attendance_score = 100
-        else:
-            attendance_score = round((attended_count * 100) / marked_count)
 
+    def _remove_attendance_for_signups(self, cursor: Any, where_sql: str, params: tuple[Any, ...]) -> None:
         cursor.execute(
-            "UPDATE users SET attendance_score = %s WHERE user_id = %s",
-            (attendance_score, user_id),
+            f"""
+            SELECT
+                ss.user_id,
+                SUM(CASE WHEN ss.signup_status = {SIGNUP_SHOW_UP} THEN 1 ELSE 0 END) AS attended_count,
+                SUM(CASE WHEN ss.signup_status IN ({SIGNUP_SHOW_UP}, {SIGNUP_NO_SHOW}) THEN 1 ELSE 0 END) AS marked_count
+            FROM shift_signups ss
+            JOIN shift_roles sr ON sr.shift_role_id = ss.shift_role_id
+            WHERE {where_sql}
+              AND ss.signup_status IN ({SIGNUP_SHOW_UP}, {SIGNUP_NO_SHOW})
+            GROUP BY ss.user_id
+            """,
+            params,
         )
+        for row in cursor.fetchall():
+            self._apply_attendance_counts(
+                cursor,
+                int(row["user_id"]),
+                -int(row["attended_count"] or 0),
+                -int(row["marked_count"] or 0),
+            )
 
-    def get_user_by_id(self, user_id: int) -> dict[str, Any] | None:
+    def rebuild_attendance_counters(self) -> None:
         with get_connection() as conn:
+            cursor = conn.cursor()
+            recalculate_all_attendance_scores(cursor)
+            conn.commit()
+
+    def get_user_by_id(self, user_id: int) -> dict[str, Any] | None:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM users WHERE user_id = %s", (user_id,))
             row = cursor.fetchone()
             return _serialize_user(row) if row else None
 
     def get_user_roles(self, user_id: int) -> list[str]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
                 """
@@ -179,8 +287,41 @@ class MySQLBackend(StoreBackend):
             )
             return [row["role_name"] for row in cursor.fetchall()]
 
+    def get_users_by_ids(self, user_ids: list[int]) -> dict[int, dict[str, Any]]:
+        unique_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+        if not unique_ids:
+            return {}
+        with get_connection(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                f"SELECT * FROM users WHERE user_id IN ({_in_placeholders(unique_ids)})",
+                tuple(unique_ids),
+            )
+            return {int(row["user_id"]): _serialize_user(row) for row in cursor.fetchall()}
+
+    def get_user_roles_bulk(self, user_ids: list[int]) -> dict[int, list[str]]:
+        unique_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+        result: dict[int, list[str]] = {user_id: [] for user_id in unique_ids}
+        if not unique_ids:
+            return result
+        with get_connection(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                f"""
+                SELECT ur.user_id, r.role_name
+                FROM user_roles ur
+                JOIN roles r ON r.role_id = ur.role_id
+                WHERE ur.user_id IN ({_in_placeholders(unique_ids)})
+                ORDER BY ur.user_id, r.role_id
+                """,
+                tuple(unique_ids),
+            )
+            for row in cursor.fetchall():
+                result[int(row["user_id"])].append(row["role_name"])
+        return result
+
     def list_users(self, role_filter: str | None = None) -> list[dict[str, Any]]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             if role_filter:
                 cursor.execute(
@@ -199,7 +340,7 @@ class MySQLBackend(StoreBackend):
             return [_serialize_user(row) for row in cursor.fetchall()]
 
     def list_roles(self) -> list[dict[str, Any]]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT role_id, role_name FROM roles ORDER BY role_id")
             return [dict(row) for row in cursor.fetchall()]
@@ -264,36 +405,36 @@ class MySQLBackend(StoreBackend):
             }
 
     def list_pantries(self) -> list[dict[str, Any]]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM pantries ORDER BY pantry_id")
             return [_serialize_pantry(row) for row in cursor.fetchall()]
 
     def get_pantry_by_id(self, pantry_id: int) -> dict[str, Any] | None:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM pantries WHERE pantry_id = %s", (pantry_id,))
             row = cursor.fetchone()
             return _serialize_pantry(row) if row else None
 
     def get_pantry_by_slug(self, slug: str) -> dict[str, Any] | None:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
                 """
                 SELECT *
                 FROM pantries
-                WHERE CAST(pantry_id AS CHAR) = %s
-                   OR REPLACE(LOWER(name), ' ', '-') = %s
+                WHERE pantry_id = %s
+                   OR slug = %s
                 LIMIT 1
                 """,
-                (slug, slug.lower()),
+                (int(slug) if slug.isdigit() else None, slug.lower()),
             )
             row = cursor.fetchone()
             return _serialize_pantry(row) if row else None
 
     def get_pantry_leads(self, pantry_id: int) -> list[dict[str, Any]]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
                 """
@@ -308,7 +449,7 @@ class MySQLBackend(StoreBackend):
             return [_serialize_user(row) for row in cursor.fetchall()]
 
     def is_pantry_lead(self, pantry_id: int, user_id: int) -> bool:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT 1 FROM pantry_leads WHERE pantry_id = %s AND user_id = %s",
@@ -316,6 +457,15 @@ class MySQLBackend(StoreBackend):
             )
             return cursor.fetchone() is not None
 
+    def list_lead_pantry_ids(self, user_id: int) -> list[int]:
+        with get_connection(read_only=True) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT pantry_id FROM pantry_leads WHERE user_id = %s ORDER BY pantry_id",
+                (user_id,),
+            )
+            return [int(row[0]) for row in cursor.fetchall()]
+
     def create_pantry(self, name: str, location_address: str, lead_ids: list[int]) -> dict[str, Any]:
         timestamp = _now_utc_naive()
 
@@ -348,6 +498,8 @@ class MySQLBackend(StoreBackend):
                 )
 
             conn.commit()
+        if lead_ids:
+            self._lead_pantries_changed()
 
         pantry = self.get_pantry_by_id(pantry_id)
         if not pantry:
@@ -367,6 +519,7 @@ class MySQLBackend(StoreBackend):
                 conn.rollback()
                 raise ValueError("User already a lead for this pantry")
             conn.commit()
+        self._lead_pantries_changed()
 
     def remove_pantry_lead(self, pantry_id: int, user_id: int) -> None:
         with get_connection() as conn:
@@ -376,9 +529,10 @@ class MySQLBackend(StoreBackend):
                 (pantry_id, user_id),
             )
             conn.commit()
+        self._lead_pantries_changed()
 
     def list_shifts_by_pantry(self, pantry_id: int, include_cancelled: bool = True) -> list[dict[str, Any]]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             if include_cancelled:
                 cursor.execute(
@@ -387,28 +541,117 @@ class MySQLBackend(StoreBackend):
                 )
             else:
                 cursor.execute(
-                    "SELECT * FROM shifts WHERE pantry_id = %s AND status != 'CANCELLED' ORDER BY shift_id",
+                    f"SELECT * FROM shifts WHERE pantry_id = %s AND status != {STATUS_CANCELLED} ORDER BY shift_id",
                     (pantry_id,),
                 )
             return [_serialize_shift(row) for row in cursor.fetchall()]
 
+    def list_shift_tree_by_pantry(
+        self,
+        pantry_id: int,
+        include_cancelled: bool = True,
+        non_expired_only: bool = False,
+    ) -> list[dict[str, Any]]:
+        shift_filters = ["s.pantry_id = %s"]
+        if non_expired_only:
+            shift_filters.append("s.end_time >= UTC_TIMESTAMP()")
+        if not include_cancelled:
+            shift_filters.append(f"s.status != {STATUS_CANCELLED}")
+        return self._list_shift_tree(shift_filters, (pantry_id,), include_cancelled, "s.shift_id")
+
+    def list_calendar_shifts(
+        self,
+        pantry_ids: list[int] | None = None,
+        window_start: str | None = None,
+        window_end: str | None = None,
+    ) -> list[dict[str, Any]]:
+        shift_filters = [f"s.status != {STATUS_CANCELLED}"]
+        params: list[Any] = []
+        start_dt = _parse_iso_to_dt(window_start) if window_start else None
+        if start_dt is not None and start_dt > _now_utc_naive():
+            shift_filters.append("s.end_time >= %s")
+            params.append(start_dt)
+        else:
+            shift_filters.append("s.end_time >= UTC_TIMESTAMP()")
+        if window_end:
+            shift_filters.append("s.start_time < %s")
+            params.append(_parse_iso_to_dt(window_end))
+        if pantry_ids is not None:
+            unique_ids = list(dict.fromkeys(int(pantry_id) for pantry_id in pantry_ids))
+            if not unique_ids:
+                return []
+            shift_filters.append(f"s.pantry_id IN ({_in_placeholders(unique_ids)})")
+            params.extend(unique_ids)
+        return self._list_shift_tree(shift_filters, tuple(params), False, "s.pantry_id, s.start_time, s.shift_id")
+
+    def _list_shift_tree(
+        self,
+        shift_filters: list[str],
+        params: tuple[Any, ...],
+        include_cancelled: bool,
+        order_by: str,
+    ) -> list[dict[str, Any]]:
+        role_join = "sr.shift_id = s.shift_id"
+        if not include_cancelled:
+            role_join += f" AND sr.status != {STATUS_CANCELLED}"
+
+        with get_connection(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                f"""
+                SELECT
+                    s.*,
+                    sr.shift_role_id AS role_shift_role_id,
+                    sr.role_title AS role_role_title,
+                    sr.required_count AS role_required_count,
+                    sr.filled_count AS role_filled_count,
+                    sr.status AS role_status
+                FROM shifts s
+                LEFT JOIN shift_roles sr ON {role_join}
+                WHERE {' AND '.join(shift_filters)}
+                ORDER BY {order_by}, sr.shift_role_id
+                """,
+                params,
+            )
+            shifts: dict[int, dict[str, Any]] = {}
+            for row in cursor.fetchall():
+                shift_id = int(row["shift_id"])
+                shift = shifts.get(shift_id)
+                if shift is None:
+                    shift = shifts[shift_id] = _serialize_shift(row)
+                    shift["roles"] = []
+                if row["role_shift_role_id"] is not None:
+                    shift["roles"].append(
+                        _serialize_shift_role(
+                            {
+                                "shift_role_id": row["role_shift_role_id"],
+                                "shift_id": shift_id,
+                                "role_title": row["role_role_title"],
+                                "required_count": row["role_required_count"],
+                                "filled_count": row["role_filled_count"],
+                                "status": row["role_status"],
+                            }
+                        )
+                    )
+            return list(shifts.values())
+
     def get_shift_by_id(self, shift_id: int) -> dict[str, Any] | None:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM shifts WHERE shift_id = %s", (shift_id,))
             row = cursor.fetchone()
             return _serialize_shift(row) if row else None
-    
+
     def list_non_expired_shifts_by_pantry(
         self,
         pantry_id: int,
         include_cancelled: bool = True,
     ) -> list[dict[str, Any]]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             query = "SELECT * FROM shifts WHERE pantry_id = %s AND end_time >= UTC_TIMESTAMP()"
             if not include_cancelled:
-                query += " AND status != 'CANCELLED'"
+                query += f" AND status != {STATUS_CANCELLED}"
             query += " ORDER BY shift_id"
             cursor.execute(query, (pantry_id,))
             return [_serialize_shift(row) for row in cursor.fetchall()]
@@ -421,10 +664,12 @@ class MySQLBackend(StoreBackend):
         end_time: str,
         status: str,
         created_by: int,
+        roles: list[dict[str, Any]] | None = None,
     ) -> dict[str, Any]:
         timestamp = _now_utc_naive()
         start_dt = _parse_iso_to_dt(start_time)
         end_dt = _parse_iso_to_dt(end_time)
+        status_code = RECORD_STATUSES.code(status)
 
         with get_connection() as conn:
             cursor = conn.cursor()
@@ -442,58 +687,350 @@ class MySQLBackend(StoreBackend):
                 )
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
                 """,
-                (pantry_id, shift_name, start_dt, end_dt, status, created_by, timestamp, timestamp),
+                (pantry_id, shift_name, start_dt, end_dt, status_code, created_by, timestamp, timestamp),
             )
             shift_id = int(cursor.lastrowid)
+            role_rows = [(shift_id, role["role_title"], int(role["required_count"])) for role in roles or []]
+            role_ids: list[int] = []
+            if role_rows:
+                cursor.executemany(
+                    f"""
+                    INSERT INTO shift_roles (shift_id, role_title, required_count, filled_count, status)
+                    VALUES (%s, %s, %s, 0, {STATUS_OPEN})
+                    """,
+                    role_rows,
+                )
+                # Read the ids back rather than assuming consecutive auto-increment values;
+                # ids of one INSERT ascend in row order.
+                cursor.execute(
+                    "SELECT shift_role_id FROM shift_roles WHERE shift_id = %s ORDER BY shift_role_id",
+                    (shift_id,),
+                )
+                role_ids = [int(row[0]) for row in cursor.fetchall()]
             conn.commit()
 
-        shift = self.get_shift_by_id(shift_id)
-        if not shift:
-            raise RuntimeError("Failed to create shift")
+        shift = _serialize_shift(
+            {
+                "shift_id": shift_id,
+                "pantry_id": pantry_id,
+                "shift_name": shift_name,
+                "start_time": start_dt,
+                "end_time": end_dt,
+                "status": status_code,
+                "created_by": created_by,
+                "created_at": timestamp,
+                "updated_at": timestamp,
+            }
+        )
+        shift["roles"] = [
+            _serialize_shift_role(
+                {
+                    "shift_role_id": shift_role_id,
+                    "shift_id": shift_id,
+                    "role_title": role_title,
+                    "required_count": required_count,
+                    "filled_count": 0,
+                    "status": STATUS_OPEN,
+                }
+            )
+            for shift_role_id, (_, role_title, required_count) in zip(role_ids, role_rows)
+        ]
         return shift
 
     def update_shift(self, shift_id: int, payload: dict[str, Any]) -> dict[str, Any] | None:
-        existing = self.get_shift_by_id(shift_id)
-        if not existing:
-            return None
-
-        updates: list[str] = []
-        values: list[Any] = []
+        changes: dict[str, Any] = {}
         if "shift_name" in payload:
-            updates.append("shift_name = %s")
-            values.append(payload["shift_name"])
+            changes["shift_name"] = payload["shift_name"]
         if "start_time" in payload:
-            updates.append("start_time = %s")
-            values.append(_parse_iso_to_dt(payload["start_time"]))
+            changes["start_time"] = _parse_iso_to_dt(payload["start_time"])
         if "end_time" in payload:
-            updates.append("end_time = %s")
-            values.append(_parse_iso_to_dt(payload["end_time"]))
+            changes["end_time"] = _parse_iso_to_dt(payload["end_time"])
         if "status" in payload:
-            updates.append("status = %s")
-            values.append(payload["status"])
-
-        if updates:
-            updates.append("updated_at = %s")
-            values.append(_now_utc_naive())
-            values.append(shift_id)
-            with get_connection() as conn:
-                cursor = conn.cursor()
+            changes["status"] = RECORD_STATUSES.code(payload["status"])
+
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT * FROM shifts WHERE shift_id = %s FOR UPDATE", (shift_id,))
+            row = cursor.fetchone()
+            if not row:
+                conn.rollback()
+                return None
+            if changes:
+                changes["updated_at"] = _now_utc_naive()
                 cursor.execute(
-                    f"UPDATE shifts SET {', '.join(updates)} WHERE shift_id = %s",
-                    tuple(values),
+                    f"UPDATE shifts SET {', '.join(f'{column} = %s' for column in changes)} WHERE shift_id = %s",
+                    (*changes.values(), shift_id),
                 )
-                conn.commit()
-
-        return self.get_shift_by_id(shift_id)
+                row.update(changes)
+            conn.commit()
+        return _serialize_shift(row)
 
     def delete_shift(self, shift_id: int) -> None:
         with get_connection() as conn:
-            cursor = conn.cursor()
+            cursor = conn.cursor(dictionary=True)
+            self._remove_attendance_for_signups(cursor, "sr.shift_id = %s", (shift_id,))
             cursor.execute("DELETE FROM shifts WHERE shift_id = %s", (shift_id,))
             conn.commit()
 
-    def list_shift_roles(self, shift_id: int) -> list[dict[str, Any]]:
+    def _template_roles(self, cursor: Any, template_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        result: dict[int, list[dict[str, Any]]] = {template_id: [] for template_id in template_ids}
+        if not template_ids:
+            return result
+        cursor.execute(
+            f"""
+            SELECT *
+            FROM shift_template_roles
+            WHERE template_id IN ({_in_placeholders(template_ids)})
+            ORDER BY template_id, template_role_id
+            """,
+            tuple(template_ids),
+        )
+        for row in cursor.fetchall():
+            result[int(row["template_id"])].append(_serialize_template_role(row))
+        return result
+
+    def list_shift_templates(self, pantry_id: int) -> list[dict[str, Any]]:
+        with get_connection(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                "SELECT * FROM shift_templates WHERE pantry_id = %s ORDER BY template_id",
+                (pantry_id,),
+            )
+            templates = [_serialize_shift_template(row) for row in cursor.fetchall()]
+            roles = self._template_roles(cursor, [int(t["template_id"]) for t in templates])
+        for template in templates:
+            template["roles"] = roles[int(template["template_id"])]
+        return templates
+
+    def get_shift_template_by_id(self, template_id: int) -> dict[str, Any] | None:
+        with get_connection(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT * FROM shift_templates WHERE template_id = %s", (template_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            template = _serialize_shift_template(row)
+            template["roles"] = self._template_roles(cursor, [template_id])[template_id]
+        return template
+
+    def create_shift_template(
+        self,
+        pantry_id: int,
+        template_name: str,
+        weekday: int,
+        start_time: str,
+        end_time: str,
+        created_by: int,
+        roles: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        timestamp = _now_utc_naive()
+        start_clock = format_clock(start_time)
+        end_clock = format_clock(end_time)
+
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO shift_templates (
+                    pantry_id,
+                    template_name,
+                    weekday,
+                    start_time,
+                    end_time,
+                    created_by,
+                    created_at,
+                    updated_at
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """,
+                (pantry_id, template_name, int(weekday), start_clock, end_clock, created_by, timestamp, timestamp),
+            )
+            template_id = int(cursor.lastrowid)
+            role_rows = [(template_id, role["role_title"], int(role["required_count"])) for role in roles]
+            role_ids: list[int] = []
+            if role_rows:
+                cursor.executemany(
+                    """
+                    INSERT INTO shift_template_roles (template_id, role_title, required_count)
+                    VALUES (%s, %s, %s)
+                    """,
+                    role_rows,
+                )
+                cursor.execute(
+                    """
+                    SELECT template_role_id
+                    FROM shift_template_roles
+                    WHERE template_id = %s
+                    ORDER BY template_role_id
+                    """,
+                    (template_id,),
+                )
+                role_ids = [int(row[0]) for row in cursor.fetchall()]
+            conn.commit()
+
+        template = _serialize_shift_template(
+            {
+                "template_id": template_id,
+                "pantry_id": pantry_id,
+                "template_name": template_name,
+                "weekday": weekday,
+                "start_time": start_clock,
+                "end_time": end_clock,
+                "created_by": created_by,
+                "created_at": timestamp,
+                "updated_at": timestamp,
+            }
+        )
+        template["roles"] = [
+            _serialize_template_role(
+                {
+                    "template_role_id": template_role_id,
+                    "template_id": template_id,
+                    "role_title": role_title,
+                    "required_count": required_count,
+                }
+            )
+            for template_role_id, (_, role_title, required_count) in zip(role_ids, role_rows)
+        ]
+        return template
+
+    def delete_shift_template(self, template_id: int) -> None:
+        # Template roles cascade; generated shifts keep existing with template_id set to NULL.
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM shift_templates WHERE template_id = %s", (template_id,))
+            conn.commit()
+
+    def generate_template_shifts(
+        self,
+        start_date: str,
+        weeks: int,
+        created_by: int,
+        pantry_id: int | None = None,
+    ) -> dict[str, Any]:
+        first_day = date.fromisoformat(start_date)
+        timestamp = _now_utc_naive()
+        result = {"template_count": 0, "created_shift_count": 0, "created_role_count": 0, "skipped_shift_count": 0}
+
         with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            # Locking the templates serializes concurrent generation runs over them, so the
+            # existing-occurrence check below cannot race another run's inserts.
+            if pantry_id is None:
+                cursor.execute("SELECT * FROM shift_templates ORDER BY template_id FOR UPDATE")
+            else:
+                cursor.execute(
+                    "SELECT * FROM shift_templates WHERE pantry_id = %s ORDER BY template_id FOR UPDATE",
+                    (pantry_id,),
+                )
+            templates = cursor.fetchall()
+            if not templates:
+                conn.commit()
+                return result
+            template_ids = [int(t["template_id"]) for t in templates]
+            roles_by_template = self._template_roles(cursor, template_ids)
+
+            occurrences = [
+                (template, start, end)
+                for template in templates
+                for start, end in template_occurrences(template, first_day, weeks, not_before=timestamp)
+            ]
+            existing: set[tuple[int, datetime]] = set()
+            if occurrences:
+                cursor.execute(
+                    f"""
+                    SELECT template_id, start_time
+                    FROM shifts
+                    WHERE template_id IN ({_in_placeholders(template_ids)})
+                      AND start_time BETWEEN %s AND %s
+                    """,
+                    (
+                        *template_ids,
+                        min(start for _, start, _ in occurrences),
+                        max(start for _, start, _ in occurrences),
+                    ),
+                )
+                existing = {(int(row["template_id"]), row["start_time"]) for row in cursor.fetchall()}
+            pending = [
+                (template, start, end)
+                for template, start, end in occurrences
+                if (int(template["template_id"]), start) not in existing
+            ]
+
+            for chunk_start in range(0, len(pending), GENERATE_BATCH_SIZE):
+                chunk = pending[chunk_start : chunk_start + GENERATE_BATCH_SIZE]
+                # One multi-row INSERT per chunk.
+                cursor.executemany(
+                    f"""
+                    INSERT INTO shifts (
+                        pantry_id,
+                        shift_name,
+                        start_time,
+                        end_time,
+                        status,
+                        created_by,
+                        created_at,
+                        updated_at,
+                        template_id
+                    )
+                    VALUES (%s, %s, %s, %s, {STATUS_OPEN}, %s, %s, %s, %s)
+                    """,
+                    [
+                        (
+                            template["pantry_id"],
+                            template["template_name"],
+                            start,
+                            end,
+                            created_by,
+                            timestamp,
+                            timestamp,
+                            template["template_id"],
+                        )
+                        for template, start, end in chunk
+                    ],
+                )
+                # Read the new ids back by their (template_id, start_time) unique key rather
+                # than assuming the server hands out consecutive auto-increment values.
+                chunk_template_ids = sorted({int(template["template_id"]) for template, _, _ in chunk})
+                cursor.execute(
+                    f"""
+                    SELECT shift_id, template_id, start_time
+                    FROM shifts
+                    WHERE template_id IN ({_in_placeholders(chunk_template_ids)})
+                      AND start_time BETWEEN %s AND %s
+                    """,
+                    (
+                        *chunk_template_ids,
+                        min(start for _, start, _ in chunk),
+                        max(start for _, start, _ in chunk),
+                    ),
+                )
+                shift_ids = {
+                    (int(row["template_id"]), row["start_time"]): int(row["shift_id"]) for row in cursor.fetchall()
+                }
+                role_rows = [
+                    (shift_ids[(int(template["template_id"]), start)], role["role_title"], role["required_count"])
+                    for template, start, _ in chunk
+                    for role in roles_by_template[int(template["template_id"])]
+                ]
+                if role_rows:
+                    cursor.executemany(
+                        f"""
+                        INSERT INTO shift_roles (shift_id, role_title, required_count, filled_count, status)
+                        VALUES (%s, %s, %s, 0, {STATUS_OPEN})
+                        """,
+                        role_rows,
+                    )
+                result["created_role_count"] += len(role_rows)
+            conn.commit()
+
+        result["template_count"] = len(templates)
+        result["created_shift_count"] = len(pending)
+        result["skipped_shift_count"] = len(occurrences) - len(pending)
+        return result
+
+    def list_shift_roles(self, shift_id: int) -> list[dict[str, Any]]:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
                 "SELECT * FROM shift_roles WHERE shift_id = %s ORDER BY shift_role_id",
@@ -502,7 +1039,7 @@ class MySQLBackend(StoreBackend):
             return [_serialize_shift_role(row) for row in cursor.fetchall()]
 
     def get_shift_role_by_id(self, shift_role_id: int) -> dict[str, Any] | None:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM shift_roles WHERE shift_role_id = %s", (shift_role_id,))
             row = cursor.fetchone()
@@ -512,60 +1049,67 @@ class MySQLBackend(StoreBackend):
         with get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
+                f"""
                 INSERT INTO shift_roles (shift_id, role_title, required_count, filled_count, status)
-                VALUES (%s, %s, %s, 0, 'OPEN')
+                VALUES (%s, %s, %s, 0, {STATUS_OPEN})
                 """,
                 (shift_id, role_title, required_count),
             )
             shift_role_id = int(cursor.lastrowid)
             conn.commit()
 
-        role = self.get_shift_role_by_id(shift_role_id)
-        if not role:
-            raise RuntimeError("Failed to create shift role")
-        return role
+        return _serialize_shift_role(
+            {
+                "shift_role_id": shift_role_id,
+                "shift_id": shift_id,
+                "role_title": role_title,
+                "required_count": required_count,
+                "filled_count": 0,
+                "status": STATUS_OPEN,
+            }
+        )
 
     def update_shift_role(self, shift_role_id: int, payload: dict[str, Any]) -> dict[str, Any] | None:
-        existing = self.get_shift_role_by_id(shift_role_id)
-        if not existing:
-            return None
-
-        updates: list[str] = []
-        values: list[Any] = []
+        changes: dict[str, Any] = {}
         if "role_title" in payload:
-            updates.append("role_title = %s")
-            values.append(payload["role_title"])
+            changes["role_title"] = payload["role_title"]
         if "required_count" in payload:
-            updates.append("required_count = %s")
-            values.append(int(payload["required_count"]))
+            changes["required_count"] = int(payload["required_count"])
         if "status" in payload:
-            updates.append("status = %s")
-            values.append(payload["status"])
+            changes["status"] = RECORD_STATUSES.code(payload["status"])
         if "filled_count" in payload:
-            updates.append("filled_count = %s")
-            values.append(int(payload["filled_count"]))
+            changes["filled_count"] = int(payload["filled_count"])
 
-        if updates:
-            values.append(shift_role_id)
-            with get_connection() as conn:
-                cursor = conn.cursor()
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT * FROM shift_roles WHERE shift_role_id = %s FOR UPDATE", (shift_role_id,))
+            row = cursor.fetchone()
+            if not row:
+                conn.rollback()
+                return None
+            if changes:
+                row.update(changes)
+                # Recompute FULL/OPEN from the new counts unless the role is cancelled.
+                if row["status"] != STATUS_CANCELLED:
+                    row["status"] = STATUS_FULL if int(row["filled_count"]) >= int(row["required_count"]) else STATUS_OPEN
+                changes["status"] = row["status"]
                 cursor.execute(
-                    f"UPDATE shift_roles SET {', '.join(updates)} WHERE shift_role_id = %s",
-                    tuple(values),
+                    f"UPDATE shift_roles SET {', '.join(f'{column} = %s' for column in changes)} "
+                    "WHERE shift_role_id = %s",
+                    (*changes.values(), shift_role_id),
                 )
-                conn.commit()
-
-        return self.get_shift_role_by_id(shift_role_id)
+            conn.commit()
+        return _serialize_shift_role(row)
 
     def delete_shift_role(self, shift_role_id: int) -> None:
         with get_connection() as conn:
-            cursor = conn.cursor()
+            cursor = conn.cursor(dictionary=True)
+            self._remove_attendance_for_signups(cursor, "sr.shift_role_id = %s", (shift_role_id,))
             cursor.execute("DELETE FROM shift_roles WHERE shift_role_id = %s", (shift_role_id,))
             conn.commit()
 
     def list_shift_signups(self, shift_role_id: int) -> list[dict[str, Any]]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
                 "SELECT * FROM shift_signups WHERE shift_role_id = %s ORDER BY signup_id",
@@ -573,8 +1117,28 @@ class MySQLBackend(StoreBackend):
             )
             return [_serialize_signup(row) for row in cursor.fetchall()]
 
+    def list_signups_for_roles(self, shift_role_ids: list[int]) -> dict[int, list[dict[str, Any]]]:
+        unique_ids = list(dict.fromkeys(int(shift_role_id) for shift_role_id in shift_role_ids))
+        result: dict[int, list[dict[str, Any]]] = {shift_role_id: [] for shift_role_id in unique_ids}
+        if not unique_ids:
+            return result
+        with get_connection(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                f"""
+                SELECT *
+                FROM shift_signups
+                WHERE shift_role_id IN ({_in_placeholders(unique_ids)})
+                ORDER BY shift_role_id, signup_id
+                """,
+                tuple(unique_ids),
+            )
+            for row in cursor.fetchall():
+                result[int(row["shift_role_id"])].append(_serialize_signup(row))
+        return result
+
     def list_signups_by_user(self, user_id: int) -> list[dict[str, Any]]:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
                 """
@@ -612,19 +1176,19 @@ class MySQLBackend(StoreBackend):
             {
                 "signup_id": int(row["signup_id"]),
                 "user_id": int(row["user_id"]),
-                "signup_status": row["signup_status"],
+                "signup_status": SIGNUP_STATUSES.name(row["signup_status"]),
                 "reservation_expires_at": _to_iso_z(row["reservation_expires_at"]) if row["reservation_expires_at"] else None,
                 "created_at": _to_iso_z(row["created_at"]),
                 "shift_role_id": int(row["shift_role_id"]),
                 "role_title": row["role_title"],
                 "required_count": int(row["required_count"]),
                 "filled_count": int(row["filled_count"]),
-                "role_status": row["role_status"],
+                "role_status": RECORD_STATUSES.name(row["role_status"]),
                 "shift_id": int(row["shift_id"]),
                 "shift_name": row["shift_name"],
                 "start_time": _to_iso_z(row["start_time"]),
                 "end_time": _to_iso_z(row["end_time"]),
-                "shift_status": row["shift_status"],
+                "shift_status": RECORD_STATUSES.name(row["shift_status"]),
                 "pantry_id": int(row["pantry_id"]),
                 "pantry_name": row["pantry_name"],
                 "pantry_location": row["pantry_location"],
@@ -633,13 +1197,14 @@ class MySQLBackend(StoreBackend):
         ]
 
     def get_signup_by_id(self, signup_id: int) -> dict[str, Any] | None:
-        with get_connection() as conn:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM shift_signups WHERE signup_id = %s", (signup_id,))
             row = cursor.fetchone()
             return _serialize_signup(row) if row else None
 
     def create_signup(self, shift_role_id: int, user_id: int, signup_status: str) -> dict[str, Any]:
+        status_code = SIGNUP_STATUSES.code(signup_status)
         with get_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             now = _now_utc_naive()
@@ -652,7 +1217,7 @@ class MySQLBackend(StoreBackend):
             if not role_row:
                 conn.rollback()
                 raise LookupError("Shift role not found")
-            if str(role_row["status"]).upper() == "CANCELLED":
+            if role_row["status"] == STATUS_CANCELLED:
                 conn.rollback()
                 raise RuntimeError("This role is unavailable")
 
@@ -664,7 +1229,7 @@ class MySQLBackend(StoreBackend):
             if not shift_row:
                 conn.rollback()
                 raise LookupError("Shift not found")
-            if str(shift_row["status"]).upper() == "CANCELLED":
+            if shift_row["status"] == STATUS_CANCELLED:
                 conn.rollback()
                 raise RuntimeError("This shift is cancelled")
 
@@ -676,28 +1241,18 @@ class MySQLBackend(StoreBackend):
                 conn.rollback()
                 raise ValueError("Already signed up")
 
-            cursor.execute(
-                """
-                SELECT COUNT(*) AS active_count
-                FROM shift_signups
-                WHERE shift_role_id = %s
-                  AND (
-                        UPPER(signup_status) IN ('CONFIRMED', 'SHOW_UP', 'NO_SHOW')
-                        OR (
-                            UPPER(signup_status) = 'PENDING_CONFIRMATION'
-                            AND reservation_expires_at IS NOT NULL
-                            AND reservation_expires_at > %s
-                        )
-                  )
-                """,
-                (shift_role_id, now),
-            )
-            filled_count = int(cursor.fetchone()["active_count"])
+            expired = self._expire_role_reservations(cursor, shift_role_id, now)
+            filled_count = int(role_row["filled_count"]) - expired
             required_count = int(role_row["required_count"])
             if filled_count >= required_count:
                 conn.rollback()
                 raise RuntimeError("This role is full")
 
+            reservation_expires_at = (
+                now + timedelta(hours=RESERVATION_WINDOW_HOURS)
+                if status_code == SIGNUP_PENDING_CONFIRMATION
+                else None
+            )
             try:
                 cursor.execute(
                     """
@@ -710,29 +1265,32 @@ class MySQLBackend(StoreBackend):
                     )
                     VALUES (%s, %s, %s, %s, %s)
                     """,
-                    (
-                        shift_role_id,
-                        user_id,
-                        signup_status,
-                        now + timedelta(hours=RESERVATION_WINDOW_HOURS)
-                        if str(signup_status).upper() == PENDING_SIGNUP_STATUS
-                        else None,
-                        now,
-                    ),
+                    (shift_role_id, user_id, status_code, reservation_expires_at, now),
                 )
             except IntegrityError:
                 conn.rollback()
                 raise ValueError("Already signed up")
 
-            self._recalculate_role_capacity(cursor, shift_role_id)
-            self._recalculate_user_attendance_score(cursor, user_id)
             signup_id = int(cursor.lastrowid)
+            # Lapsed reservations and the new signup share a single capacity UPDATE.
+            self._apply_capacity_delta(
+                cursor,
+                shift_role_id,
+                _occupies_slot(status_code, reservation_expires_at) - expired,
+            )
+            self._apply_attendance_delta(cursor, user_id, None, status_code)
             conn.commit()
 
-        signup = self.get_signup_by_id(signup_id)
-        if not signup:
-            raise RuntimeError("Failed to create signup")
-        return signup
+        return _serialize_signup(
+            {
+                "signup_id": signup_id,
+                "shift_role_id": shift_role_id,
+                "user_id": user_id,
+                "signup_status": status_code,
+                "reservation_expires_at": reservation_expires_at,
+                "created_at": now,
+            }
+        )
 
     def delete_signup(self, signup_id: int) -> None:
         with get_connection() as conn:
@@ -753,12 +1311,17 @@ class MySQLBackend(StoreBackend):
 
             cursor.execute("DELETE FROM shift_signups WHERE signup_id = %s", (signup_id,))
             if role_row:
-                self._recalculate_role_capacity(cursor, shift_role_id)
-            self._recalculate_user_attendance_score(cursor, user_id)
+                self._apply_capacity_delta(
+                    cursor,
+                    shift_role_id,
+                    -_occupies_slot(signup["signup_status"], signup["reservation_expires_at"]),
+                )
+            self._apply_attendance_delta(cursor, user_id, signup["signup_status"], None)
 
             conn.commit()
 
     def update_signup(self, signup_id: int, signup_status: str) -> dict[str, Any] | None:
+        status_code = SIGNUP_STATUSES.code(signup_status)
         with get_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute("SELECT * FROM shift_signups WHERE signup_id = %s FOR UPDATE", (signup_id,))
@@ -775,32 +1338,37 @@ class MySQLBackend(StoreBackend):
                 conn.rollback()
                 return None
 
+            reservation_expires_at = (
+                _now_utc_naive() + timedelta(hours=RESERVATION_WINDOW_HOURS)
+                if status_code == SIGNUP_PENDING_CONFIRMATION
+                else None
+            )
             cursor.execute(
                 "UPDATE shift_signups SET signup_status = %s, reservation_expires_at = %s WHERE signup_id = %s",
-                (
-                    signup_status,
-                    _now_utc_naive() + timedelta(hours=RESERVATION_WINDOW_HOURS)
-                    if str(signup_status).upper() == PENDING_SIGNUP_STATUS
-                    else None,
-                    signup_id,
-                ),
-            )
-            self._recalculate_role_capacity(cursor, shift_role_id)
-            self._recalculate_user_attendance_score(cursor, user_id)
+                (status_code, reservation_expires_at, signup_id),
+            )
+            self._apply_capacity_delta(
+                cursor,
+                shift_role_id,
+                _occupies_slot(status_code, reservation_expires_at)
+                - _occupies_slot(signup_row["signup_status"], signup_row["reservation_expires_at"]),
+            )
+            self._apply_attendance_delta(cursor, user_id, signup_row["signup_status"], status_code)
             conn.commit()
-        return self.get_signup_by_id(signup_id)
+        signup_row.update(signup_status=status_code, reservation_expires_at=reservation_expires_at)
+        return _serialize_signup(signup_row)
 
     def bulk_mark_shift_signups_pending(self, shift_id: int, reservation_expires_at: str) -> list[dict[str, Any]]:
         reservation_expires_dt = _parse_iso_to_dt(reservation_expires_at)
         with get_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
-                """
-                SELECT ss.signup_id, ss.user_id
+                f"""
+                SELECT ss.signup_id, ss.user_id, ss.shift_role_id, ss.signup_status, ss.reservation_expires_at
                 FROM shift_signups ss
                 JOIN shift_roles sr ON sr.shift_role_id = ss.shift_role_id
                 WHERE sr.shift_id = %s
-                  AND UPPER(ss.signup_status) NOT IN ('CANCELLED', 'WAITLISTED')
+                  AND ss.signup_status NOT IN ({SIGNUP_CANCELLED}, {SIGNUP_WAITLISTED})
                 FOR UPDATE
                 """,
                 (shift_id,),
@@ -811,21 +1379,27 @@ class MySQLBackend(StoreBackend):
                 return []
 
             cursor.execute(
-                """
+                f"""
                 UPDATE shift_signups ss
                 JOIN shift_roles sr ON sr.shift_role_id = ss.shift_role_id
-                SET ss.signup_status = 'PENDING_CONFIRMATION',
+                SET ss.signup_status = {SIGNUP_PENDING_CONFIRMATION},
                     ss.reservation_expires_at = %s
                 WHERE sr.shift_id = %s
-                  AND UPPER(ss.signup_status) NOT IN ('CANCELLED', 'WAITLISTED')
+                  AND ss.signup_status NOT IN ({SIGNUP_CANCELLED}, {SIGNUP_WAITLISTED})
                 """,
                 (reservation_expires_dt, shift_id),
             )
 
-            cursor.execute("SELECT shift_role_id FROM shift_roles WHERE shift_id = %s", (shift_id,))
-            role_ids = [int(row["shift_role_id"]) for row in cursor.fetchall()]
-            for role_id in role_ids:
-                self._recalculate_role_capacity(cursor, role_id)
+            role_deltas: dict[int, int] = {}
+            for row in affected_rows:
+                role_id = int(row["shift_role_id"])
+                role_deltas[role_id] = role_deltas.get(role_id, 0) + 1 - _occupies_slot(
+                    row["signup_status"], row["reservation_expires_at"]
+                )
+            for role_id, delta in role_deltas.items():
+                self._apply_capacity_delta(cursor, role_id, delta)
+            for row in affected_rows:
+                self._apply_attendance_delta(cursor, int(row["user_id"]), row["signup_status"], SIGNUP_PENDING_CONFIRMATION)
 
             conn.commit()
             return [
@@ -836,18 +1410,98 @@ class MySQLBackend(StoreBackend):
                 for row in affected_rows
             ]
 
+    def list_pending_expiry_deadlines(self) -> list[dict[str, Any]]:
+        with get_connection(read_only=True) as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                f"""
+                SELECT
+                    sr.shift_id,
+                    LEAST(s.start_time, COALESCE(MIN(ss.reservation_expires_at), s.start_time)) AS deadline
+                FROM shift_signups ss
+                JOIN shift_roles sr ON sr.shift_role_id = ss.shift_role_id
+                JOIN shifts s ON s.shift_id = sr.shift_id
+                WHERE ss.signup_status = {SIGNUP_PENDING_CONFIRMATION}
+                GROUP BY sr.shift_id, s.start_time
+                ORDER BY deadline
+                """
+            )
+            return [
+                {"shift_id": int(row["shift_id"]), "deadline": _to_iso_z(row["deadline"])}
+                for row in cursor.fetchall()
+            ]
+
+    def expire_overdue_pending_signups(self, now_utc: str, batch_size: int = 500) -> dict[str, Any]:
+        now_dt = _parse_iso_to_dt(now_utc)
+        expired_count = 0
+        shift_role_ids: set[int] = set()
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            while True:
+                cursor.execute(
+                    f"""
+                    SELECT ss.signup_id, ss.shift_role_id, ss.reservation_expires_at
+                    FROM shift_signups ss
+                    JOIN shift_roles sr ON sr.shift_role_id = ss.shift_role_id
+                    JOIN shifts s ON s.shift_id = sr.shift_id
+                    WHERE ss.signup_status = {SIGNUP_PENDING_CONFIRMATION}
+                      AND (
+                            s.start_time <= %s
+                            OR (
+                                ss.reservation_expires_at IS NOT NULL
+                                AND ss.reservation_expires_at <= %s
+                            )
+                      )
+                    ORDER BY ss.signup_id
+                    LIMIT %s
+                    FOR UPDATE
+                    """,
+                    (now_dt, now_dt, batch_size),
+                )
+                rows = cursor.fetchall()
+                if not rows:
+                    conn.commit()
+                    break
+
+                signup_ids = [int(row["signup_id"]) for row in rows]
+                cursor.execute(
+                    f"""
+                    UPDATE shift_signups
+                    SET signup_status = {SIGNUP_CANCELLED},
+                        reservation_expires_at = NULL
+                    WHERE signup_id IN ({_in_placeholders(signup_ids)})
+                    """,
+                    tuple(signup_ids),
+                )
+                role_deltas: dict[int, int] = {}
+                for row in rows:
+                    role_id = int(row["shift_role_id"])
+                    role_deltas[role_id] = role_deltas.get(role_id, 0) - _occupies_slot(
+                        SIGNUP_PENDING_CONFIRMATION, row["reservation_expires_at"]
+                    )
+                for role_id, delta in role_deltas.items():
+                    self._apply_capacity_delta(cursor, role_id, delta)
+                # Commit per batch so row locks are held only for one batch at a time.
+                conn.commit()
+
+                expired_count += len(rows)
+                shift_role_ids.update(role_deltas)
+                if len(rows) < batch_size:
+                    break
+        return {"expired_count": expired_count, "shift_role_ids": sorted(shift_role_ids)}
+
     def expire_pending_signups(self, shift_id: int, now_utc: str) -> int:
         now_dt = _parse_iso_to_dt(now_utc)
         with get_connection() as conn:
             cursor = conn.cursor(dictionary=True)
             cursor.execute(
-                """
-                SELECT ss.signup_id, ss.shift_role_id
+                f"""
+                SELECT ss.signup_id, ss.shift_role_id, ss.reservation_expires_at
                 FROM shift_signups ss
                 JOIN shift_roles sr ON sr.shift_role_id = ss.shift_role_id
                 JOIN shifts s ON s.shift_id = sr.shift_id
                 WHERE sr.shift_id = %s
-                  AND UPPER(ss.signup_status) = 'PENDING_CONFIRMATION'
+                  AND ss.signup_status = {SIGNUP_PENDING_CONFIRMATION}
                   AND (
                         s.start_time <= %s
                         OR (
@@ -865,14 +1519,14 @@ class MySQLBackend(StoreBackend):
                 return 0
 
             cursor.execute(
-                """
+                f"""
                 UPDATE shift_signups ss
                 JOIN shift_roles sr ON sr.shift_role_id = ss.shift_role_id
                 JOIN shifts s ON s.shift_id = sr.shift_id
-                SET ss.signup_status = 'CANCELLED',
+                SET ss.signup_status = {SIGNUP_CANCELLED},
                     ss.reservation_expires_at = NULL
                 WHERE sr.shift_id = %s
-                  AND UPPER(ss.signup_status) = 'PENDING_CONFIRMATION'
+                  AND ss.signup_status = {SIGNUP_PENDING_CONFIRMATION}
                   AND (
                         s.start_time <= %s
                         OR (
@@ -884,9 +1538,14 @@ class MySQLBackend(StoreBackend):
                 (shift_id, now_dt, now_dt),
             )
 
-            role_ids = {int(row["shift_role_id"]) for row in rows}
-            for role_id in role_ids:
-                self._recalculate_role_capacity(cursor, role_id)
+            role_deltas: dict[int, int] = {}
+            for row in rows:
+                role_id = int(row["shift_role_id"])
+                role_deltas[role_id] = role_deltas.get(role_id, 0) - _occupies_slot(
+                    SIGNUP_PENDING_CONFIRMATION, row["reservation_expires_at"]
+                )
+            for role_id, delta in role_deltas.items():
+                self._apply_capacity_delta(cursor, role_id, delta)
 
             conn.commit()
             return len(rows)
@@ -902,8 +1561,8 @@ class MySQLBackend(StoreBackend):
                 return {"result": "NOT_FOUND", "signup": None}
 
             shift_role_id = int(signup_row["shift_role_id"])
-            current_status = str(signup_row["signup_status"]).upper()
-            if current_status != PENDING_SIGNUP_STATUS:
+            current_status = signup_row["signup_status"]
+            if current_status != SIGNUP_PENDING_CONFIRMATION:
                 conn.rollback()
                 return {"result": "NOT_PENDING", "signup": _serialize_signup(signup_row)}
 
@@ -920,46 +1579,45 @@ class MySQLBackend(StoreBackend):
                 return {"result": "NOT_FOUND", "signup": None}
 
             reservation_expires_at = signup_row.get("reservation_expires_at")
+            held_slot = _occupies_slot(current_status, reservation_expires_at)
             if shift_row["start_time"] <= now_dt or (
                 reservation_expires_at is not None and reservation_expires_at <= now_dt
             ):
                 cursor.execute(
-                    """
+                    f"""
                     UPDATE shift_signups
-                    SET signup_status = 'CANCELLED',
+                    SET signup_status = {SIGNUP_CANCELLED},
                         reservation_expires_at = NULL
                     WHERE signup_id = %s
                     """,
                     (signup_id,),
                 )
-                self._recalculate_role_capacity(cursor, shift_role_id)
-                self._recalculate_user_attendance_score(cursor, int(signup_row["user_id"]))
+                self._apply_capacity_delta(cursor, shift_role_id, -held_slot)
                 conn.commit()
-                updated = self.get_signup_by_id(signup_id)
-                return {"result": "EXPIRED", "signup": updated}
+                signup_row.update(signup_status=SIGNUP_CANCELLED, reservation_expires_at=None)
+                return {"result": "EXPIRED", "signup": _serialize_signup(signup_row)}
 
-            if str(shift_row["status"]).upper() == "CANCELLED" or str(role_row["status"]).upper() == "CANCELLED":
+            if shift_row["status"] == STATUS_CANCELLED or role_row["status"] == STATUS_CANCELLED:
                 cursor.execute(
-                    """
+                    f"""
                     UPDATE shift_signups
-                    SET signup_status = 'WAITLISTED',
+                    SET signup_status = {SIGNUP_WAITLISTED},
                         reservation_expires_at = NULL
                     WHERE signup_id = %s
                     """,
                     (signup_id,),
                 )
-                self._recalculate_role_capacity(cursor, shift_role_id)
-                self._recalculate_user_attendance_score(cursor, int(signup_row["user_id"]))
+                self._apply_capacity_delta(cursor, shift_role_id, -held_slot)
                 conn.commit()
-                updated = self.get_signup_by_id(signup_id)
-                return {"result": "WAITLISTED", "signup": updated}
+                signup_row.update(signup_status=SIGNUP_WAITLISTED, reservation_expires_at=None)
+                return {"result": "WAITLISTED", "signup": _serialize_signup(signup_row)}
 
             cursor.execute(
-                """
+                f"""
                 SELECT COUNT(*) AS confirmed_count
                 FROM shift_signups
                 WHERE shift_role_id = %s
-                  AND UPPER(signup_status) IN ('CONFIRMED', 'SHOW_UP', 'NO_SHOW')
+                  AND signup_status IN ({SIGNUP_CONFIRMED}, {SIGNUP_SHOW_UP}, {SIGNUP_NO_SHOW})
                 """,
                 (shift_role_id,),
             )
@@ -967,37 +1625,69 @@ class MySQLBackend(StoreBackend):
             required_count = int(role_row["required_count"])
             if confirmed_count >= required_count:
                 cursor.execute(
-                    """
+                    f"""
                     UPDATE shift_signups
-                    SET signup_status = 'WAITLISTED',
+                    SET signup_status = {SIGNUP_WAITLISTED},
                         reservation_expires_at = NULL
                     WHERE signup_id = %s
                     """,
                     (signup_id,),
                 )
-                self._recalculate_role_capacity(cursor, shift_role_id)
-                self._recalculate_user_attendance_score(cursor, int(signup_row["user_id"]))
+                self._apply_capacity_delta(cursor, shift_role_id, -held_slot)
                 conn.commit()
-                updated = self.get_signup_by_id(signup_id)
-                return {"result": "WAITLISTED", "signup": updated}
+                signup_row.update(signup_status=SIGNUP_WAITLISTED, reservation_expires_at=None)
+                return {"result": "WAITLISTED", "signup": _serialize_signup(signup_row)}
 
             cursor.execute(
-                """
+                f"""
                 UPDATE shift_signups
-                SET signup_status = 'CONFIRMED',
+                SET signup_status = {SIGNUP_CONFIRMED},
                     reservation_expires_at = NULL
                 WHERE signup_id = %s
                 """,
                 (signup_id,),
             )
-            self._recalculate_role_capacity(cursor, shift_role_id)
-            self._recalculate_user_attendance_score(cursor, int(signup_row["user_id"]))
+            self._apply_capacity_delta(cursor, shift_role_id, 1 - held_slot)
             conn.commit()
-            updated = self.get_signup_by_id(signup_id)
-            return {"result": "CONFIRMED", "signup": updated}
+            signup_row.update(signup_status=SIGNUP_CONFIRMED, reservation_expires_at=None)
+            return {"result": "CONFIRMED", "signup": _serialize_signup(signup_row)}
 
-    def is_empty(self) -> bool:
+    def verify_role_capacities(self, repair: bool = False) -> list[dict[str, Any]]:
         with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(
+                f"""
+                SELECT sr.shift_role_id, sr.filled_count, COALESCE(stats.active_count, 0) AS expected_count
+                FROM shift_roles sr
+                LEFT JOIN (
+                    SELECT shift_role_id, COUNT(*) AS active_count
+                    FROM shift_signups
+                    WHERE signup_status IN ({SIGNUP_CONFIRMED}, {SIGNUP_SHOW_UP}, {SIGNUP_NO_SHOW})
+                       OR (
+                            signup_status = {SIGNUP_PENDING_CONFIRMATION}
+                            AND reservation_expires_at IS NOT NULL
+                       )
+                    GROUP BY shift_role_id
+                ) stats ON stats.shift_role_id = sr.shift_role_id
+                WHERE sr.filled_count <> COALESCE(stats.active_count, 0)
+                ORDER BY sr.shift_role_id
+                """
+            )
+            drift = [
+                {
+                    "shift_role_id": int(row["shift_role_id"]),
+                    "filled_count": int(row["filled_count"]),
+                    "expected_count": int(row["expected_count"]),
+                }
+                for row in cursor.fetchall()
+            ]
+            if repair and drift:
+                recalculate_role_capacities(cursor, [row["shift_role_id"] for row in drift])
+                conn.commit()
+            return drift
+
+    def is_empty(self) -> bool:
+        with get_connection(read_only=True) as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM users")
             users_count = int(cursor.fetchone()[0])
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+# weekday values stored on shift templates, Monday first like date.weekday().
+WEEKDAY_NAMES = ("MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY", "SATURDAY", "SUNDAY")
+
+# Generated shifts are inserted in chunks of this many rows per statement.
+GENERATE_BATCH_SIZE = 1000
+
+
+def parse_weekday(value: Any) -> int:
+    """Return 0 (Monday) .. 6 (Sunday) for a weekday number or name."""
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid weekday: {value}")
+    if isinstance(value, int):
+        if 0 <= value <= 6:
+            return value
+        raise ValueError(f"Invalid weekday: {value}")
+    name = str(value or "").strip().upper()
+    if name.isdigit() and int(name) <= 6:
+        return int(name)
+    try:
+        return WEEKDAY_NAMES.index(name)
+    except ValueError:
+        raise ValueError(f"Invalid weekday: {value}") from None
+
+
+def parse_clock(value: Any) -> time:
+    """Parse a UTC wall-clock time ("HH:MM"; MySQL TIME columns arrive as timedelta)."""
+    if isinstance(value, time):
+        return value.replace(second=0, microsecond=0, tzinfo=None)
+    if isinstance(value, timedelta):
+        minutes = int(value.total_seconds()) // 60
+        if not 0 <= minutes < 24 * 60:
+            raise ValueError(f"Invalid time: {value}")
+        return time(minutes // 60, minutes % 60)
+    try:
+        return time.fromisoformat(str(value).strip()).replace(second=0, microsecond=0)
+    except ValueError:
+        raise ValueError(f"Invalid time: {value}") from None
+
+
+def format_clock(value: Any) -> str:
+    return parse_clock(value).strftime("%H:%M")
+
+
+def template_occurrences(
+    template: dict[str, Any],
+    first_day: date,
+    weeks: int,
+    not_before: datetime | None = None,
+) -> list[tuple[datetime, datetime]]:
+    """Naive UTC (start, end) pairs of a template for ``weeks`` weeks from ``first_day``.
+
+    An end time at or before the start time ends on the next day. Occurrences
+    starting before ``not_before`` (naive UTC) are left out.
+    """
+    start_clock = parse_clock(template["start_time"])
+    end_clock = parse_clock(template["end_time"])
+    day = first_day + timedelta(days=(int(template["weekday"]) - first_day.weekday()) % 7)
+    occurrences: list[tuple[datetime, datetime]] = []
+    for _ in range(weeks):
+        start = datetime.combine(day, start_clock)
+        end = datetime.combine(day, end_clock)
+        if end <= start:
+            end += timedelta(days=1)
+        if not_before is None or start >= not_before:
+            occurrences.append((start, end))
+        day += timedelta(days=7)
+    return occurrences
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+class StatusCodes:
+    """Two-way mapping between status names used by the API and stored integer codes.
+
+    Codes are persisted (TINYINT columns in MySQL), so existing values must never
+    be renumbered.
+    """
+
+    def __init__(self, codes: dict[str, int]) -> None:
+        self.codes = dict(codes)
+        self.names = {code: name for name, code in codes.items()}
+
+    def code(self, value: Any) -> int | None:
+        """Return the code for a status name (any case) or an existing code."""
+        if value is None:
+            return None
+        if isinstance(value, int) and value in self.names:
+            return value
+        try:
+            return self.codes[str(value).strip().upper()]
+        except KeyError:
+            raise ValueError(f"Unknown status: {value}") from None
+
+    def name(self, code: Any) -> str | None:
+        if code is None:
+            return None
+        return self.names[int(code)]
+
+    def is_valid(self, value: Any) -> bool:
+        return str(value or "").strip().upper() in self.codes
+
+
+# Shift and shift role status.
+STATUS_OPEN = 1
+STATUS_FULL = 2
+STATUS_CANCELLED = 3
+
+RECORD_STATUSES = StatusCodes({"OPEN": STATUS_OPEN, "FULL": STATUS_FULL, "CANCELLED": STATUS_CANCELLED})
+
+SIGNUP_CONFIRMED = 1
+SIGNUP_PENDING_CONFIRMATION = 2
+SIGNUP_WAITLISTED = 3
+SIGNUP_CANCELLED = 4
+SIGNUP_SHOW_UP = 5
+SIGNUP_NO_SHOW = 6
+
+SIGNUP_STATUSES = StatusCodes(
+    {
+        "CONFIRMED": SIGNUP_CONFIRMED,
+        "PENDING_CONFIRMATION": SIGNUP_PENDING_CONFIRMATION,
+        "WAITLISTED": SIGNUP_WAITLISTED,
+        "CANCELLED": SIGNUP_CANCELLED,
+        "SHOW_UP": SIGNUP_SHOW_UP,
+        "NO_SHOW": SIGNUP_NO_SHOW,
+    }
+)
+
+ACTIVE_SIGNUP_CODES = frozenset({SIGNUP_CONFIRMED, SIGNUP_SHOW_UP, SIGNUP_NO_SHOW})
+MARKED_ATTENDANCE_CODES = frozenset({SIGNUP_SHOW_UP, SIGNUP_NO_SHOW})
+RELEASED_SIGNUP_CODES = frozenset({SIGNUP_CANCELLED, SIGNUP_WAITLISTED})
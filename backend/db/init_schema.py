@@ -115,14 +115,51 @@ def apply_sql(sql: str) -> None:
             raise
 
 
+def ensure_migrations_table() -> None:
+    apply_sql(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+          filename VARCHAR(255) NOT NULL PRIMARY KEY,
+          applied_at DATETIME(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+        """
+    )
+
+
+def applied_migrations() -> set[str]:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT filename FROM schema_migrations")
+        applied = {str(row[0]) for row in cursor.fetchall()}
+        conn.commit()
+        return applied
+
+
+def record_migration(filename: str) -> None:
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("INSERT IGNORE INTO schema_migrations (filename) VALUES (%s)", (filename,))
+        conn.commit()
+
+
 def init_schema() -> None:
-    """Initialize schema idempotently using all SQL migrations in order."""
+    """Initialize schema idempotently using all SQL migrations in order.
+
+    001_initial.sql is written with IF NOT EXISTS guards and is always safe to
+    re-run. Later migrations alter existing tables, so each file is recorded in
+    schema_migrations and applied only once.
+    """
     ensure_database_exists()
+    ensure_migrations_table()
+    already_applied = applied_migrations()
     migrations_dir = Path(__file__).resolve().parent / "migrations"
     migration_files = sorted(migrations_dir.glob("*.sql"))
     for migration_file in migration_files:
+        if migration_file.name in already_applied:
+            continue
         sql = migration_file.read_text(encoding="utf-8")
         apply_sql(sql)
+        record_migration(migration_file.name)
 
 
 if __name__ == "__main__":
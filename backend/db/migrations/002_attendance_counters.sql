@@ -0,0 +1,21 @@
+-- Per-user attendance counters so attendance_score can be maintained by delta
+-- on signup status transitions instead of re-aggregating shift_signups.
+ALTER TABLE users
+  ADD COLUMN attended_count INT NOT NULL DEFAULT 0 AFTER attendance_score,
+  ADD COLUMN marked_count INT NOT NULL DEFAULT 0 AFTER attended_count;
+
+UPDATE users u
+LEFT JOIN (
+    SELECT
+        user_id,
+        SUM(CASE WHEN UPPER(signup_status) = 'SHOW_UP' THEN 1 ELSE 0 END) AS attended_count,
+        SUM(CASE WHEN UPPER(signup_status) IN ('SHOW_UP', 'NO_SHOW') THEN 1 ELSE 0 END) AS marked_count
+    FROM shift_signups
+    GROUP BY user_id
+) stats ON stats.user_id = u.user_id
+SET u.attended_count = COALESCE(stats.attended_count, 0),
+    u.marked_count = COALESCE(stats.marked_count, 0),
+    u.attendance_score = CASE
+        WHEN COALESCE(stats.marked_count, 0) = 0 THEN 100
+        ELSE ROUND((COALESCE(stats.attended_count, 0) * 100.0) / stats.marked_count)
+    END;
@@ -0,0 +1,22 @@
+-- Store status values upper-case so hot queries can compare the bare columns
+-- (the columns use a case-insensitive collation) instead of UPPER(column), and
+-- add composite indexes for the shift-window and signup-status lookups.
+UPDATE shifts SET status = UPPER(TRIM(status));
+UPDATE shift_roles SET status = UPPER(TRIM(status));
+UPDATE shift_signups SET signup_status = UPPER(TRIM(signup_status));
+
+-- Slug lookups (`get_pantry_by_slug`) read an indexed generated column instead
+-- of computing REPLACE(LOWER(name), ' ', '-') for every row.
+ALTER TABLE pantries
+  ADD COLUMN slug VARCHAR(255) GENERATED ALWAYS AS (REPLACE(LOWER(name), ' ', '-')) STORED,
+  ADD INDEX idx_pantries_slug (slug);
+
+-- list_non_expired_shifts_by_pantry / list_shift_tree_by_pantry(non_expired_only=True)
+ALTER TABLE shifts
+  ADD INDEX idx_shifts_pantry_end_status (pantry_id, end_time, status);
+
+-- Pending-reservation sweeps (status first, then deadline) and per-user
+-- attendance aggregation.
+ALTER TABLE shift_signups
+  ADD INDEX idx_shift_signups_status_reservation (signup_status, reservation_expires_at),
+  ADD INDEX idx_shift_signups_user_status (user_id, signup_status);
@@ -0,0 +1,32 @@
+-- Store statuses as TINYINT codes (see backends/statuses.py); the API keeps
+-- returning the string names. Existing indexes on these columns are kept and
+-- shrink with the column type.
+UPDATE shifts
+SET status = CASE status
+    WHEN 'OPEN' THEN '1'
+    WHEN 'FULL' THEN '2'
+    WHEN 'CANCELLED' THEN '3'
+    ELSE status
+END;
+ALTER TABLE shifts MODIFY status TINYINT UNSIGNED NOT NULL DEFAULT 1;
+
+UPDATE shift_roles
+SET status = CASE status
+    WHEN 'OPEN' THEN '1'
+    WHEN 'FULL' THEN '2'
+    WHEN 'CANCELLED' THEN '3'
+    ELSE status
+END;
+ALTER TABLE shift_roles MODIFY status TINYINT UNSIGNED NOT NULL DEFAULT 1;
+
+UPDATE shift_signups
+SET signup_status = CASE signup_status
+    WHEN 'CONFIRMED' THEN '1'
+    WHEN 'PENDING_CONFIRMATION' THEN '2'
+    WHEN 'WAITLISTED' THEN '3'
+    WHEN 'CANCELLED' THEN '4'
+    WHEN 'SHOW_UP' THEN '5'
+    WHEN 'NO_SHOW' THEN '6'
+    ELSE signup_status
+END;
+ALTER TABLE shift_signups MODIFY signup_status TINYINT UNSIGNED NOT NULL DEFAULT 1;
@@ -0,0 +1,4 @@
+-- list_calendar_shifts reads upcoming shifts across all pantries, so it needs
+-- an index led by end_time rather than pantry_id.
+ALTER TABLE shifts
+  ADD INDEX idx_shifts_end_status (end_time, status);
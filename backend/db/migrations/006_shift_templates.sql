@@ -0,0 +1,41 @@
+-- Weekly shift templates. weekday is 0 (Monday) .. 6 (Sunday); start_time and
+-- end_time are UTC wall-clock times (an end at or before the start ends the
+-- next day).
+CREATE TABLE IF NOT EXISTS shift_templates (
+  template_id INT AUTO_INCREMENT PRIMARY KEY,
+  pantry_id INT NOT NULL,
+  template_name VARCHAR(255) NOT NULL,
+  weekday TINYINT UNSIGNED NOT NULL,
+  start_time TIME NOT NULL,
+  end_time TIME NOT NULL,
+  created_by INT NOT NULL,
+  created_at DATETIME(6) NOT NULL,
+  updated_at DATETIME(6) NOT NULL,
+  INDEX idx_shift_templates_pantry_id (pantry_id),
+  CONSTRAINT fk_shift_templates_pantry
+    FOREIGN KEY (pantry_id) REFERENCES pantries(pantry_id)
+    ON DELETE CASCADE,
+  CONSTRAINT fk_shift_templates_created_by
+    FOREIGN KEY (created_by) REFERENCES users(user_id)
+    ON DELETE RESTRICT
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS shift_template_roles (
+  template_role_id INT AUTO_INCREMENT PRIMARY KEY,
+  template_id INT NOT NULL,
+  role_title VARCHAR(255) NOT NULL,
+  required_count INT NOT NULL,
+  INDEX idx_shift_template_roles_template_id (template_id),
+  CONSTRAINT fk_shift_template_roles_template
+    FOREIGN KEY (template_id) REFERENCES shift_templates(template_id)
+    ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Generated shifts remember their template; the unique key makes re-running
+-- generation for the same weeks a no-op.
+ALTER TABLE shifts
+  ADD COLUMN template_id INT NULL,
+  ADD UNIQUE KEY uq_shifts_template_start (template_id, start_time),
+  ADD CONSTRAINT fk_shifts_template
+    FOREIGN KEY (template_id) REFERENCES shift_templates(template_id)
+    ON DELETE SET NULL;
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Iterator
+from typing import Any, Iterator
 
-from mysql.connector import pooling
+import mysql.connector
 from mysql.connector.connection import MySQLConnection
+from mysql.connector.errors import Error, PoolError
 
 
-_POOL: pooling.MySQLConnectionPool | None = None
+_POOL: ConnectionPool | None = None
+_UNIT = threading.local()
+# Upper bounds (milliseconds) of the checkout wait histogram buckets; the last bucket is open-ended.
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 250, 500, 1000, 2500, 5000)
 
 
 def mysql_config(include_database: bool = True) -> dict[str, object]:
@@ -28,27 +35,353 @@ def mysql_config(include_database: bool = True) -> dict[str, object]:
     return config
 
 
-def get_pool() -> pooling.MySQLConnectionPool:
+class _PooledConnection:
+    """Checked-out connection; ``close()`` hands it back to the pool."""
+
+    def __init__(self, pool: ConnectionPool, conn: MySQLConnection, created_at: float) -> None:
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+        self._returned = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        if self._returned:
+            return
+        self._returned = True
+        self._pool._release(self._conn, self._created_at)
+
+
+class ConnectionPool:
+    """Fixed-size MySQL connection pool with a bounded wait queue.
+
+    When every connection is checked out, up to ``max_waiters`` callers wait up
+    to ``timeout`` seconds for one to be returned; anyone else gets ``PoolError``
+    straight away. Connections older than ``max_lifetime`` are replaced, and
+    connections idle for ``health_check_idle`` seconds are pinged before reuse.
+    """
+
+    def __init__(
+        self,
+        config: dict[str, object],
+        size: int = 5,
+        timeout: float = 5.0,
+        max_waiters: int = 32,
+        max_lifetime: float = 1800.0,
+        health_check_idle: float = 30.0,
+    ) -> None:
+        self.config = dict(config)
+        self.size = max(1, size)
+        self.timeout = max(0.0, timeout)
+        self.max_waiters = max(0, max_waiters)
+        self.max_lifetime = max_lifetime
+        self.health_check_idle = health_check_idle
+        self.pid = os.getpid()
+        self._cond = threading.Condition()
+        # (connection, created_at, returned_at); reused LIFO so spare connections age out.
+        self._idle: deque[tuple[MySQLConnection, float, float]] = deque()
+        self._open = 0
+        self._in_use = 0
+        self._waiters = 0
+        self._counters = {
+            "checkouts": 0,
+            "created": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+            "timeouts": 0,
+            "rejected": 0,
+        }
+        self._wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+
+    def get_connection(self) -> _PooledConnection:
+        started = time.monotonic()
+        with self._cond:
+            if not self._idle and self._open >= self.size:
+                if self._waiters >= self.max_waiters:
+                    self._counters["rejected"] += 1
+                    raise PoolError("MySQL pool exhausted and wait queue is full")
+                self._waiters += 1
+                try:
+                    deadline = started + self.timeout
+                    while not self._idle and self._open >= self.size:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            self._counters["timeouts"] += 1
+                            raise PoolError(f"Timed out after {self.timeout:g}s waiting for a MySQL connection")
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+            entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                # Reserve the slot now; the connection is opened outside the lock.
+                self._open += 1
+            self._in_use += 1
+            self._counters["checkouts"] += 1
+            self._record_wait((time.monotonic() - started) * 1000)
+
+        try:
+            conn, created_at = self._checked(entry) if entry is not None else (None, 0.0)
+            if conn is None:
+                conn = mysql.connector.connect(**self.config)
+                created_at = time.monotonic()
+                with self._cond:
+                    self._counters["created"] += 1
+        except BaseException:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+        return _PooledConnection(self, conn, created_at)
+
+    def _checked(self, entry: tuple[MySQLConnection, float, float]) -> tuple[MySQLConnection | None, float]:
+        conn, created_at, returned_at = entry
+        now = time.monotonic()
+        if now - created_at >= self.max_lifetime:
+            self._discard(conn, "recycled")
+            return None, 0.0
+        if now - returned_at >= self.health_check_idle:
+            try:
+                conn.ping(reconnect=False)
+            except Error:
+                self._discard(conn, "health_check_failures")
+                return None, 0.0
+        return conn, created_at
+
+    def _discard(self, conn: MySQLConnection, counter: str) -> None:
+        with self._cond:
+            self._counters[counter] += 1
+        try:
+            conn.close()
+        except Error:
+            pass
+
+    def _release(self, conn: MySQLConnection, created_at: float) -> None:
+        if os.getpid() != self.pid:
+            # Inherited across a fork; the parent still owns the socket.
+            return
+        keep = time.monotonic() - created_at < self.max_lifetime
+        if keep:
+            try:
+                # Roll back leftovers and clear session state, as pool_reset_session did.
+                conn.reset_session()
+            except Error:
+                keep = False
+                self._discard(conn, "health_check_failures")
+        else:
+            self._discard(conn, "recycled")
+        with self._cond:
+            self._in_use -= 1
+            if keep:
+                self._idle.append((conn, created_at, time.monotonic()))
+            else:
+                self._open -= 1
+            self._cond.notify()
+
+    def _record_wait(self, wait_ms: float) -> None:
+        index = len(WAIT_BUCKETS_MS)
+        for position, bound in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                index = position
+                break
+        self._wait_counts[index] += 1
+        self._wait_ms_total += wait_ms
+        self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            buckets = [
+                {"le_ms": bound, "count": count}
+                for bound, count in zip((*WAIT_BUCKETS_MS, None), self._wait_counts)
+            ]
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": self._waiters,
+                "max_waiters": self.max_waiters,
+                "timeout_seconds": self.timeout,
+                **self._counters,
+                "wait_ms_total": round(self._wait_ms_total, 3),
+                "wait_ms_max": round(self._wait_ms_max, 3),
+                "wait_ms_histogram": buckets,
+            }
+
+
+def get_pool() -> ConnectionPool:
     global _POOL
-    if _POOL is None:
-        _POOL = pooling.MySQLConnectionPool(
-            pool_name="volunteer_managing_pool",
-            pool_size=int(os.getenv("MYSQL_POOL_SIZE", "5")),
-            pool_reset_session=True,
-            **mysql_config(include_database=True),
+    if _POOL is None or _POOL.pid != os.getpid():
+        _POOL = ConnectionPool(
+            mysql_config(include_database=True),
+            size=int(os.getenv("MYSQL_POOL_SIZE", "5")),
+            timeout=float(os.getenv("MYSQL_POOL_TIMEOUT", "5")),
+            max_waiters=int(os.getenv("MYSQL_POOL_MAX_WAITERS", "32")),
+            max_lifetime=float(os.getenv("MYSQL_POOL_MAX_LIFETIME", "1800")),
+            health_check_idle=float(os.getenv("MYSQL_POOL_HEALTH_CHECK_IDLE", "30")),
         )
     return _POOL
 
 
+def pool_stats() -> dict[str, Any] | None:
+    """Current pool metrics, or None before the pool is first used in this process."""
+    pool = _POOL
+    if pool is None or pool.pid != os.getpid():
+        return None
+    return pool.stats()
+
+
+class _UnitOfWork:
+    def __init__(self, read_only: bool = False) -> None:
+        self.conn: MySQLConnection | None = None
+        self.depth = 0
+        self.read_only = read_only
+        # Set when a savepoint rollback failed: the server already discarded the
+        # transaction (deadlock, lost connection), so it must not be committed.
+        self.lost = False
+
+
+class _UnitOfWorkConnection:
+    """Connection handed out inside a unit of work.
+
+    ``commit()`` is deferred to the end of the unit of work and ``rollback()``
+    only undoes the current ``get_connection()`` block, back to its savepoint.
+    """
+
+    def __init__(self, conn: MySQLConnection, savepoint: str) -> None:
+        self._conn = conn
+        self._savepoint = savepoint
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        _execute(self._conn, f"ROLLBACK TO SAVEPOINT {self._savepoint}")
+
+
+def _execute(conn: MySQLConnection, statement: str) -> None:
+    cursor = conn.cursor()
+    try:
+        cursor.execute(statement)
+    finally:
+        cursor.close()
+
+
+def _start_read_only(conn: MySQLConnection) -> None:
+    # READ COMMITTED takes a fresh snapshot per statement, so none is held open;
+    # READ ONLY skips transaction-id allocation.
+    conn.start_transaction(isolation_level="READ COMMITTED", readonly=True)
+
+
+def begin_unit_of_work(read_only: bool = False) -> None:
+    """Pin one pooled connection (checked out on first use) to this thread.
+
+    Until ``end_unit_of_work()``, every ``get_connection()`` on the thread reuses
+    it inside a single transaction, started READ ONLY when ``read_only`` is set.
+    """
+    if getattr(_UNIT, "current", None) is None:
+        _UNIT.current = _UnitOfWork(read_only)
+
+
+def in_unit_of_work() -> bool:
+    return getattr(_UNIT, "current", None) is not None
+
+
+def end_unit_of_work(commit: bool = True) -> None:
+    unit: _UnitOfWork | None = getattr(_UNIT, "current", None)
+    _UNIT.current = None
+    if unit is None or unit.conn is None:
+        return
+    try:
+        if commit and not unit.lost:
+            unit.conn.commit()
+        else:
+            unit.conn.rollback()
+    finally:
+        unit.conn.close()
+    if commit and unit.lost:
+        raise Error(msg="Unit of work transaction was rolled back by the server; not committed")
+
+
 @contextmanager
-def get_connection() -> Iterator[MySQLConnection]:
-    conn = get_pool().get_connection()
+def unit_of_work(read_only: bool = False) -> Iterator[None]:
+    if getattr(_UNIT, "current", None) is not None:
+        yield
+        return
+    begin_unit_of_work(read_only)
+    committed = False
     try:
-        yield conn
+        yield
+        committed = True
     finally:
-        conn.close()
+        end_unit_of_work(commit=committed)
+
+
+@contextmanager
+def get_connection(read_only: bool = False) -> Iterator[MySQLConnection]:
+    """Yield a pooled connection.
+
+    ``read_only`` runs the block in its own READ ONLY, READ COMMITTED transaction;
+    inside a unit of work the unit's transaction is used instead.
+    """
+    unit: _UnitOfWork | None = getattr(_UNIT, "current", None)
+    if unit is None:
+        conn = get_pool().get_connection()
+        try:
+            if read_only:
+                _start_read_only(conn)
+                yield conn
+                conn.commit()
+            else:
+                yield conn
+        finally:
+            conn.close()
+        return
+
+    if unit.conn is None:
+        conn = get_pool().get_connection()
+        if unit.read_only:
+            try:
+                _start_read_only(conn)
+            except BaseException:
+                conn.close()
+                raise
+        unit.conn = conn
+    unit.depth += 1
+    # Reusing one name per depth replaces the previous savepoint; no RELEASE needed.
+    savepoint = f"uow_{unit.depth}"
+    try:
+        _execute(unit.conn, f"SAVEPOINT {savepoint}")
+        try:
+            yield _UnitOfWorkConnection(unit.conn, savepoint)  # type: ignore[misc]
+        except BaseException:
+            try:
+                _execute(unit.conn, f"ROLLBACK TO SAVEPOINT {savepoint}")
+            except Exception:
+                # The transaction and its savepoints are already gone; keep the original error.
+                unit.lost = True
+            raise
+    finally:
+        unit.depth -= 1
 
 
 def reset_pool() -> None:
     global _POOL
     _POOL = None
+
+
+def _after_fork_in_child() -> None:
+    # Drop, without closing, connections and any unit of work inherited from the parent.
+    reset_pool()
+    _UNIT.current = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from db.mysql import get_connection
+from db.seed import recalculate_all_attendance_scores, recalculate_role_capacities
+
+
+def rebuild_counters() -> None:
+    """Recompute maintained counters from shift_signups (repair after drift)."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        recalculate_all_attendance_scores(cursor)
+        recalculate_role_capacities(cursor)
+        conn.commit()
+
+
+if __name__ == "__main__":
+    rebuild_counters()
+    print("Counters rebuilt successfully")
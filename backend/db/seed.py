@@ -5,6 +5,17 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from backends.statuses import (
+    RECORD_STATUSES,
+    SIGNUP_CONFIRMED,
+    SIGNUP_NO_SHOW,
+    SIGNUP_PENDING_CONFIRMATION,
+    SIGNUP_SHOW_UP,
+    SIGNUP_STATUSES,
+    STATUS_CANCELLED,
+    STATUS_FULL,
+    STATUS_OPEN,
+)
 from db.mysql import get_connection
 
 
@@ -43,17 +54,19 @@ def parse_iso_to_dt(value: str | None) -> datetime:
 
 def recalculate_all_attendance_scores(cursor: Any) -> None:
     cursor.execute(
-        """
+        f"""
         UPDATE users u
         LEFT JOIN (
             SELECT
                 user_id,
-                SUM(CASE WHEN UPPER(signup_status) = 'SHOW_UP' THEN 1 ELSE 0 END) AS attended_count,
-                SUM(CASE WHEN UPPER(signup_status) IN ('SHOW_UP', 'NO_SHOW') THEN 1 ELSE 0 END) AS marked_count
+                SUM(CASE WHEN signup_status = {SIGNUP_SHOW_UP} THEN 1 ELSE 0 END) AS attended_count,
+                SUM(CASE WHEN signup_status IN ({SIGNUP_SHOW_UP}, {SIGNUP_NO_SHOW}) THEN 1 ELSE 0 END) AS marked_count
             FROM shift_signups
             GROUP BY user_id
         ) stats ON stats.user_id = u.user_id
-        SET u.attendance_score = CASE
+        SET u.attended_count = COALESCE(stats.attended_count, 0),
+            u.marked_count = COALESCE(stats.marked_count, 0),
+            u.attendance_score = CASE
             WHEN COALESCE(stats.marked_count, 0) = 0 THEN 100
             ELSE ROUND((COALESCE(stats.attended_count, 0) * 100.0) / stats.marked_count)
         END
@@ -61,6 +74,41 @@ def recalculate_all_attendance_scores(cursor: Any) -> None:
     )
 
 
+def recalculate_role_capacities(cursor: Any, shift_role_ids: list[int] | None = None) -> None:
+    """Recount filled_count/status from shift_signups (all roles, or only the given ones)."""
+    where_sql = ""
+    params: tuple[Any, ...] = ()
+    if shift_role_ids is not None:
+        if not shift_role_ids:
+            return
+        where_sql = f"WHERE sr.shift_role_id IN ({', '.join(['%s'] * len(shift_role_ids))})"
+        params = tuple(shift_role_ids)
+
+    cursor.execute(
+        f"""
+        UPDATE shift_roles sr
+        LEFT JOIN (
+            SELECT shift_role_id, COUNT(*) AS active_count
+            FROM shift_signups
+            WHERE signup_status IN ({SIGNUP_CONFIRMED}, {SIGNUP_SHOW_UP}, {SIGNUP_NO_SHOW})
+               OR (
+                    signup_status = {SIGNUP_PENDING_CONFIRMATION}
+                    AND reservation_expires_at IS NOT NULL
+               )
+            GROUP BY shift_role_id
+        ) stats ON stats.shift_role_id = sr.shift_role_id
+        SET sr.filled_count = COALESCE(stats.active_count, 0),
+            sr.status = CASE
+                WHEN sr.status = {STATUS_CANCELLED} THEN sr.status
+                WHEN COALESCE(stats.active_count, 0) >= sr.required_count THEN {STATUS_FULL}
+                ELSE {STATUS_OPEN}
+            END
+        {where_sql}
+        """,
+        params,
+    )
+
+
 def seed_mysql_from_json(data_path: Path, truncate: bool = False) -> None:
     payload = json.loads(data_path.read_text(encoding="utf-8"))
 
@@ -186,7 +234,7 @@ def seed_mysql_from_json(data_path: Path, truncate: bool = False) -> None:
                     shift["shift_name"],
                     parse_iso_to_dt(shift["start_time"]),
                     parse_iso_to_dt(shift["end_time"]),
-                    shift.get("status", "OPEN"),
+                    RECORD_STATUSES.code(shift.get("status", "OPEN")),
                     shift["created_by"],
                     parse_iso_to_dt(shift.get("created_at")),
                     parse_iso_to_dt(shift.get("updated_at") or shift.get("created_at")),
@@ -218,7 +266,7 @@ def seed_mysql_from_json(data_path: Path, truncate: bool = False) -> None:
                     shift_role["role_title"],
                     shift_role["required_count"],
                     shift_role.get("filled_count", 0),
-                    shift_role.get("status", "OPEN"),
+                    RECORD_STATUSES.code(shift_role.get("status", "OPEN")),
                 ),
             )
 
@@ -245,13 +293,14 @@ def seed_mysql_from_json(data_path: Path, truncate: bool = False) -> None:
                     signup["signup_id"],
                     signup["shift_role_id"],
                     signup["user_id"],
-                    signup.get("signup_status", "CONFIRMED"),
+                    SIGNUP_STATUSES.code(signup.get("signup_status", "CONFIRMED")),
                     parse_iso_to_dt(signup.get("reservation_expires_at")) if signup.get("reservation_expires_at") else None,
                     parse_iso_to_dt(signup.get("created_at")),
                 ),
             )
 
         recalculate_all_attendance_scores(cursor)
+        recalculate_role_capacities(cursor)
 
         for table, key in [
             ("users", "user_id"),
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from backends.base import StoreBackend
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_deadline(value: Any) -> datetime | None:
+    if not value:
+        return None
+    try:
+        deadline = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if deadline.tzinfo is None:
+        deadline = deadline.replace(tzinfo=timezone.utc)
+    return deadline.astimezone(timezone.utc)
+
+
+def _iso_z(value: datetime) -> str:
+    return value.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class ReservationExpiryScheduler:
+    """Expire lapsed PENDING_CONFIRMATION reservations close to their deadline.
+
+    Deadlines (the earlier of a shift's start time and its soonest reservation
+    expiry) are kept in a min-heap keyed on time. The worker sleeps until the next
+    deadline, runs one set-based sweep over every overdue reservation, and reloads
+    the heap from the backend after expiring and every ``rescan_seconds`` so
+    deadlines created by other processes are picked up. ``schedule()`` lets this
+    process add a deadline without waiting for the next rescan.
+    """
+
+    def __init__(self, backend: StoreBackend, rescan_seconds: float = 60.0) -> None:
+        self.backend = backend
+        self.rescan_seconds = max(1.0, rescan_seconds)
+        self._heap: list[tuple[datetime, int]] = []
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._needs_rescan = True
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.run_forever, name="reservation-expiry", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def schedule(self, shift_id: int, deadline: datetime) -> None:
+        with self._cond:
+            # Without a running worker the deadline would only pile up; start() rescans anyway.
+            if self._thread is None:
+                return
+            heapq.heappush(self._heap, (deadline, int(shift_id)))
+            self._cond.notify_all()
+
+    def rescan(self) -> None:
+        deadlines = self.backend.list_pending_expiry_deadlines()
+        heap = [
+            (deadline, int(row["shift_id"]))
+            for row in deadlines
+            if (deadline := _parse_deadline(row.get("deadline"))) is not None
+        ]
+        heapq.heapify(heap)
+        with self._cond:
+            self._heap = heap
+            self._needs_rescan = False
+
+    def run_due(self, now: datetime | None = None) -> int:
+        """Run one global expiry sweep if any deadline has passed; returns the number of signups expired."""
+        now = now or datetime.now(timezone.utc)
+        due: list[tuple[datetime, int]] = []
+        with self._cond:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap))
+        if not due:
+            return 0
+        try:
+            result = self.backend.expire_overdue_pending_signups(_iso_z(now))
+        except Exception:
+            # Keep the deadlines so the retry after a transient failure still sweeps them.
+            with self._cond:
+                for entry in due:
+                    heapq.heappush(self._heap, entry)
+            raise
+        # A shift can hold several reservations; reload to pick up its next deadline.
+        with self._cond:
+            self._needs_rescan = True
+        return int(result["expired_count"])
+
+    def run_forever(self) -> None:
+        last_rescan = float("-inf")
+        while True:
+            with self._cond:
+                if self._stopping:
+                    return
+                needs_rescan = self._needs_rescan
+
+            failed = False
+            try:
+                if needs_rescan or time.monotonic() - last_rescan >= self.rescan_seconds:
+                    self.rescan()
+                    last_rescan = time.monotonic()
+                self.run_due()
+            except Exception:
+                logger.exception("Reservation expiry pass failed")
+                failed = True
+
+            with self._cond:
+                if self._stopping:
+                    return
+                if failed:
+                    self._cond.wait(1.0)
+                    continue
+                if self._needs_rescan:
+                    continue
+                timeout = self.rescan_seconds - (time.monotonic() - last_rescan)
+                if self._heap:
+                    timeout = min(timeout, (self._heap[0][0] - datetime.now(timezone.utc)).total_seconds())
+                if timeout > 0:
+                    self._cond.wait(timeout)
+
+
+if __name__ == "__main__":
+    from pathlib import Path
+
+    from dotenv import load_dotenv
+
+    from backends.factory import create_backend
+
+    load_dotenv(Path(__file__).resolve().parent / ".env")
+    logging.basicConfig(level=logging.INFO)
+    scheduler = ReservationExpiryScheduler(
+        create_backend(),
+        rescan_seconds=float(os.getenv("EXPIRY_RESCAN_SECONDS", "60")),
+    )
+    print("Reservation expiry worker running")
+    scheduler.run_forever()
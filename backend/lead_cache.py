@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+class LeadPantryCache:
+    """Process-wide user_id -> lead pantry ids cache.
+
+    ``invalidate()`` bumps a version number, which makes every cached entry stale
+    at once. Entries also expire after ``ttl_seconds`` so lead changes made by
+    another process are picked up eventually. At most ``max_entries`` users are
+    kept (least recently used are dropped first).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 60.0) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._version = 0
+        self._entries: OrderedDict[int, tuple[int, float, frozenset[int]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, loader: Callable[[int], list[int]]) -> frozenset[int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] == self._version and now - entry[1] < self.ttl_seconds:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            version = self._version
+
+        pantry_ids = frozenset(int(pantry_id) for pantry_id in loader(user_id))
+        with self._lock:
+            # Skip the store if an invalidation happened while loading.
+            if version == self._version:
+                self._entries[user_id] = (version, now, pantry_ids)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return pantry_ids
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "version": self._version,
+            }
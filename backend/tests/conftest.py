@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+# Route tests import app.py, which builds its backend at import time.
+os.environ.setdefault("DATA_BACKEND", "memory")
+
+
+@pytest.fixture
+def memory_app(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> Any:
+    """app.py wired to a fresh MemoryBackend holding the roles, one ADMIN and one pantry."""
+    import app as app_module
+    from backends.memory_backend import MemoryBackend
+
+    data_path = tmp_path / "db.json"
+    roles = [{"role_id": i, "role_name": name} for i, name in enumerate(["ADMIN", "PANTRY_LEAD", "VOLUNTEER"], start=1)]
+    data_path.write_text(json.dumps({"roles": roles}), encoding="utf-8")
+    backend = MemoryBackend(data_path=data_path)
+    backend.add_lead_change_listener(app_module.lead_pantry_cache.invalidate)
+    monkeypatch.setattr(app_module, "backend", backend)
+    app_module.lead_pantry_cache.invalidate()
+    admin = backend.create_user("Admin", "admin@example.org", "x", True, ["ADMIN"])
+    pantry = backend.create_pantry("Test Pantry", "1 Main St", [])
+    yield SimpleNamespace(
+        module=app_module,
+        backend=backend,
+        client=app_module.app.test_client(),
+        admin_id=int(admin["user_id"]),
+        pantry_id=int(pantry["pantry_id"]),
+    )
+    app_module.lead_pantry_cache.invalidate()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import mysql.connector
+import pytest
+from mysql.connector.errors import Error, PoolError
+
+import db.mysql as db_mysql
+from db.mysql import WAIT_BUCKETS_MS, ConnectionPool
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.closed = False
+        self.ping_error = False
+        self.reset_error = False
+
+    def ping(self, reconnect: bool = False) -> None:
+        if self.ping_error:
+            raise Error(msg="gone away")
+
+    def reset_session(self) -> None:
+        if self.reset_error:
+            raise Error(msg="gone away")
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch: pytest.MonkeyPatch) -> list[FakeConnection]:
+    opened: list[FakeConnection] = []
+
+    def connect(**config: Any) -> FakeConnection:
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(mysql.connector, "connect", connect)
+    return opened
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Replaces the pool's monotonic clock; advance it by setting ``clock.now``."""
+    fake = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(db_mysql, "time", SimpleNamespace(monotonic=lambda: fake.now))
+    return fake
+
+
+def _wait_for(predicate: Any) -> None:
+    deadline = time.monotonic() + 2
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for the pool"
+        time.sleep(0.005)
+
+
+def test_waiting_caller_gets_the_released_connection(connections: list[FakeConnection]) -> None:
+    pool = ConnectionPool({}, size=1, timeout=5)
+    held = pool.get_connection()
+    got: list[Any] = []
+    waiter = threading.Thread(target=lambda: got.append(pool.get_connection()))
+    waiter.start()
+    _wait_for(lambda: pool.stats()["waiters"] == 1)
+
+    held.close()
+    waiter.join(2)
+
+    assert got and got[0]._conn is connections[0]
+    stats = pool.stats()
+    assert (stats["checkouts"], stats["created"], stats["waiters"]) == (2, 1, 0)
+
+
+def test_timeout_is_counted_when_the_deadline_passes(connections: list[FakeConnection]) -> None:
+    pool = ConnectionPool({}, size=1, timeout=0.05)
+    pool.get_connection()
+
+    with pytest.raises(PoolError, match="Timed out"):
+        pool.get_connection()
+
+    stats = pool.stats()
+    assert (stats["timeouts"], stats["waiters"], stats["in_use"]) == (1, 0, 1)
+
+
+def test_caller_is_rejected_once_the_wait_queue_is_full(connections: list[FakeConnection]) -> None:
+    pool = ConnectionPool({}, size=1, timeout=5, max_waiters=1)
+    held = pool.get_connection()
+    waiter = threading.Thread(target=pool.get_connection)
+    waiter.start()
+    _wait_for(lambda: pool.stats()["waiters"] == 1)
+
+    with pytest.raises(PoolError, match="wait queue is full"):
+        pool.get_connection()
+
+    held.close()
+    waiter.join(2)
+    stats = pool.stats()
+    assert (stats["rejected"], stats["timeouts"], stats["checkouts"]) == (1, 0, 2)
+
+
+def test_connection_past_max_lifetime_is_recycled(connections: list[FakeConnection], clock: SimpleNamespace) -> None:
+    pool = ConnectionPool({}, size=1, max_lifetime=100, health_check_idle=1000)
+    pool.get_connection().close()
+
+    clock.now += 150
+    replacement = pool.get_connection()
+
+    assert connections[0].closed
+    assert replacement._conn is connections[1]
+    stats = pool.stats()
+    assert (stats["recycled"], stats["created"], stats["open"]) == (1, 2, 1)
+
+
+def test_failed_ping_discards_the_idle_connection(connections: list[FakeConnection], clock: SimpleNamespace) -> None:
+    pool = ConnectionPool({}, size=1, health_check_idle=30)
+    pool.get_connection().close()
+    connections[0].ping_error = True
+
+    clock.now += 40
+    replacement = pool.get_connection()
+
+    assert connections[0].closed
+    assert replacement._conn is connections[1]
+    stats = pool.stats()
+    assert (stats["health_check_failures"], stats["open"], stats["in_use"]) == (1, 1, 1)
+
+
+def test_failed_reset_session_discards_the_connection_and_frees_the_slot(
+    connections: list[FakeConnection],
+) -> None:
+    pool = ConnectionPool({}, size=1, timeout=0.05)
+    held = pool.get_connection()
+    connections[0].reset_error = True
+
+    held.close()
+
+    assert connections[0].closed
+    stats = pool.stats()
+    assert (stats["health_check_failures"], stats["open"], stats["in_use"], stats["idle"]) == (1, 0, 0, 0)
+    assert pool.get_connection()._conn is connections[1]
+
+
+def test_failed_connect_frees_the_reserved_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    def refuse(**config: Any) -> Any:
+        raise Error(msg="Can't connect")
+
+    monkeypatch.setattr(mysql.connector, "connect", refuse)
+    pool = ConnectionPool({}, size=1, timeout=0.05)
+
+    for _ in range(2):
+        with pytest.raises(Error, match="Can't connect"):
+            pool.get_connection()
+
+    stats = pool.stats()
+    assert (stats["open"], stats["in_use"], stats["timeouts"], stats["created"]) == (0, 0, 0, 0)
+
+
+def test_stats_report_counts_and_wait_histogram(connections: list[FakeConnection], clock: SimpleNamespace) -> None:
+    pool = ConnectionPool({}, size=2)
+    first = pool.get_connection()
+    pool.get_connection()
+    first.close()
+    first.close()  # a second close is ignored
+
+    stats = pool.stats()
+    assert (stats["open"], stats["in_use"], stats["idle"], stats["checkouts"]) == (2, 1, 1, 2)
+
+    buckets = stats["wait_ms_histogram"]
+    assert [bucket["le_ms"] for bucket in buckets] == [*WAIT_BUCKETS_MS, None]
+    assert buckets[0]["count"] == 2
+    assert sum(bucket["count"] for bucket in buckets) == 2
+
+    pool._record_wait(WAIT_BUCKETS_MS[-1] + 1)
+    pool._record_wait(7)
+    counts = {bucket["le_ms"]: bucket["count"] for bucket in pool.stats()["wait_ms_histogram"]}
+    assert (counts[None], counts[10], counts[5]) == (1, 1, 0)
+    assert pool.stats()["wait_ms_max"] == WAIT_BUCKETS_MS[-1] + 1
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from backends.memory_backend import MemoryBackend
+from expiry_scheduler import ReservationExpiryScheduler
+
+
+class FlakyBackend:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.sweeps = 0
+
+    def expire_overdue_pending_signups(self, now_utc: str, batch_size: int = 500) -> dict[str, Any]:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.sweeps += 1
+        return {"expired_count": 2, "shift_role_ids": [1]}
+
+
+def test_failed_sweep_keeps_due_deadline() -> None:
+    backend = FlakyBackend(failures=1)
+    scheduler = ReservationExpiryScheduler(backend)  # type: ignore[arg-type]
+    now = datetime.now(timezone.utc)
+    scheduler._heap = [(now - timedelta(seconds=1), 7)]
+
+    with pytest.raises(ConnectionError):
+        scheduler.run_due(now)
+    assert scheduler._heap == [(now - timedelta(seconds=1), 7)]
+
+    assert scheduler.run_due(now) == 2
+    assert backend.sweeps == 1
+    assert scheduler._heap == []
+
+
+def test_importing_app_does_not_start_worker() -> None:
+    import app as app_module
+
+    assert app_module.expiry_scheduler._thread is None
+
+
+def test_schedule_is_ignored_until_started() -> None:
+    scheduler = ReservationExpiryScheduler(FlakyBackend(failures=0))  # type: ignore[arg-type]
+    scheduler.schedule(1, datetime.now(timezone.utc))
+
+    assert scheduler._heap == []
+
+
+def test_memory_deadlines_come_from_live_heap_entries(tmp_path: Path) -> None:
+    backend = MemoryBackend(data_path=tmp_path / "missing.json")
+    shift_ids = [
+        backend.create_shift(1, name, "2030-01-07T09:00:00Z", "2030-01-07T12:00:00Z", "OPEN", 1)["shift_id"]
+        for name in ("Morning", "Evening")
+    ]
+    role_ids = [backend.create_shift_role(shift_id, "Sorter", 5)["shift_role_id"] for shift_id in shift_ids]
+    users = [backend.create_user(f"User {i}", f"u{i}@example.org", "x", True, ["VOLUNTEER"])["user_id"] for i in range(2)]
+    backend.create_signup(role_ids[0], users[0], "PENDING_CONFIRMATION")
+    confirmed = backend.create_signup(role_ids[1], users[1], "PENDING_CONFIRMATION")
+    [first_deadline] = [row for row in backend.list_pending_expiry_deadlines() if row["shift_id"] == shift_ids[0]]
+
+    # The first shift briefly starts before its reservation deadline, leaving a stale
+    # heap entry behind; the second signup is confirmed.
+    backend.update_shift(shift_ids[0], {"start_time": "2020-01-07T09:00:00Z"})
+    backend.update_shift(shift_ids[0], {"start_time": "2030-01-07T09:00:00Z"})
+    backend.update_signup(confirmed["signup_id"], "CONFIRMED")
+
+    assert backend.list_pending_expiry_deadlines() == [first_deadline]
@@ -0,0 +1,122 @@
+"""EXPLAIN the SQL MySQLBackend actually issues on its hot paths.
+
+Needs a reachable MySQL (the ``MYSQL_*`` settings); runs only with MYSQL_TESTS=true.
+The statements are captured from the backend methods themselves, so a plan can
+only pass if the real predicates can use the intended index.
+"""
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    os.getenv("MYSQL_TESTS", "false").strip().lower() != "true",
+    reason="set MYSQL_TESTS=true to run against MySQL",
+)
+
+
+class _RecordingCursor:
+    def __init__(self, cursor: Any, statements: list[tuple[str, Any]]) -> None:
+        self._cursor = cursor
+        self._statements = statements
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def execute(self, sql: str, params: Any = ()) -> Any:
+        if sql.lstrip().upper().startswith("SELECT"):
+            self._statements.append((sql, params))
+        return self._cursor.execute(sql, params)
+
+
+class _RecordingConnection:
+    def __init__(self, conn: Any, statements: list[tuple[str, Any]]) -> None:
+        self._conn = conn
+        self._statements = statements
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def cursor(self, **kwargs: Any) -> _RecordingCursor:
+        return _RecordingCursor(self._conn.cursor(**kwargs), self._statements)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+# Hot backend call -> indexes its SELECTs are meant to be able to use.
+HOT_CALLS: dict[str, tuple[Callable[[Any], Any], set[str]]] = {
+    "list_non_expired_shifts_by_pantry": (
+        lambda b: b.list_non_expired_shifts_by_pantry(1, include_cancelled=False),
+        {"idx_shifts_pantry_end_status"},
+    ),
+    "list_shift_tree_by_pantry": (
+        lambda b: b.list_shift_tree_by_pantry(1, include_cancelled=False, non_expired_only=True),
+        {"idx_shifts_pantry_end_status"},
+    ),
+    "list_calendar_shifts": (lambda b: b.list_calendar_shifts(), {"idx_shifts_end_status"}),
+    "get_pantry_by_slug": (lambda b: b.get_pantry_by_slug("downtown-pantry"), {"idx_pantries_slug"}),
+    "list_pending_expiry_deadlines": (
+        lambda b: b.list_pending_expiry_deadlines(),
+        {"idx_shift_signups_status_reservation"},
+    ),
+    "expire_overdue_pending_signups": (
+        lambda b: b.expire_overdue_pending_signups(_now_iso()),
+        {"idx_shift_signups_status_reservation"},
+    ),
+    "list_signups_by_user": (lambda b: b.list_signups_by_user(1), {"idx_shift_signups_user_status"}),
+}
+
+
+@pytest.fixture(scope="module")
+def mysql_backend() -> Any:
+    from backends.mysql_backend import MySQLBackend
+    from db.init_schema import init_schema
+    from db.seed import seed_mysql_from_json
+
+    init_schema()
+    backend = MySQLBackend()
+    if backend.is_empty():
+        seed_mysql_from_json(Path(__file__).resolve().parents[1] / "data" / "db.json", truncate=False)
+    return backend
+
+
+@pytest.mark.parametrize("name", sorted(HOT_CALLS))
+def test_hot_query_can_use_its_index(name: str, mysql_backend: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    import backends.mysql_backend as mysql_backend_module
+    from db.mysql import begin_unit_of_work, end_unit_of_work, get_connection
+
+    statements: list[tuple[str, Any]] = []
+
+    @contextmanager
+    def recording_connection(read_only: bool = False) -> Iterator[Any]:
+        with get_connection(read_only=read_only) as conn:
+            yield _RecordingConnection(conn, statements)
+
+    monkeypatch.setattr(mysql_backend_module, "get_connection", recording_connection)
+    call, expected_indexes = HOT_CALLS[name]
+    # Writes made by sweep-style calls are discarded.
+    begin_unit_of_work()
+    try:
+        call(mysql_backend)
+        assert statements, f"{name} issued no SELECT"
+
+        usable: set[str] = set()
+        with get_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            for sql, params in statements:
+                cursor.execute("EXPLAIN " + sql, params)
+                for row in cursor.fetchall():
+                    usable.update(filter(None, str(row.get("possible_keys") or "").split(",")))
+                    if row.get("key"):
+                        usable.add(str(row["key"]))
+    finally:
+        end_unit_of_work(commit=False)
+
+    assert expected_indexes <= usable, f"{name}: usable indexes {sorted(usable)}"
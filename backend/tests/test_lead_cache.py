@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import db.mysql as db_mysql
+from backends.memory_backend import MemoryBackend
+from backends.mysql_backend import MySQLBackend
+from lead_cache import LeadPantryCache
+
+
+def test_memory_lead_changes_invalidate_cache_without_routes(tmp_path: Path) -> None:
+    backend = MemoryBackend(data_path=tmp_path / "missing.json")
+    lead = backend.create_user("Lead", "lead@example.org", "x", True, ["PANTRY_LEAD"])
+    pantry = backend.create_pantry("Downtown", "1 Main St", [])
+    cache = LeadPantryCache()
+    backend.add_lead_change_listener(cache.invalidate)
+    user_id = int(lead["user_id"])
+
+    assert cache.get(user_id, backend.list_lead_pantry_ids) == frozenset()
+    backend.add_pantry_lead(pantry["pantry_id"], user_id)
+    assert cache.get(user_id, backend.list_lead_pantry_ids) == {pantry["pantry_id"]}
+    backend.remove_pantry_lead(pantry["pantry_id"], user_id)
+    assert cache.get(user_id, backend.list_lead_pantry_ids) == frozenset()
+
+
+class FakeCursor:
+    def execute(self, statement: str, params: Any = ()) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class FakeConnection:
+    def cursor(self, **kwargs: Any) -> FakeCursor:
+        return FakeCursor()
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def test_mysql_notifies_again_after_request_commit(monkeypatch: pytest.MonkeyPatch) -> None:
+    class FakePool:
+        def get_connection(self) -> FakeConnection:
+            return FakeConnection()
+
+    monkeypatch.setattr(db_mysql, "get_pool", lambda: FakePool())
+    backend = MySQLBackend()
+    notifications: list[bool] = []
+    backend.add_lead_change_listener(lambda: notifications.append(db_mysql.in_unit_of_work()))
+
+    backend.remove_pantry_lead(1, 2)
+    assert notifications == [False]
+
+    notifications.clear()
+    backend.begin_request()
+    backend.remove_pantry_lead(1, 2)
+    backend.end_request(commit=True)
+    # Once when written, once after the commit made it visible to other connections.
+    assert notifications == [True, False]
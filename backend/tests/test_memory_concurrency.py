@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import random
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from backends.memory_backend import TABLE_KEYS, MemoryBackend, _row_key
+from backends.memory_journal import MemoryJournal
+
+EXPECTED_ERRORS = {"Already signed up", "This role is full"}
+
+
+def _table_state(backend: MemoryBackend) -> dict[str, dict[tuple[Any, ...], dict[str, Any]]]:
+    return {
+        table: {_row_key(table, row): backend._copy(row) for row in backend.store[table]}
+        for table in TABLE_KEYS
+    }
+
+
+@pytest.fixture
+def fast_thread_switching() -> None:
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_signup_changes_keep_capacity_and_journal_consistent(
+    tmp_path: Path,
+    fast_thread_switching: None,
+) -> None:
+    journal_path = tmp_path / "db.journal.jsonl"
+    snapshot_path = tmp_path / "db.snapshot.json"
+    backend = MemoryBackend(
+        data_path=tmp_path / "missing.json",
+        journal=MemoryJournal(journal_path, snapshot_path, compact_every=200),
+    )
+    shift = backend.create_shift(1, "Stress", "2030-01-01T09:00:00Z", "2030-01-01T12:00:00Z", "OPEN", 1)
+    role_ids = [
+        backend.create_shift_role(shift["shift_id"], f"Role {i}", 5)["shift_role_id"] for i in range(4)
+    ]
+    user_ids = [
+        backend.create_user(f"User {i}", f"user{i}@example.org", "x", True, ["VOLUNTEER"])["user_id"]
+        for i in range(100)
+    ]
+    errors: list[str] = []
+    overbooked: list[dict[str, Any]] = []
+
+    def worker(seed: int) -> None:
+        rnd = random.Random(seed)
+        for _ in range(200):
+            shift_role_id = rnd.choice(role_ids)
+            op = rnd.random()
+            try:
+                if op < 0.45:
+                    status = rnd.choice(["CONFIRMED", "PENDING_CONFIRMATION"])
+                    backend.create_signup(shift_role_id, rnd.choice(user_ids), status)
+                elif op < 0.65:
+                    signups = backend.list_shift_signups(shift_role_id)
+                    if signups:
+                        backend.delete_signup(rnd.choice(signups)["signup_id"])
+                elif op < 0.8:
+                    signups = backend.list_shift_signups(shift_role_id)
+                    if signups:
+                        backend.update_signup(rnd.choice(signups)["signup_id"], "CANCELLED")
+                elif op < 0.85:
+                    backend.bulk_mark_shift_signups_pending(shift["shift_id"], "2031-01-01T00:00:00Z")
+                else:
+                    signups = backend.list_shift_signups(shift_role_id)
+                    if signups:
+                        backend.reconfirm_pending_signup(rnd.choice(signups)["signup_id"], "2029-01-01T00:00:00Z")
+            except (ValueError, RuntimeError) as exc:
+                if str(exc) not in EXPECTED_ERRORS:
+                    errors.append(repr(exc))
+            for role_id in role_ids:
+                role = backend.get_shift_role_by_id(role_id)
+                if role["filled_count"] > role["required_count"]:
+                    overbooked.append(role)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert overbooked == []
+    assert backend.verify_role_capacities() == []
+    assert len(backend.store["shift_signups"]) == len(backend._signups_by_id)
+
+    live_state = _table_state(backend)
+    backend._journal.close()
+    replayed = MemoryBackend(data_path=tmp_path / "missing.json", journal=MemoryJournal(journal_path, snapshot_path))
+    assert _table_state(replayed) == live_state
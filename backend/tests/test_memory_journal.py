@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+import backends.memory_journal as memory_journal
+from backends.memory_journal import MemoryJournal
+
+
+@pytest.fixture
+def fsync_calls(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+    real_fsync = memory_journal._fsync_file
+
+    def counting_fsync(handle: object) -> None:
+        calls.append(1)
+        real_fsync(handle)
+
+    monkeypatch.setattr(memory_journal, "_fsync_file", counting_fsync)
+    return calls
+
+
+def _wait_for(condition: object, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():  # type: ignore[operator]
+            return True
+        time.sleep(0.01)
+    return False
+
+
+@pytest.mark.parametrize("fsync_mode", ["batch", "interval"])
+def test_last_write_is_synced_when_writes_stop(tmp_path: Path, fsync_calls: list[int], fsync_mode: str) -> None:
+    journal = MemoryJournal(
+        tmp_path / "db.journal.jsonl",
+        tmp_path / "db.snapshot.json",
+        fsync_mode=fsync_mode,
+        batch_size=100,
+        interval_seconds=0.05,
+    )
+    try:
+        journal.append([["put", "shifts", {"shift_id": 1}]])
+        assert fsync_calls == []
+        assert _wait_for(lambda: fsync_calls and journal._unsynced_records == 0)
+    finally:
+        journal.close()
+
+
+def test_close_cancels_pending_flush(tmp_path: Path, fsync_calls: list[int]) -> None:
+    journal = MemoryJournal(
+        tmp_path / "db.journal.jsonl",
+        tmp_path / "db.snapshot.json",
+        fsync_mode="interval",
+        interval_seconds=60,
+    )
+    journal.append([["put", "shifts", {"shift_id": 1}]])
+    journal.close()
+
+    assert len(fsync_calls) == 1
+    assert journal._flush_timer is None
+    assert list(journal.replay()) == [[["put", "shifts", {"shift_id": 1}]]]
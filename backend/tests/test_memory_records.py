@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import tracemalloc
+from typing import Any, Callable
+
+from backends.memory_records import SignupRecord
+
+ROWS = 20_000
+
+
+def _signup_row(i: int) -> dict[str, Any]:
+    return {
+        "signup_id": i,
+        "shift_role_id": i // 10,
+        "user_id": i % 5000,
+        "signup_status": "CONFIRMED",
+        "reservation_expires_at": None,
+        "created_at": f"2030-01-01T09:{i % 60:02d}:00Z",
+    }
+
+
+def _bytes_per_row(build: Callable[[dict[str, Any]], Any]) -> float:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        rows = [build(_signup_row(i)) for i in range(ROWS)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(rows) == ROWS
+    return (after - before) / ROWS
+
+
+def test_signup_records_use_less_memory_than_dicts() -> None:
+    dict_bytes = _bytes_per_row(dict)
+    record_bytes = _bytes_per_row(SignupRecord.from_row)
+
+    # About 440 bytes/row as dicts vs 250 as records on CPython 3.11, of which
+    # ~65 bytes is the per-row created_at string both layouts keep.
+    assert record_bytes < dict_bytes * 0.7, (dict_bytes, record_bytes)
+
+
+def test_signup_record_round_trips_to_the_same_dict() -> None:
+    row = _signup_row(7)
+    assert SignupRecord.from_row(row).to_dict() == row
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Iterator
+
+import pytest
+
+import backends.mysql_backend as mysql_backend_module
+from backends.mysql_backend import MySQLBackend
+
+
+class ScriptedCursor:
+    """Returns the queued result sets for SELECTs, in order, and records every statement."""
+
+    def __init__(self, results: list[list[dict[str, Any]]], statements: list[tuple[str, Any]]) -> None:
+        self._results = results
+        self._statements = statements
+        self._rows: list[dict[str, Any]] = []
+
+    def execute(self, sql: str, params: Any = ()) -> None:
+        statement = " ".join(sql.split())
+        self._statements.append((statement, params))
+        self._rows = self._results.pop(0) if statement.startswith("SELECT") and self._results else []
+
+    def fetchall(self) -> list[dict[str, Any]]:
+        return self._rows
+
+    def fetchone(self) -> dict[str, Any] | None:
+        return self._rows[0] if self._rows else None
+
+
+def _use_scripted_connection(
+    monkeypatch: pytest.MonkeyPatch,
+    results: list[list[dict[str, Any]]],
+) -> list[tuple[str, Any]]:
+    statements: list[tuple[str, Any]] = []
+
+    class Connection:
+        def cursor(self, **kwargs: Any) -> ScriptedCursor:
+            return ScriptedCursor(results, statements)
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+    @contextmanager
+    def get_connection(read_only: bool = False) -> Iterator[Connection]:
+        yield Connection()
+
+    monkeypatch.setattr(mysql_backend_module, "get_connection", get_connection)
+    return statements
+
+
+def _capacity_updates_per_role(statements: list[tuple[str, Any]]) -> Counter[int]:
+    """shift_role_id -> capacity UPDATEs issued; the role id is the statement's last parameter."""
+    return Counter(
+        params[-1] for statement, params in statements if statement.startswith("UPDATE shift_roles SET filled_count")
+    )
+
+
+def test_expiry_sweep_updates_each_role_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    expires = datetime(2030, 1, 1)
+    # N = 7 overdue reservations spread over K = 3 roles.
+    overdue = [
+        {"signup_id": signup_id, "shift_role_id": role_id, "reservation_expires_at": expires}
+        for signup_id, role_id in enumerate([10, 10, 10, 20, 20, 30, 10], start=1)
+    ]
+    statements = _use_scripted_connection(monkeypatch, [overdue])
+    backend = MySQLBackend()
+
+    result = backend.expire_overdue_pending_signups("2030-01-02T00:00:00Z")
+
+    assert result == {"expired_count": 7, "shift_role_ids": [10, 20, 30]}
+    assert _capacity_updates_per_role(statements) == {10: 1, 20: 1, 30: 1}
+
+
+def test_bulk_mark_pending_updates_each_role_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    # N = 5 pending signups without a reservation over K = 2 roles; each takes a slot again.
+    pending = [
+        {
+            "signup_id": signup_id,
+            "shift_role_id": role_id,
+            "user_id": signup_id,
+            "signup_status": 2,
+            "reservation_expires_at": None,
+        }
+        for signup_id, role_id in enumerate([10, 10, 20, 20, 20], start=1)
+    ]
+    statements = _use_scripted_connection(monkeypatch, [pending])
+    backend = MySQLBackend()
+
+    backend.bulk_mark_shift_signups_pending(1, "2030-01-01T00:00:00Z")
+
+    assert _capacity_updates_per_role(statements) == {10: 1, 20: 1}
@@ -0,0 +1,70 @@
+"""Compare GET-request throughput with and without read-only request transactions.
+
+Needs a reachable MySQL (the ``MYSQL_*`` settings); runs only with MYSQL_TESTS=true.
+Each simulated request wraps the reads of the public shifts page in the same
+begin_request/end_request pair app.py uses, once as a read-write transaction
+(the behaviour before GETs were read-only) and once read-only. Run with ``-s``
+to see the numbers.
+"""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytestmark = pytest.mark.skipif(
+    os.getenv("MYSQL_TESTS", "false").strip().lower() != "true",
+    reason="set MYSQL_TESTS=true to run against MySQL",
+)
+
+WORKERS = 8
+REQUESTS_PER_WORKER = 200
+
+
+@pytest.fixture(scope="module")
+def mysql_backend() -> Any:
+    from backends.mysql_backend import MySQLBackend
+    from db.init_schema import init_schema
+    from db.seed import seed_mysql_from_json
+
+    init_schema()
+    backend = MySQLBackend()
+    if backend.is_empty():
+        seed_mysql_from_json(Path(__file__).resolve().parents[1] / "data" / "db.json", truncate=False)
+    return backend
+
+
+def _get_public_shifts(backend: Any, read_only: bool) -> None:
+    backend.begin_request(read_only=read_only)
+    try:
+        pantry = backend.get_pantry_by_slug("downtown-pantry")
+        if pantry:
+            backend.list_shift_tree_by_pantry(int(pantry["pantry_id"]), include_cancelled=False, non_expired_only=True)
+        backend.list_calendar_shifts()
+    finally:
+        backend.end_request(commit=True)
+
+
+def _requests_per_second(backend: Any, read_only: bool) -> float:
+    def worker(_: int) -> None:
+        for _ in range(REQUESTS_PER_WORKER):
+            _get_public_shifts(backend, read_only)
+
+    _get_public_shifts(backend, read_only)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(WORKERS) as pool:
+        list(pool.map(worker, range(WORKERS)))
+    return WORKERS * REQUESTS_PER_WORKER / (time.perf_counter() - started)
+
+
+def test_read_only_get_throughput(mysql_backend: Any) -> None:
+    read_write = _requests_per_second(mysql_backend, read_only=False)
+    read_only = _requests_per_second(mysql_backend, read_only=True)
+    print(f"\nGET throughput: read-write {read_write:.0f} req/s, read-only {read_only:.0f} req/s")
+
+    # A noisy shared server can swing either run; only a clear regression fails.
+    assert read_only >= read_write * 0.8
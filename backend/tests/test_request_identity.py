@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from flask import g
+
+import app as app_module
+
+
+def test_identity_is_loaded_once_per_request() -> None:
+    backend = app_module.backend
+    lead = backend.list_users("PANTRY_LEAD")[0]
+    pantry_id = backend.list_lead_pantry_ids(int(lead["user_id"]))[0]
+    client = app_module.app.test_client()
+    with client:
+        # Creating a shift checks the user, the ADMIN and PANTRY_LEAD roles and the lead pantries.
+        response = client.post(f"/api/pantries/{pantry_id}/shifts?user_id={lead['user_id']}", json={})
+        assert response.status_code == 400
+        assert g.identity_load_count == 1
+
+    with client:
+        response = client.get("/api/me")
+        assert response.status_code == 200
+        assert g.identity_load_count == 1
+
+
+def test_identity_is_reloaded_after_invalidation() -> None:
+    with app_module.app.test_request_context("/api/me"):
+        app_module.set_current_user()
+        app_module.current_user()
+        app_module.user_has_role(int(g.current_user_id), "ADMIN")
+        app_module.invalidate_identity()
+        app_module.current_user()
+
+        assert g.identity_load_count == 2
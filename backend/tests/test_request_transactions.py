@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+import app as app_module
+
+
+@pytest.fixture
+def end_request_calls(monkeypatch: pytest.MonkeyPatch) -> list[bool]:
+    calls: list[bool] = []
+    monkeypatch.setattr(app_module.backend, "end_request", lambda commit=True: calls.append(commit))
+    return calls
+
+
+def test_successful_request_commits_before_teardown(end_request_calls: list[bool]) -> None:
+    response = app_module.app.test_client().get("/api/me")
+
+    assert response.status_code == 200
+    assert end_request_calls == [True, False]
+
+
+def test_error_response_rolls_back(end_request_calls: list[bool]) -> None:
+    response = app_module.app.test_client().post("/api/pantries/1/shifts", json={})
+
+    assert response.status_code == 400
+    assert end_request_calls == [False, False]
+
+
+def test_failed_commit_returns_server_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    def failing_end_request(commit: bool = True) -> None:
+        if commit:
+            raise RuntimeError("commit failed")
+
+    monkeypatch.setattr(app_module.backend, "end_request", failing_end_request)
+    response = app_module.app.test_client().get("/api/me")
+
+    assert response.status_code == 500
+
+
+def test_reconfirm_conflict_keeps_the_status_change(memory_app: Any, end_request_calls: list[bool]) -> None:
+    backend = memory_app.backend
+    shift = backend.create_shift(
+        memory_app.pantry_id, "Morning", "2030-01-07T09:00:00Z", "2030-01-07T12:00:00Z", "OPEN", memory_app.admin_id
+    )
+    shift_role_id = backend.create_shift_role(shift["shift_id"], "Sorter", 2)["shift_role_id"]
+    volunteers = [
+        backend.create_user(f"Volunteer {i}", f"v{i}@example.org", "x", True, ["VOLUNTEER"])["user_id"] for i in range(2)
+    ]
+    pending = backend.create_signup(shift_role_id, volunteers[0], "PENDING_CONFIRMATION")
+    backend.create_signup(shift_role_id, volunteers[1], "CONFIRMED")
+    backend.update_shift_role(shift_role_id, {"required_count": 1})
+
+    response = memory_app.client.patch(
+        f"/api/signups/{pending['signup_id']}/reconfirm?user_id={volunteers[0]}", json={"action": "CONFIRM"}
+    )
+
+    assert response.status_code == 409
+    assert backend.get_signup_by_id(pending["signup_id"])["signup_status"] == "WAITLISTED"
+    assert end_request_calls == [True, False]
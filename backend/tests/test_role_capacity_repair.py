@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+import backends.mysql_backend as mysql_backend_module
+from backends.memory_backend import MemoryBackend
+from backends.memory_journal import MemoryJournal
+from backends.mysql_backend import MySQLBackend
+from backends.statuses import STATUS_FULL, STATUS_OPEN
+
+
+def test_memory_drift_is_reported_then_repaired(tmp_path: Path) -> None:
+    backend = MemoryBackend(
+        data_path=tmp_path / "missing.json",
+        journal=MemoryJournal(tmp_path / "db.journal.jsonl", tmp_path / "db.snapshot.json"),
+    )
+    shift = backend.create_shift(1, "Drift", "2030-01-01T09:00:00Z", "2030-01-01T12:00:00Z", "OPEN", 1)
+    shift_role_id = backend.create_shift_role(shift["shift_id"], "Sorter", 2)["shift_role_id"]
+    for i in range(2):
+        user_id = backend.create_user(f"User {i}", f"user{i}@example.org", "x", True, ["VOLUNTEER"])["user_id"]
+        backend.create_signup(shift_role_id, user_id, "CONFIRMED")
+    assert backend.verify_role_capacities() == []
+
+    role = backend._shift_roles_by_id[shift_role_id]
+    role["filled_count"] = 0
+    role["status"] = STATUS_OPEN
+
+    drift = [{"shift_role_id": shift_role_id, "filled_count": 0, "expected_count": 2}]
+    assert backend.verify_role_capacities() == drift
+    assert role["filled_count"] == 0
+
+    assert backend.verify_role_capacities(repair=True) == drift
+    assert role["filled_count"] == 2
+    assert role["status"] == STATUS_FULL
+    assert backend.verify_role_capacities() == []
+
+    backend._journal.close()
+    last_record = list(MemoryJournal(tmp_path / "db.journal.jsonl", tmp_path / "db.snapshot.json").replay())[-1]
+    assert [(op, table, row["filled_count"]) for op, table, row in last_record] == [("put", "shift_roles", 2)]
+
+
+def test_mysql_repair_recounts_only_drifting_roles(monkeypatch: pytest.MonkeyPatch) -> None:
+    drift_rows = [
+        {"shift_role_id": 10, "filled_count": 5, "expected_count": 3},
+        {"shift_role_id": 30, "filled_count": 0, "expected_count": 1},
+    ]
+    commits: list[bool] = []
+    recounted: list[list[int]] = []
+
+    class Cursor:
+        def execute(self, sql: str, params: Any = ()) -> None:
+            assert "WHERE sr.filled_count <> COALESCE(stats.active_count, 0)" in sql
+
+        def fetchall(self) -> list[dict[str, Any]]:
+            return [dict(row) for row in drift_rows]
+
+    class Connection:
+        def cursor(self, **kwargs: Any) -> Cursor:
+            return Cursor()
+
+        def commit(self) -> None:
+            commits.append(True)
+
+    @contextmanager
+    def get_connection(read_only: bool = False) -> Iterator[Connection]:
+        yield Connection()
+
+    monkeypatch.setattr(mysql_backend_module, "get_connection", get_connection)
+    monkeypatch.setattr(
+        mysql_backend_module,
+        "recalculate_role_capacities",
+        lambda cursor, shift_role_ids=None: recounted.append(list(shift_role_ids)),
+    )
+    backend = MySQLBackend()
+
+    assert backend.verify_role_capacities() == drift_rows
+    assert recounted == [] and commits == []
+
+    assert backend.verify_role_capacities(repair=True) == drift_rows
+    assert recounted == [[10, 30]]
+    assert commits == [True]
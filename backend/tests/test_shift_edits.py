@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+START = "2030-01-07T09:00:00Z"
+END = "2030-01-07T12:00:00Z"
+
+
+@pytest.fixture
+def shift_setup(memory_app: Any, monkeypatch: pytest.MonkeyPatch) -> Any:
+    """A future shift with a full two-slot "Sorter" role and an empty "Driver" role."""
+    backend = memory_app.backend
+    shift = backend.create_shift(memory_app.pantry_id, "Morning", START, END, "OPEN", memory_app.admin_id)
+    sorter = backend.create_shift_role(shift["shift_id"], "Sorter", 2)
+    driver = backend.create_shift_role(shift["shift_id"], "Driver", 1)
+    memory_app.signup_ids = []
+    for i in range(2):
+        user_id = backend.create_user(f"Volunteer {i}", f"v{i}@example.org", "x", True, ["VOLUNTEER"])["user_id"]
+        memory_app.signup_ids.append(backend.create_signup(sorter["shift_role_id"], user_id, "CONFIRMED")["signup_id"])
+    memory_app.shift_id = shift["shift_id"]
+    memory_app.sorter_id = sorter["shift_role_id"]
+    memory_app.driver_id = driver["shift_role_id"]
+
+    memory_app.writes = []
+    for name in ["update_shift", "update_shift_role", "create_shift_role", "delete_shift_role"]:
+        method = getattr(backend, name)
+
+        def record(*args: Any, _name: str = name, _method: Any = method, **kwargs: Any) -> Any:
+            memory_app.writes.append(_name)
+            return _method(*args, **kwargs)
+
+        monkeypatch.setattr(backend, name, record)
+    return memory_app
+
+
+def _payload(**overrides: Any) -> dict[str, Any]:
+    payload = {"shift_name": "Morning", "start_time": START, "end_time": END, "status": "OPEN"}
+    payload.update(overrides)
+    return payload
+
+
+def _roles(setup: Any, sorter_count: int = 2, sorter_title: str = "Sorter") -> list[dict[str, Any]]:
+    return [
+        {"shift_role_id": setup.sorter_id, "role_title": sorter_title, "required_count": sorter_count},
+        {"shift_role_id": setup.driver_id, "role_title": "Driver", "required_count": 1},
+    ]
+
+
+def _put(setup: Any, payload: dict[str, Any]) -> Any:
+    response = setup.client.put(f"/api/shifts/{setup.shift_id}/full?user_id={setup.admin_id}", json=payload)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def _signup_statuses(setup: Any) -> set[str]:
+    return {setup.backend.get_signup_by_id(signup_id)["signup_status"] for signup_id in setup.signup_ids}
+
+
+def test_unchanged_shift_writes_nothing(shift_setup: Any) -> None:
+    body = _put(shift_setup, _payload(roles=_roles(shift_setup)))
+
+    assert shift_setup.writes == []
+    assert body["affected_signup_count"] == 0
+    assert _signup_statuses(shift_setup) == {"CONFIRMED"}
+
+
+def test_time_change_marks_signups_pending(shift_setup: Any) -> None:
+    body = _put(shift_setup, _payload(start_time="2030-01-07T10:00:00Z", roles=_roles(shift_setup)))
+
+    assert shift_setup.writes == ["update_shift"]
+    assert body["start_time"] == "2030-01-07T10:00:00Z"
+    assert body["affected_signup_count"] == 2
+    assert _signup_statuses(shift_setup) == {"PENDING_CONFIRMATION"}
+
+
+def test_title_change_keeps_signups_confirmed(shift_setup: Any) -> None:
+    body = _put(shift_setup, _payload(shift_name="Early Morning", roles=_roles(shift_setup)))
+
+    assert shift_setup.writes == ["update_shift"]
+    assert body["shift_name"] == "Early Morning"
+    assert body["affected_signup_count"] == 0
+    assert _signup_statuses(shift_setup) == {"CONFIRMED"}
+
+
+def test_removed_and_added_roles_are_applied(shift_setup: Any) -> None:
+    roles = [
+        {"shift_role_id": shift_setup.sorter_id, "role_title": "Sorter", "required_count": 2},
+        {"role_title": "Greeter", "required_count": 3},
+    ]
+
+    body = _put(shift_setup, _payload(roles=roles))
+
+    assert sorted(shift_setup.writes) == ["create_shift_role", "delete_shift_role"]
+    assert [(role["role_title"], role["required_count"]) for role in body["roles"]] == [("Sorter", 2), ("Greeter", 3)]
+    assert shift_setup.backend.get_shift_role_by_id(shift_setup.driver_id) is None
+    assert body["affected_signup_count"] == 0
+    assert _signup_statuses(shift_setup) == {"CONFIRMED"}
+
+
+def test_capacity_cut_below_filled_count_marks_signups_pending(shift_setup: Any) -> None:
+    body = _put(shift_setup, _payload(roles=_roles(shift_setup, sorter_count=1)))
+
+    assert shift_setup.writes == ["update_shift_role"]
+    assert body["affected_signup_count"] == 2
+    assert _signup_statuses(shift_setup) == {"PENDING_CONFIRMATION"}
+
+
+def test_role_title_change_keeps_signups_confirmed(shift_setup: Any) -> None:
+    body = _put(shift_setup, _payload(roles=_roles(shift_setup, sorter_title="Packer")))
+
+    assert shift_setup.writes == ["update_shift_role"]
+    assert body["roles"][0]["role_title"] == "Packer"
+    assert body["affected_signup_count"] == 0
+    assert _signup_statuses(shift_setup) == {"CONFIRMED"}
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+import backends.mysql_backend as mysql_backend_module
+from backends.memory_backend import MemoryBackend
+from backends.mysql_backend import MySQLBackend
+from backends.shift_templates import template_occurrences
+
+TEMPLATE = {
+    "template_id": 1,
+    "pantry_id": 2,
+    "template_name": "Morning",
+    "weekday": 0,
+    "start_time": timedelta(hours=9),
+    "end_time": timedelta(hours=12),
+    "created_by": 3,
+    "created_at": datetime(2030, 1, 1),
+    "updated_at": datetime(2030, 1, 1),
+}
+
+
+def test_occurrences_before_not_before_are_left_out() -> None:
+    occurrences = template_occurrences(TEMPLATE, date(2030, 1, 1), 3, not_before=datetime(2030, 1, 14, 9))
+
+    assert [start for start, _ in occurrences] == [datetime(2030, 1, 14, 9), datetime(2030, 1, 21, 9)]
+
+
+def test_memory_generation_skips_occurrences_already_started(tmp_path: Path) -> None:
+    backend = MemoryBackend(data_path=tmp_path / "missing.json")
+    today = datetime.now(timezone.utc).date()
+    backend.create_shift_template(
+        2, "Night", today.weekday(), "00:00", "06:00", 3, [{"role_title": "Sorter", "required_count": 1}]
+    )
+
+    # Occurrences on today - 7 and today have started; only today + 7 is created.
+    result = backend.generate_template_shifts((today - timedelta(days=7)).isoformat(), 3, 3)
+
+    assert result["created_shift_count"] == 1
+    assert result["skipped_shift_count"] == 0
+    [shift] = backend.list_shifts_by_pantry(2)
+    assert shift["start_time"] == datetime.combine(today + timedelta(days=7), time()).isoformat() + "Z"
+
+
+class FakeCursor:
+    """Hands out non-consecutive auto-increment ids and answers the id read-backs."""
+
+    lastrowid = 1
+
+    def __init__(self, shifts: dict[tuple[int, datetime], int], inserted: list[tuple[str, list[Any]]]) -> None:
+        self._shifts = shifts
+        self._inserted = inserted
+        self._rows: list[Any] = []
+
+    def execute(self, sql: str, params: Any = ()) -> None:
+        statement = " ".join(sql.split())
+        self._rows = []
+        if statement.startswith("INSERT INTO shifts"):
+            self.lastrowid = 40
+        elif "FROM shift_templates " in statement:
+            self._rows = [TEMPLATE]
+        elif "FROM shift_template_roles" in statement:
+            self._rows = [{"template_role_id": 1, "template_id": 1, "role_title": "Sorter", "required_count": 2}]
+        elif statement.startswith("SELECT shift_role_id FROM shift_roles"):
+            self._rows = [(71,), (95,)]
+        elif statement.startswith("SELECT shift_id, template_id, start_time FROM shifts"):
+            self._rows = [
+                {"shift_id": shift_id, "template_id": template_id, "start_time": start}
+                for (template_id, start), shift_id in self._shifts.items()
+            ]
+
+    def executemany(self, sql: str, rows: list[Any]) -> None:
+        self._inserted.append((" ".join(sql.split()), rows))
+        self.lastrowid = 7
+
+    def fetchall(self) -> list[Any]:
+        return self._rows
+
+    def fetchone(self) -> Any:
+        return self._rows[0] if self._rows else None
+
+
+def _use_fake_connection(
+    monkeypatch: pytest.MonkeyPatch,
+    shifts: dict[tuple[int, datetime], int] | None = None,
+) -> list[tuple[str, list[Any]]]:
+    inserted: list[tuple[str, list[Any]]] = []
+
+    class Connection:
+        def cursor(self, **kwargs: Any) -> FakeCursor:
+            return FakeCursor(shifts or {}, inserted)
+
+        def commit(self) -> None:
+            pass
+
+    @contextmanager
+    def get_connection(read_only: bool = False) -> Iterator[Connection]:
+        yield Connection()
+
+    monkeypatch.setattr(mysql_backend_module, "get_connection", get_connection)
+    return inserted
+
+
+def test_mysql_create_shift_reads_back_role_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+    _use_fake_connection(monkeypatch)
+
+    shift = MySQLBackend().create_shift(
+        2,
+        "Morning",
+        "2030-01-07T09:00:00Z",
+        "2030-01-07T12:00:00Z",
+        "OPEN",
+        3,
+        [{"role_title": "Sorter", "required_count": 2}, {"role_title": "Driver", "required_count": 1}],
+    )
+
+    assert [(role["shift_role_id"], role["role_title"]) for role in shift["roles"]] == [(71, "Sorter"), (95, "Driver")]
+
+
+def test_mysql_generation_reads_back_shift_ids(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(mysql_backend_module, "_now_utc_naive", lambda: datetime(2030, 1, 1))
+    shift_ids = {(1, datetime(2030, 1, 7, 9)): 501, (1, datetime(2030, 1, 14, 9)): 733}
+    inserted = _use_fake_connection(monkeypatch, shift_ids)
+
+    result = MySQLBackend().generate_template_shifts("2030-01-01", 2, 3)
+
+    assert result["created_shift_count"] == 2
+    [role_rows] = [rows for sql, rows in inserted if sql.startswith("INSERT INTO shift_roles")]
+    assert role_rows == [(501, "Sorter", 2), (733, "Sorter", 2)]
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from mysql.connector.errors import Error
+
+import db.mysql as db_mysql
+
+
+class FakeCursor:
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+
+    def execute(self, statement: str, params: Any = ()) -> None:
+        if statement.startswith("ROLLBACK TO") and self.conn.savepoints_lost:
+            raise Error(msg="SAVEPOINT does not exist")
+        self.conn.log.append(statement)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeConnection:
+    def __init__(self, log: list[str]) -> None:
+        self.log = log
+        self.savepoints_lost = False
+
+    def cursor(self, **kwargs: Any) -> FakeCursor:
+        return FakeCursor(self)
+
+    def commit(self) -> None:
+        self.log.append("COMMIT")
+
+    def rollback(self) -> None:
+        self.log.append("ROLLBACK")
+
+    def close(self) -> None:
+        self.log.append("CLOSE")
+
+
+@pytest.fixture
+def conn(monkeypatch: pytest.MonkeyPatch) -> FakeConnection:
+    connection = FakeConnection([])
+
+    class FakePool:
+        def get_connection(self) -> FakeConnection:
+            return connection
+
+    monkeypatch.setattr(db_mysql, "get_pool", lambda: FakePool())
+    yield connection
+    db_mysql._UNIT.current = None
+
+
+def test_failed_block_rolls_back_to_its_savepoint(conn: FakeConnection) -> None:
+    with db_mysql.unit_of_work():
+        with db_mysql.get_connection() as c:
+            c.cursor().execute("INSERT A")
+        with pytest.raises(ValueError):
+            with db_mysql.get_connection() as c:
+                c.cursor().execute("INSERT B")
+                raise ValueError
+
+    assert conn.log == [
+        "SAVEPOINT uow_1",
+        "INSERT A",
+        "SAVEPOINT uow_1",
+        "INSERT B",
+        "ROLLBACK TO SAVEPOINT uow_1",
+        "COMMIT",
+        "CLOSE",
+    ]
+
+
+def test_lost_savepoint_keeps_original_error_and_blocks_commit(conn: FakeConnection) -> None:
+    class Deadlock(Exception):
+        pass
+
+    db_mysql.begin_unit_of_work()
+    with pytest.raises(Deadlock):
+        with db_mysql.get_connection():
+            conn.savepoints_lost = True
+            raise Deadlock
+
+    # A caller that swallowed the error must not commit a transaction the server discarded.
+    with pytest.raises(Error):
+        db_mysql.end_unit_of_work(commit=True)
+    assert "COMMIT" not in conn.log
+    assert conn.log[-2:] == ["ROLLBACK", "CLOSE"]
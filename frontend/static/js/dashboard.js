@@ -216,23 +216,14 @@ async function loadCalendarShifts() {
             return;
         }
 
-        for (const pantry of allPublicPantries) {
-            try {
-                const shifts = await getActiveShifts(pantry.pantry_id);
-
-                if (shifts && shifts.length > 0) {
-                    for (const shift of shifts) {
-                        allShifts[pantry.pantry_id] = {
-                            name: pantry.name,
-                            location: pantry.location_address,
-                            shifts: shifts && shifts.length > 0 ? shifts : []
-                        };
-                    }
-                }
-
-            } catch (err) {
-                console.warn(`Failed to load shifts for pantry ${pantry.pantry_id}:`, err);
-            }
+        // One request returns every pantry's upcoming shifts, already grouped
+        const calendar = await getCalendarShifts();
+        for (const pantry of calendar) {
+            allShifts[pantry.pantry_id] = {
+                name: pantry.name,
+                location: pantry.location_address,
+                shifts: pantry.shifts
+            };
         }
 
         displayAllShiftsGroupedByPantry(allShifts);
@@ -1352,37 +1343,11 @@ function setupEventListeners() {
             return;
         }
 
-        const existingRoleIds = new Set((editingShiftSnapshot.roles || []).map(role => Number(role.shift_role_id)));
-        const submittedRoleIds = new Set(roleInputs.filter(role => role.shift_role_id).map(role => Number(role.shift_role_id)));
-        const roleIdsToDelete = Array.from(existingRoleIds).filter(roleId => !submittedRoleIds.has(roleId));
-
         try {
-            const responses = [];
-
-            const shiftResponse = await updateShift(shiftId, updatedShiftPayload);
-            responses.push(shiftResponse);
-
-            for (const role of roleInputs) {
-                if (role.shift_role_id) {
-                    const updatedRole = await updateShiftRole(role.shift_role_id, {
-                        role_title: role.role_title,
-                        required_count: role.required_count
-                    });
-                    responses.push(updatedRole);
-                } else {
-                    await createShiftRole(shiftId, {
-                        role_title: role.role_title,
-                        required_count: role.required_count
-                    });
-                }
-            }
-
-            for (const roleId of roleIdsToDelete) {
-                const deletedRoleResponse = await deleteShiftRole(roleId);
-                responses.push(deletedRoleResponse);
-            }
+            // Roles left out of the list are removed (or cancelled if they have signups) by the server
+            const shiftResponse = await replaceShift(shiftId, { ...updatedShiftPayload, roles: roleInputs });
 
-            const impacted = collectAffectedContacts(responses);
+            const impacted = collectAffectedContacts([shiftResponse]);
             const impactedMsg = impacted.uniqueVolunteers > 0
                 ? ` ${impacted.uniqueVolunteers} volunteer(s) need reconfirmation.`
                 : '';
@@ -1435,13 +1400,8 @@ function setupEventListeners() {
         }
 
         try {
-            // Create shift
-            const shift = await createShift(currentPantryId, shiftData);
-
-            // Create roles
-            for (const role of roles) {
-                await createShiftRole(shift.shift_id, role);
-            }
+            // Create the shift and its roles in one request
+            await createShift(currentPantryId, { ...shiftData, roles });
 
             showMessage('shifts', 'Shift created successfully with all roles!', 'success');
             e.target.reset();
@@ -14,6 +14,20 @@ async function getShifts(pantryId) {
     }
 }
 
+/**
+ * Get upcoming shifts of all pantries in one call.
+ * Returns pantries ({pantry_id, name, location_address, shifts}) with nested roles
+ */
+async function getCalendarShifts() {
+    try {
+        const pantries = await apiGet('/api/calendar');
+        return pantries;
+    } catch (error) {
+        console.error('Failed to get calendar shifts:', error);
+        throw error;
+    }
+}
+
 /**
  * Get non-expired, non-cancelled shifts for a pantry.
  * Returns shifts with nested shift_roles
@@ -80,6 +94,19 @@ async function updateShift(shiftId, shiftData) {
     }
 }
 
+/**
+ * Replace a shift and its full role set; the server applies only the differences
+ */
+async function replaceShift(shiftId, shiftData) {
+    try {
+        const shift = await apiPut(`/api/shifts/${shiftId}/full`, shiftData);
+        return shift;
+    } catch (error) {
+        console.error('Failed to update shift:', error);
+        throw error;
+    }
+}
+
 /**
  * Cancel a shift (soft-cancel with volunteer reconfirmation flow)
  */